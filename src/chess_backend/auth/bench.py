@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+
+# -------------------------
+# Benchmark de autenticación
+#   python -m chess_backend.auth.bench --logins 32 --concurrency 8 --requests 500
+# - arranque: tiempo de importar auth.utils en un proceso nuevo
+# - login: logins/s con peticiones concurrentes y latencia de peticiones ligeras
+#   (GET /chess/state) lanzadas mientras tanto (¿se bloquea el event loop?)
+# - peticiones autenticadas: GET /chess/state por segundo con el mismo token
+# Necesita httpx (el mismo que usa TestClient).
+# -------------------------
+
+def import_time() -> float:
+    code = ("import time; t = time.perf_counter(); import chess_backend.auth.utils; "
+            "print(time.perf_counter() - t)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+async def _login(client, username: str = "carlos", password: str = "1234") -> str:
+    r = await client.post("/auth/login", data={"username": username, "password": password})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+async def login_throughput(client, logins: int, concurrency: int, headers: dict) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+
+    async def one():
+        async with sem:
+            await _login(client)
+
+    async def probe(latencies: list):
+        # peticiones ligeras mientras hay logins en curso
+        while not done.is_set():
+            t = time.perf_counter()
+            await client.get("/chess/state", headers=headers)
+            latencies.append(time.perf_counter() - t)
+            await asyncio.sleep(0.01)
+
+    latencies: list = []
+    prober = asyncio.create_task(probe(latencies))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return {
+        "logins_per_sec": logins / elapsed,
+        "probe_p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "probe_max_ms": max(latencies) * 1000 if latencies else None,
+        "probes": len(latencies),
+    }
+
+async def authed_throughput(client, requests: int, headers: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        r = await client.get("/chess/state", headers=headers)
+        r.raise_for_status()
+    return requests / (time.perf_counter() - start)
+
+async def run(logins: int, concurrency: int, requests: int) -> None:
+    try:
+        import httpx
+    except ImportError:
+        sys.exit("Este benchmark necesita httpx: pip install httpx")
+    from chess_backend.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {await _login(client)}"}
+        res = await login_throughput(client, logins, concurrency, headers)
+        print(f"login      {res['logins_per_sec']:.2f} logins/s (concurrencia {concurrency}); "
+              f"GET /chess/state mientras tanto: p50={res['probe_p50_ms']:.1f} ms "
+              f"max={res['probe_max_ms']:.1f} ms ({res['probes']} peticiones)")
+        rps = await authed_throughput(client, requests, headers)
+        print(f"auth       {rps:.0f} peticiones autenticadas/s (GET /chess/state, mismo token)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de autenticación")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"arranque   import auth.utils: {import_time() * 1000:.0f} ms")
+    asyncio.run(run(args.logins, args.concurrency, args.requests))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# src/chess_backend/auth/hashing.py
+from typing import Optional
+
+# Hash de contraseñas (sha256_crypt). Este módulo es lo que importan los procesos del pool
+# de hash, así que no depende de nada del servidor (FastAPI, JWT, base de datos): un
+# proceso nuevo solo carga passlib. El servidor tampoco lo necesita hasta el primer hash.
+_pwd_context = None
+
+def pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+    return _pwd_context
+
+def get_password_hash(password: str) -> str:
+    return pwd_context().hash(password)
+
+def verify_password(plain: str, hashed: str) -> bool:
+    return pwd_context().verify(plain, hashed)
+
+def warm(_: Optional[int] = None) -> None:
+    """Carga passlib en el proceso (calentamiento del pool)."""
+    pwd_context()
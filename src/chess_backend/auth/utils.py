@@ -1,42 +1,112 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 from jose import JWTError
+from .hashing import get_password_hash, verify_password, warm as _warm_hash
 from ..core.security import create_access_token, decode_token
+from ..db.models import USERS, UserExists
+from ..core.config import AUTH_HASH_WORKERS, AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL
 
-# Remplazar en la DB luego, solo para pruebas
-_fake_users_db = {
-    "carlos": {"username": "carlos", "hashed_password": ""},
-    "demo": {"username": "demo", "hashed_password": ""},
+# Usuarios demo ("1234" y "demo"), creados en la base de datos al primer uso.
+# Hashes precalculados: así arrancar un worker no paga el coste del hash
+_DEMO_USERS = {
+    "carlos": "$5$rounds=535000$8Od7RSTzLCWkD4EK$ENLGvt.f9765lrvu2ORvq5tuRsgPJQc70BZDdLVFm23",
+    "demo": "$5$rounds=535000$FKFs.oNgWVJLdmtx$nFeorT/HaaruzhYwbPX4Id54Xr5PtABLxVHWEZifrnD",
 }
+_demo_ready = False
+
+def get_user(username: str) -> Optional[dict]:
+    global _demo_ready
+    if not _demo_ready:
+        for name, hashed in _DEMO_USERS.items():
+            USERS.ensure(name, hashed)
+        _demo_ready = True
+    return USERS.get(username)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# El hash corre en un pool de procesos acotado: crypt() no suelta el GIL, así que en un
+# hilo bloquearía igualmente el event loop ~0.3 s por login. Se crea al primer uso
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_lock = threading.Lock()
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(max_workers=AUTH_HASH_WORKERS,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return _hash_executor
+
+async def warm_hash_executor() -> None:
+    """Arranca ya todos los procesos del pool (se crean al primer uso) con passlib cargado."""
+    executor = _get_hash_executor()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, _warm_hash, i) for i in range(AUTH_HASH_WORKERS)))
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=False, cancel_futures=True)
+            _hash_executor = None
 
-# Inicializa contraseñas demo en memoria (solo para pruebas)
-if not _fake_users_db["carlos"]["hashed_password"]:
-    _fake_users_db["carlos"]["hashed_password"] = get_password_hash("1234")
-if not _fake_users_db["demo"]["hashed_password"]:
-    _fake_users_db["demo"]["hashed_password"] = get_password_hash("demo")
+async def _run_hash(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), fn, *args)
 
-def authenticate_user(username: str, password: str):
-    user = _fake_users_db.get(username)
+# SQLite es síncrono: las consultas desde las rutas async van a un hilo para no parar el event loop
+async def _db(fn, *args):
+    return await asyncio.to_thread(fn, *args)
+
+async def authenticate_user(username: str, password: str):
+    user = await _db(get_user, username)
     if not user:
         return None
-    if not verify_password(password, user["hashed_password"]):
+    if not await _run_hash(verify_password, password, user["hashed_password"]):
         return None
     return user
 
 def issue_token_for_user(username: str) -> str:
     return create_access_token(username)
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+# -------------------------
+# Caché de tokens verificados (LRU con TTL)
+# Un token ya verificado se acepta sin volver a comprobar la firma hasta que pase el TTL
+# o expire el propio token, lo que ocurra antes.
+# -------------------------
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_token_lock = threading.Lock()
+
+def _cached_user(token: str):
+    with _token_lock:
+        entry = _token_cache.get(token)
+        if entry is None:
+            return None
+        user, valid_until = entry
+        if time.time() >= valid_until:
+            del _token_cache[token]
+            return None
+        _token_cache.move_to_end(token)
+        return user
+
+def _cache_user(token: str, user: dict, expires_at: float) -> None:
+    with _token_lock:
+        _token_cache[token] = (user, min(time.time() + AUTH_TOKEN_CACHE_TTL, expires_at))
+        _token_cache.move_to_end(token)
+        while len(_token_cache) > AUTH_TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    # async: sin salto al threadpool en cada petición (verificar un JWT cuesta microsegundos)
+    user = _cached_user(token)
+    if user is not None:
+        return user
     try:
         payload = decode_token(token)
         username: str = payload.get("sub")
@@ -44,16 +114,19 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
-    user = _fake_users_db.get(username)
+    user = await _db(get_user, username)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no encontrado")
+    _cache_user(token, user, float(payload.get("exp", 0)))
     return user
 
-def register_user(username: str, password: str):
-    if username in _fake_users_db:
+async def register_user(username: str, password: str):
+    if await _db(get_user, username) is not None:
+        raise HTTPException(status_code=400, detail="Usuario ya existe")
+    hashed = await _run_hash(get_password_hash, password)
+    try:
+        # UNIQUE(username): si otro registro terminó mientras se calculaba el hash, falla aquí
+        user = await _db(USERS.create, username, hashed)
+    except UserExists:
         raise HTTPException(status_code=400, detail="Usuario ya existe")
-    _fake_users_db[username] = {
-        "username": username,
-        "hashed_password": get_password_hash(password)
-    }
-    return {"username": username}
\ No newline at end of file
+    return {"username": user["username"]}
@@ -0,0 +1,208 @@
+# src/chess_backend/chess/analysis_cache.py
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+import chess
+from chess_backend.core.config import (
+    ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MIN_DEPTH, ANALYSIS_CACHE_MAX, ANALYSIS_CACHE_WARM,
+)
+from chess_backend.chess.tt import TranspositionTable, encode_move, decode_move
+
+# Escrituras agrupadas por transacción y cada cuántas se mira el tamaño
+BATCH_SIZE = 256
+EVICT_EVERY = 1000
+# Al pasarse del máximo se borra hasta dejar esta fracción (no en cada escritura)
+EVICT_TO = 0.9
+
+
+class CachedAnalysis(NamedTuple):
+    score: int
+    depth: int
+    flag: int
+    move: Optional[chess.Move]
+
+
+def _signed(key: int) -> int:
+    # SQLite guarda INTEGER con signo: el hash Zobrist (uint64) se reinterpreta
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+def _unsigned(key: int) -> int:
+    return key + (1 << 64) if key < 0 else key
+
+
+class AnalysisCache:
+    """
+    Resultados de búsquedas en un SQLite (WAL) compartido por los workers y que
+    sobrevive a reinicios: hash Zobrist -> (jugada, puntuación, profundidad, cota).
+
+    Las lecturas son síncronas (una consulta por clave primaria); las escrituras y los
+    contadores de uso van a una cola y los aplica un hilo en lotes, así la búsqueda
+    nunca espera al disco. Si se supera `max_entries` se borran las menos usadas.
+    """
+
+    def __init__(self, path: str = ANALYSIS_CACHE_PATH, min_depth: int = ANALYSIS_CACHE_MIN_DEPTH,
+                 max_entries: int = ANALYSIS_CACHE_MAX):
+        self.path = path
+        self.min_depth = min_depth
+        self.max_entries = max_entries
+        self.enabled = bool(path)
+        self._local = threading.local()
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writes = 0
+        self.lookups = 0
+        self.hits = 0
+        if self.enabled:
+            conn = self._conn()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis ("
+                " key INTEGER PRIMARY KEY,"
+                " move INTEGER NOT NULL,"
+                " score INTEGER NOT NULL,"
+                " depth INTEGER NOT NULL,"
+                " flag INTEGER NOT NULL,"
+                " uses INTEGER NOT NULL DEFAULT 0,"
+                " updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_uses ON analysis(uses, updated)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------------
+    # Lectura
+    # -------------------------
+    def lookup(self, key: int) -> Optional[CachedAnalysis]:
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        row = self._conn().execute(
+            "SELECT move, score, depth, flag FROM analysis WHERE key = ?", (_signed(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        self._enqueue(("use", key))
+        move, score, depth, flag = row
+        return CachedAnalysis(score, depth, flag, decode_move(move))
+
+    def hottest(self, limit: int) -> List[Tuple[int, CachedAnalysis]]:
+        """Las `limit` entradas más usadas (para precargar la TT)."""
+        if not self.enabled or limit <= 0:
+            return []
+        rows = self._conn().execute(
+            "SELECT key, move, score, depth, flag FROM analysis ORDER BY uses DESC, updated DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [(_unsigned(key), CachedAnalysis(score, depth, flag, decode_move(move)))
+                for key, move, score, depth, flag in rows]
+
+    def warm(self, tt, limit: int = ANALYSIS_CACHE_WARM) -> int:
+        """Precarga en la TT (en memoria) las entradas más usadas; devuelve cuántas."""
+        entries = self.hottest(limit)
+        for key, entry in entries:
+            tt.store(key, entry.score, entry.depth, entry.flag, entry.move)
+        return len(entries)
+
+    def snapshot(self, limit: int = ANALYSIS_CACHE_WARM) -> Optional[str]:
+        """
+        Precarga una TT como la de los workers y la guarda junto a la caché (`path`.tt):
+        se hace una vez al arrancar el servidor y cada worker la lee de golpe
+        (TranspositionTable.load) en vez de repetir la consulta y las inserciones.
+        Devuelve la ruta, o None si la caché está desactivada.
+        """
+        if not self.enabled:
+            return None
+        table = TranspositionTable()
+        self.warm(table, limit)
+        path = self.path + ".tt"
+        table.save(path)
+        return path
+
+    # -------------------------
+    # Escritura (asíncrona)
+    # -------------------------
+    def put(self, key: int, score: int, depth: int, flag: int, move: Optional[chess.Move]) -> None:
+        """Guarda un resultado si llega a min_depth; una entrada más profunda no se pisa."""
+        if not self.enabled or depth < self.min_depth or move is None:
+            return
+        self._enqueue(("put", key, encode_move(move), score, depth, flag))
+
+    def flush(self) -> None:
+        """Espera a que el hilo escritor vacíe la cola."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _enqueue(self, op: Tuple) -> None:
+        # el hilo no sobrevive a un fork: cada proceso arranca el suyo
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="analysis-cache", daemon=True)
+            self._writer.start()
+        self._queue.put(op)
+
+    def _write_loop(self) -> None:
+        while True:
+            ops = [self._queue.get()]
+            while len(ops) < BATCH_SIZE:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply(ops)
+            except sqlite3.Error:
+                # es una caché: si el disco falla se pierde el lote, no la búsqueda
+                pass
+            finally:
+                for _ in ops:
+                    self._queue.task_done()
+
+    def _apply(self, ops: List[Tuple]) -> None:
+        now = time.time()
+        puts = [(_signed(op[1]), op[2], op[3], op[4], op[5], now) for op in ops if op[0] == "put"]
+        uses = [(_signed(op[1]),) for op in ops if op[0] == "use"]
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT INTO analysis (key, move, score, depth, flag, updated) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET move = excluded.move, score = excluded.score,"
+                " depth = excluded.depth, flag = excluded.flag, updated = excluded.updated"
+                " WHERE excluded.depth >= analysis.depth",
+                puts,
+            )
+            conn.executemany("UPDATE analysis SET uses = uses + 1 WHERE key = ?", uses)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        self._writes += len(puts)
+        if self._writes >= EVICT_EVERY:
+            self._writes = 0
+            self._evict()
+
+    def _evict(self) -> None:
+        conn = self._conn()
+        (count,) = conn.execute("SELECT COUNT(*) FROM analysis").fetchone()
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * EVICT_TO)
+        conn.execute(
+            "DELETE FROM analysis WHERE key IN"
+            " (SELECT key FROM analysis ORDER BY uses, updated LIMIT ?)", (excess,)
+        )
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "lookups": self.lookups, "hits": self.hits,
+                "pending_writes": self._queue.qsize()}
+
+
+ANALYSIS_CACHE = AnalysisCache()
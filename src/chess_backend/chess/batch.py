@@ -0,0 +1,252 @@
+# src/chess_backend/chess/batch.py
+import argparse
+import itertools
+import json
+import os
+import sys
+from collections import OrderedDict, deque
+from contextlib import closing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+import chess
+from chess.polyglot import zobrist_hash
+
+# -------------------------
+# Análisis por lotes: FENs o partidas PGN repartidas en un pool de procesos.
+# Los resultados salen en el orden de entrada (NDJSON) y las posiciones repetidas
+# (p. ej. las jugadas de apertura comunes a varias partidas) se analizan una sola vez.
+#   python -m chess_backend.chess.batch --pgn partidas.pgn --depth 3 > analisis.ndjson
+#   python -m chess_backend.chess.batch --fens posiciones.txt --workers 4
+# Puntuaciones en centipawns desde el bando que mueve.
+# -------------------------
+
+# Pérdida (cp) de la jugada hecha respecto a la mejor, para clasificarla
+BLUNDER = 300
+MISTAKE = 100
+INACCURACY = 50
+# Las puntuaciones de mate se recortan: perder un mate en 3 no son 100000 cp
+SCORE_CAP = 1000
+MATE_SCORE = 100000
+
+# Jugadas en vuelo por worker (suficiente para no dejar procesos parados)
+WINDOW_PER_WORKER = 4
+# Posiciones recordadas para deduplicar
+DEDUPE_MAX = 200000
+
+Submit = Callable[..., Future]
+
+
+# -------------------------
+# Lado del worker
+# -------------------------
+def analyze_position(fen: str, depth: int, time_limit: float) -> Dict:
+    """
+    Mejor jugada y puntuación (bando que mueve) de una posición.
+    depth 0: solo evaluate(), sin búsqueda.
+    """
+    from chess_backend.chess.evaluate import evaluate
+    from chess_backend.chess.search import find_best
+    from chess_backend.chess.tablebase import TABLEBASES, wdl_score
+
+    board = chess.Board(fen)
+    if board.is_game_over():
+        score = -MATE_SCORE if board.is_checkmate() else 0
+        return {"best_move": None, "score": score, "depth": 0, "nodes": 0}
+    if depth <= 0:
+        score = evaluate(board)
+        return {"best_move": None, "score": score if board.turn == chess.WHITE else -score,
+                "depth": 0, "nodes": 0}
+
+    info: Dict = {}
+    move = find_best(board, max_depth=depth, time_limit=time_limit, use_book=False, info=info)
+    if info.get("source") == "tablebase":
+        wdl = TABLEBASES.probe_wdl(board)
+        info["score"] = wdl_score(wdl, 0) if wdl is not None else 0
+    return {
+        "best_move": move.uci() if move else None,
+        "score": info.get("score", 0),
+        "depth": info.get("depth", 0),
+        "nodes": info.get("nodes", 0),
+    }
+
+
+# -------------------------
+# Pipeline: envío con ventana, deduplicación y salida en orden
+# -------------------------
+def analyze_stream(positions: Iterable[Tuple[chess.Board, Dict]], submit: Submit,
+                   depth: int, time_limit: float, window: int) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    Recibe (tablero, meta) y produce (meta, resultado) en el mismo orden.
+    Como mucho `window` posiciones en vuelo, así la entrada se lee a medida que avanza.
+    Si se cierra antes de terminar (close(): el cliente se fue) o falla, las posiciones
+    en vuelo se cancelan.
+    """
+    seen: "OrderedDict[int, Future]" = OrderedDict()
+    pending: deque = deque()
+
+    try:
+        for board, meta in positions:
+            key = zobrist_hash(board)
+            future = seen.get(key)
+            if future is None:
+                future = submit(analyze_position, board.fen(), depth, time_limit)
+                seen[key] = future
+                if len(seen) > DEDUPE_MAX:
+                    seen.popitem(last=False)
+                meta["cached"] = False
+            else:
+                seen.move_to_end(key)
+                meta["cached"] = True
+            pending.append((meta, future))
+            while len(pending) >= window:
+                meta, future = pending.popleft()
+                yield meta, future.result()
+
+        while pending:
+            meta, future = pending.popleft()
+            yield meta, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def classify(loss: int) -> Optional[str]:
+    if loss >= BLUNDER:
+        return "blunder"
+    if loss >= MISTAKE:
+        return "mistake"
+    if loss >= INACCURACY:
+        return "inaccuracy"
+    return None
+
+def _cap(score: int) -> int:
+    return max(-SCORE_CAP, min(SCORE_CAP, score))
+
+
+# -------------------------
+# FENs
+# -------------------------
+def _fen_positions(lines: Iterable[str], errors: list) -> Iterator[Tuple[chess.Board, Dict]]:
+    for index, line in enumerate(l.strip() for l in lines):
+        if not line:
+            continue
+        try:
+            board = chess.Board(line)
+        except ValueError:
+            errors.append({"index": index, "fen": line, "error": "FEN inválida"})
+            continue
+        yield board, {"index": index, "fen": line}
+
+def analyze_fens(lines: Iterable[str], submit: Submit, depth: int = 3, time_limit: float = 10.0,
+                 window: int = 8, max_positions: Optional[int] = None) -> Iterator[Dict]:
+    """Un registro por FEN: mejor jugada, puntuación, profundidad, nodos (o error)."""
+    errors: list = []
+    positions = itertools.islice(_fen_positions(lines, errors), max_positions)
+    # closing: cerrar este generador cierra también el pipeline (y cancela lo que tenga en vuelo)
+    with closing(analyze_stream(positions, submit, depth, time_limit, window)) as results:
+        for meta, result in results:
+            # las FEN inválidas se emiten en su sitio, antes de la siguiente válida
+            while errors and errors[0]["index"] < meta["index"]:
+                yield errors.pop(0)
+            yield {**meta, **result}
+    yield from errors
+
+
+# -------------------------
+# PGN
+# -------------------------
+def _pgn_positions(stream: TextIO) -> Iterator[Tuple[chess.Board, Dict]]:
+    """Cada posición de la línea principal de cada partida (incluida la final), leyendo partida a partida."""
+    import chess.pgn  # (y con él chess.engine y chess.svg) solo si llega un PGN
+    for game_index in itertools.count():
+        game = chess.pgn.read_game(stream)
+        if game is None:
+            return
+        board = game.board()
+        ply = 0
+        for move in game.mainline_moves():
+            meta = {"game": game_index, "ply": ply, "fen": board.fen(),
+                    "move": board.san(move), "move_uci": move.uci()}
+            if ply == 0:
+                meta["headers"] = dict(game.headers)
+            yield board.copy(stack=False), meta
+            board.push(move)
+            ply += 1
+        final = {"game": game_index, "ply": ply, "fen": board.fen(), "move": None, "final": True}
+        if ply == 0:
+            final["headers"] = dict(game.headers)
+        yield board.copy(stack=False), final
+
+def annotate_pgn(stream: TextIO, submit: Submit, depth: int = 3, time_limit: float = 10.0,
+                 window: int = 8, max_positions: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Un registro por jugada (pérdida respecto a la mejor y clasificación) y uno de
+    resumen por partida. La pérdida compara la puntuación antes de la jugada con la
+    de la posición resultante, vista desde el mismo bando.
+    """
+    positions = itertools.islice(_pgn_positions(stream), max_positions)
+    previous = None
+    summary = None
+    with closing(analyze_stream(positions, submit, depth, time_limit, window)) as results:
+        for meta, result in results:
+            if previous is not None and previous[0]["game"] == meta["game"]:
+                before, best = previous
+                played_best = best["best_move"] == before["move_uci"]
+                loss = 0 if played_best else max(0, _cap(best["score"]) - _cap(-result["score"]))
+                label = classify(loss)
+                if label:
+                    summary["counts"][label] += 1
+                yield {
+                    "game": before["game"],
+                    "ply": before["ply"],
+                    "fen": before["fen"],
+                    "move": before["move"],
+                    "best_move": best["best_move"],
+                    "score": best["score"],
+                    "score_after": -result["score"],
+                    "loss": loss,
+                    "class": label,
+                    "depth": best["depth"],
+                    "cached": before["cached"],
+                }
+            if "headers" in meta:
+                summary = {"game": meta["game"], "summary": True, "headers": meta["headers"],
+                           "counts": {"blunder": 0, "mistake": 0, "inaccuracy": 0}}
+            if meta.get("final"):
+                summary["plies"] = meta["ply"]
+                yield summary
+                previous = None
+            else:
+                previous = (meta, result)
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Análisis por lotes de FENs o partidas PGN (salida NDJSON)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fens", help="fichero con una FEN por línea ('-' = stdin)")
+    source.add_argument("--pgn", help="fichero PGN ('-' = stdin)")
+    parser.add_argument("--depth", type=int, default=3, help="0 = solo evaluación estática")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="tope por posición (s)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="-", help="fichero de salida ('-' = stdout)")
+    args = parser.parse_args()
+
+    path = args.fens or args.pgn
+    source_file = sys.stdin if path == "-" else open(path, encoding="utf-8", errors="replace")
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = workers * WINDOW_PER_WORKER
+        if args.fens:
+            records = analyze_fens(source_file, pool.submit, args.depth, args.time_limit, window)
+        else:
+            records = annotate_pgn(source_file, pool.submit, args.depth, args.time_limit, window)
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+if __name__ == "__main__":
+    main()
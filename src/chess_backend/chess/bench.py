@@ -0,0 +1,253 @@
+# src/chess_backend/chess/bench.py
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+import chess
+from chess_backend.chess import search
+from chess_backend.chess.evaluate import evaluate, see_gain, PAWN_HASH
+from chess_backend.chess.search_board import SearchBoard
+
+# -------------------------
+# Benchmark del motor
+#   python -m chess_backend.chess.bench --depth 3 --json bench.json
+#   python -m chess_backend.chess.bench --compare bench.json --threshold 0.05
+# Partes: perft (generación de jugadas), bench (búsqueda a profundidad fija: nodos,
+# NPS y firma) y micro (evaluate / see_gain por segundo).
+# -------------------------
+
+# (fen, profundidad, nodos esperados)
+PERFT_POSITIONS = [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 4, 197281),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 3, 97862),
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4, 43238),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3, 62379),
+    ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", 3, 89890),
+]
+
+# Posiciones del bench: aperturas, medios juegos tácticos y finales
+BENCH_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 11",
+    "4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19",
+    "rq3rk1/ppp2ppp/1bnpb3/3N2B1/3NP3/7P/PPPQ1PP1/2KR3R w - - 7 14",
+    "r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14",
+    "r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15",
+    "r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13",
+    "r1bq1rk1/ppp1nppp/4n3/3p3Q/3P4/1BP1B3/PP1N2PP/R4RK1 w - - 1 16",
+    "4r1k1/r1q2ppp/ppp2n2/4P3/5Rb1/1N1BQ3/PPP3PP/R5K1 w - - 1 17",
+    "2rqkb1r/ppp2p2/2npb1p1/1N1Nn2p/2P1PP2/8/PP2B1PP/R1BQK2R b KQ - 0 11",
+    "r1bq1r1k/b1p1npp1/p2p3p/1p6/3PP3/1B2NN2/PP3PPP/R2Q1RK1 w - - 1 16",
+    "3r1rk1/p5pp/bpp1pp2/8/q1PP1P2/b3P3/P2NQRPP/1R2B1K1 b - - 6 22",
+    "r1q2rk1/2p1bppp/2Pp4/p6b/Q1PNp3/4B3/PP1R1PPP/2K4R w - - 2 18",
+    "4k2r/1pb2ppp/1p2p3/1R1p4/3P4/2r1PN2/P4PPP/1R4K1 b - - 3 22",
+    "3q2k1/pb3p1p/4pbp1/2r5/PpN2N2/1P2P2P/5PP1/Q2R2K1 b - - 4 26",
+    "6k1/6p1/6Pp/ppp5/3pn2P/1P3K2/1PP2P2/3N4 b - - 0 1",
+    "3b4/5kp1/1p1p1p1p/pP1PpP1P/P1P1P3/3KN3/8/8 w - - 0 1",
+    "2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1",
+    "8/6pk/1p6/8/PP3p1p/5P2/4KP1q/3Q4 w - - 0 1",
+    "7k/3p2pp/4q3/8/4Q3/5Kp1/P6b/8 w - - 0 1",
+    "8/2p5/8/2kPKp1p/2p4P/2P5/3P4/8 w - - 0 1",
+    "8/1p3pp1/7p/5P1P/2k3P1/8/2K2P2/8 w - - 0 1",
+    "8/pp2r1k1/2p1p3/3pP2p/1P1P1P1P/P5KR/8/8 w - - 0 1",
+    "8/3p4/p1bk3p/Pp6/1Kp1PpPp/2P2P1P/2P5/5B2 b - - 0 1",
+    "5k2/7R/4P2p/5K2/p1r2P1p/8/8/8 b - - 0 1",
+    "6k1/6p1/P6p/r1N5/5p2/7P/1b3PP1/4R1K1 w - - 0 1",
+    "1r3k2/4q3/2Pp3b/3Bp3/2Q2p2/1p1P2P1/1P2KP2/3N4 w - - 0 1",
+    "6k1/4pp1p/3p2p1/P1pPb3/R7/1r2P1PP/3B1P2/6K1 w - - 0 1",
+    "8/3p3B/5p2/5P2/p7/PP5b/k7/6K1 w - - 0 1",
+    "5rk1/q6p/2p3bR/1pPp1rP1/1P1Pp3/P3B1Q1/1K3P2/R7 w - - 93 90",
+    "4rrk1/1p1nq3/p7/2p1P1pp/3P2bp/3Q1Bn1/PPPB4/1K2R1NR w - - 40 21",
+    "r3k2r/3nnpbp/q2pp1p1/p7/Pp1PPPP1/4BNN1/1P5P/R2Q1RK1 w kq - 0 16",
+    "3Qb1k1/1r2ppb1/pN1n2q1/Pp1Pp1Pr/4P2p/4BP2/4B1R1/1R5K b - - 11 40",
+    "4k3/3q1r2/1N2r1b1/3ppN2/2nPP3/1B1R2n1/2R1Q3/3K4 w - - 5 1",
+    "8/8/8/8/5kp1/P7/8/1K1N4 w - - 0 1",
+    "8/8/8/5N2/8/p7/8/2NK3k w - - 0 1",
+    "8/3k4/8/8/8/4B3/4KB2/2B5 w - - 0 1",
+    "8/8/1P6/5pr1/8/4R3/7k/2K5 w - - 0 1",
+    "8/2p4P/8/kr6/6R1/8/8/1K6 w - - 0 1",
+    "8/8/3P3k/8/1p6/8/1P6/1K3n2 b - - 0 1",
+    "8/R7/2q5/8/6k1/8/1P5p/K6R w - - 0 124",
+    "6k1/3b3r/1p1p4/p1n2p2/1PPNpP1q/P3Q1p1/1R1RB1P1/5K2 b - - 0 1",
+    "r2r1n2/pp2bk2/2p1p2p/3q4/3PN1QP/2P3R1/P4PP1/5RK1 w - - 0 1",
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8",
+    "r2q1rk1/1b1nbppp/pp1ppn2/8/2PNP3/1PN1BP2/P2QB1PP/R4RK1 w - - 0 12",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "2rq1rk1/pp1bppbp/3p1np1/8/2BNP3/2N1BP2/PPPQ2PP/2KR3R b - - 0 12",
+    "rnbqkb1r/pp1p1ppp/4pn2/2p5/2PP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 0 4",
+    "r1b1k2r/ppppnppp/2n2q2/2b5/3NP3/2P1B3/PP3PPP/RN1QKB1R w KQkq - 0 1",
+]
+
+BENCH_DEPTH = 3
+# Métricas "más es mejor" que se comparan con --compare
+COMPARED = [
+    ("perft", "nps"),
+    ("bench", "nps"),
+    ("micro", "evaluate_per_sec"),
+    ("micro", "see_per_sec"),
+]
+
+
+# -------------------------
+# Perft
+# -------------------------
+def perft(board: chess.Board, depth: int) -> int:
+    """Hojas a `depth` medias jugadas (la última capa se cuenta sin hacer push)."""
+    if depth == 1:
+        return board.legal_moves.count()
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+def run_perft() -> Dict:
+    # SearchBoard: así se valida también el material/PST incremental en push/pop
+    positions = []
+    total_nodes = 0
+    start = time.perf_counter()
+    for fen, depth, expected in PERFT_POSITIONS:
+        nodes = perft(SearchBoard(fen), depth)
+        total_nodes += nodes
+        positions.append({"fen": fen, "depth": depth, "nodes": nodes, "ok": nodes == expected})
+    elapsed = time.perf_counter() - start
+    return {
+        "nodes": total_nodes,
+        "time": elapsed,
+        "nps": total_nodes / elapsed,
+        "ok": all(p["ok"] for p in positions),
+        "positions": positions,
+    }
+
+
+# -------------------------
+# Bench de búsqueda (profundidad fija, sin reloj)
+# -------------------------
+def search_nodes(fen: str, depth: int) -> int:
+    """Nodos (incluida quiescencia) para buscar `fen` a `depth` desde tablas vacías."""
+    search.TT.clear()
+    PAWN_HASH.clear()
+    search.EVAL_HASH.clear()
+    search.TT.new_search()
+    nodes = {}
+
+    def report(d: int, score: int, move: Optional[chess.Move]) -> None:
+        nodes[d] = search._ctl.nodes
+
+    search.iterative_deepening(SearchBoard(fen), depth, 1e9, on_iteration=report)
+    return nodes.get(depth, 0)
+
+def run_bench(depth: int = BENCH_DEPTH, fens: List[str] = BENCH_FENS) -> Dict:
+    per_position = []
+    eval_probes = eval_hits = 0
+    start = time.perf_counter()
+    for fen in fens:
+        per_position.append(search_nodes(fen, depth))
+        eval_probes += search.EVAL_HASH.probes
+        eval_hits += search.EVAL_HASH.hits
+    elapsed = time.perf_counter() - start
+    total = sum(per_position)
+    return {
+        "depth": depth,
+        "positions": len(fens),
+        "nodes": total,
+        "time": elapsed,
+        "nps": total / elapsed,
+        "eval_hash_hit_rate": eval_hits / eval_probes if eval_probes else 0.0,
+        # cambia si cambia el árbol explorado (poda, ordenación, evaluación)
+        "signature": total,
+        "per_position": per_position,
+    }
+
+
+# -------------------------
+# Microbenchmarks
+# -------------------------
+def _rate(fn, items: list, min_time: float) -> float:
+    """Llamadas por segundo de fn sobre items, repitiendo hasta pasar min_time."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            fn(*item)
+        calls += len(items)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+def run_micro(min_time: float = 1.0, fens: List[str] = BENCH_FENS) -> Dict:
+    boards = [chess.Board(fen) for fen in fens]
+    captures = [(b, m) for b in boards for m in b.generate_legal_captures()]
+    # la caché de peones queda caliente tras la primera vuelta, como durante la búsqueda
+    return {
+        "evaluate_per_sec": _rate(evaluate, [(b,) for b in boards], min_time),
+        "see_per_sec": _rate(see_gain, captures, min_time),
+        "captures": len(captures),
+    }
+
+
+# -------------------------
+# Comparación con una ejecución anterior
+# -------------------------
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Regresiones (caídas mayores que `threshold`) respecto a `baseline`."""
+    regressions = []
+    for part, metric in COMPARED:
+        old = baseline.get(part, {}).get(metric)
+        new = current.get(part, {}).get(metric)
+        if not old or new is None:
+            continue
+        change = new / old - 1
+        print(f"{part}.{metric}: {old:,.0f} -> {new:,.0f} ({change:+.1%})")
+        if change < -threshold:
+            regressions.append(f"{part}.{metric} {change:+.1%}")
+    old_sig = baseline.get("bench", {}).get("signature")
+    new_sig = current.get("bench", {}).get("signature")
+    if old_sig is not None and new_sig is not None and old_sig != new_sig:
+        print(f"firma del bench: {old_sig} -> {new_sig} (el árbol de búsqueda cambió)")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del motor: perft, bench y micro")
+    parser.add_argument("--parts", nargs="+", choices=["perft", "bench", "micro"],
+                        default=["perft", "bench", "micro"])
+    parser.add_argument("--depth", type=int, default=BENCH_DEPTH)
+    parser.add_argument("--micro-time", type=float, default=1.0)
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="caída máxima tolerada (0.05 = 5%%)")
+    args = parser.parse_args()
+
+    results = {"python": platform.python_version(), "chess": chess.__version__}
+    if "perft" in args.parts:
+        results["perft"] = p = run_perft()
+        print(f"perft  nodes={p['nodes']:,} nps={p['nps']:,.0f} ok={p['ok']}")
+    if "bench" in args.parts:
+        results["bench"] = b = run_bench(args.depth)
+        print(f"bench  depth={b['depth']} nodes={b['nodes']:,} time={b['time']:.1f}s "
+              f"nps={b['nps']:,.0f} eval_hash={b['eval_hash_hit_rate']:.1%} signature={b['signature']}")
+    if "micro" in args.parts:
+        results["micro"] = m = run_micro(args.micro_time)
+        print(f"micro  evaluate={m['evaluate_per_sec']:,.0f}/s see_gain={m['see_per_sec']:,.0f}/s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = "perft" in results and not results["perft"]["ok"]
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESIÓN: {r}")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
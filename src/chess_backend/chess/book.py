@@ -0,0 +1,59 @@
+# src/chess_backend/chess/book.py
+import random
+from typing import Optional
+import chess
+import chess.polyglot
+from chess_backend.core.config import BOOK_PATH, BOOK_MAX_PLY
+
+
+class OpeningBook:
+    """
+    Libro de aperturas en formato Polyglot (.bin).
+
+    El fichero se abre con mmap y cada consulta es una búsqueda binaria sobre las
+    claves Zobrist (entradas de 16 bytes ordenadas), así no se carga en memoria y los
+    procesos del motor comparten sus páginas. Se abre al primer uso en cada proceso.
+    """
+
+    def __init__(self, path: str = BOOK_PATH, max_ply: int = BOOK_MAX_PLY):
+        self.path = path
+        self.max_ply = max_ply
+        self._reader: Optional[chess.polyglot.MemoryMappedReader] = None
+        self._unavailable = not path
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self) -> Optional[chess.polyglot.MemoryMappedReader]:
+        if self._reader is None and not self._unavailable:
+            try:
+                self._reader = chess.polyglot.open_reader(self.path)
+            except (OSError, ValueError):
+                # fichero inexistente o vacío: se juega sin libro
+                self._unavailable = True
+        return self._reader
+
+    def pick(self, board: chess.Board, rng: Optional[random.Random] = None) -> Optional[chess.Move]:
+        """
+        Jugada de libro elegida al azar según su peso, o None si la posición no está
+        (o ya se pasó de max_ply). Solo devuelve jugadas legales.
+        """
+        if board.ply() >= self.max_ply:
+            return None
+        reader = self._open()
+        if reader is None:
+            return None
+        try:
+            entry = reader.weighted_choice(board, random=rng)
+        except IndexError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.move
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+BOOK = OpeningBook()
@@ -1,6 +1,31 @@
 import chess
-from .search import find_best
+from typing import Dict, Optional
 
-def best_move(board: chess.Board, depth: int = 3, time_limit: float = 1.0) -> chess.Move:
+# -------------------------
+# Reparto de tiempo con reloj de partida (segundos)
+# -------------------------
+MOVES_TO_GO_DEFAULT = 30   # jugadas que se asumen restantes si el reloj no lo indica
+MOVE_OVERHEAD = 0.05       # margen por jugada para red y serialización
+MIN_MOVE_TIME = 0.02
+
+def allocate_time(remaining: float, increment: float = 0.0, moves_to_go: Optional[int] = None) -> float:
+    """
+    Tiempo para esta jugada: una fracción del reloj más la mayor parte del incremento,
+    sin pasar nunca de la mitad del tiempo restante.
+    """
+    mtg = moves_to_go if moves_to_go else MOVES_TO_GO_DEFAULT
+    budget = remaining / mtg + 0.75 * increment
+    budget = min(budget, 0.5 * remaining, remaining - MOVE_OVERHEAD)
+    return max(MIN_MOVE_TIME, budget)
+
+def best_move(board: chess.Board, depth: int = 6, time_limit: float = 1.0, workers: int = 1,
+              info: Optional[Dict] = None, max_nodes: Optional[int] = None) -> chess.Move:
     # si quieres priorizar tiempo sobre profundidad, pasa time_limit
-    return find_best(board, max_depth=depth, time_limit=time_limit)
+    # workers > 1: búsqueda paralela (Lazy SMP) de esta posición
+    # info: dict que se rellena con las estadísticas de la búsqueda
+    # max_nodes: presupuesto de nodos (el planificador lo ajusta con la carga)
+    # el motor se importa aquí: el servidor importa este módulo (allocate_time) pero solo
+    # busca en los procesos del pool
+    from .search import find_best
+    return find_best(board, max_depth=depth, time_limit=time_limit, workers=workers, info=info,
+                     max_nodes=max_nodes)
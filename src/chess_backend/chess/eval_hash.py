@@ -0,0 +1,55 @@
+# src/chess_backend/chess/eval_hash.py
+from array import array
+from typing import Optional
+from chess_backend.core.config import EVAL_HASH_ENTRIES
+
+# -------------------------
+# Entrada (64 bits): 32 bits altos del hash Zobrist | score + SCORE_OFFSET
+# Los bits bajos del hash ya eligen la casilla, así que se comprueban 32 + log2(tamaño) bits.
+# 0 = vacía (ningún score llega a -SCORE_OFFSET)
+# -------------------------
+SCORE_OFFSET = 1 << 31
+KEY_MASK = 0xFFFFFFFF00000000
+
+
+class EvalHashTable:
+    """
+    Caché de evaluate() por hash Zobrist, aparte de la TT: las evaluaciones sobreviven
+    aunque la TT reemplace la entrada de la posición. Tamaño fijo, preasignado, y
+    reemplazo siempre (una evaluación cuesta lo mismo en cualquier profundidad).
+    Guarda el score desde las blancas, como evaluate().
+    """
+
+    def __init__(self, entries: int = EVAL_HASH_ENTRIES):
+        self.size = 1 << (max(1, entries).bit_length() - 1)
+        self._mask = self.size - 1
+        self._table = array("Q", bytes(8 * self.size))
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self) -> None:
+        self._table = array("Q", bytes(8 * self.size))
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[int]:
+        self.probes += 1
+        data = self._table[key & self._mask]
+        if data and (data ^ key) & KEY_MASK == 0:
+            self.hits += 1
+            return (data & 0xFFFFFFFF) - SCORE_OFFSET
+        return None
+
+    def store(self, key: int, score: int) -> None:
+        self._table[key & self._mask] = (key & KEY_MASK) | (score + SCORE_OFFSET)
+
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+        }
@@ -1,6 +1,10 @@
 # src/chess_backend/chess/evaluate.py
 import chess
-from typing import List, Dict, Optional
+from typing import List, Dict, Tuple
+from chess_backend.chess.pawn_hash import PawnHashTable, PawnEntry
+from chess_backend.chess.weights import (
+    PST_PAWN, PST_KNIGHT, PST_BISHOP, PST_ROOK, PST_QUEEN, PST_KING_MID, PST_KING_END, WEIGHTS,
+)
 
 # -------------------------
 # Valores base (centipawns)
@@ -15,251 +19,247 @@ VALUES: Dict[int, int] = {
 }
 
 # -------------------------
-# Piece-square tables (medio juego)
-#
+# Piece-square tables y parámetros ajustables: chess/weights.py (generado por tuning.py)
 # -------------------------
-PST_PAWN = [
-     0,   0,   0,   0,   0,   0,   0,   0,
-     5,  10,  10, -20, -20,  10,  10,   5,
-     5,  -5, -10,   0,   0, -10,  -5,   5,
-     0,   0,   0,  20,  20,   0,   0,   0,
-     5,   5,  10,  25,  25,  10,   5,   5,
-    10,  10,  20,  30,  30,  20,  10,  10,
-    50,  50,  50,  50,  50,  50,  50,  50,
-     0,   0,   0,   0,   0,   0,   0,   0
-]
-
-PST_KNIGHT = [
-   -50,-40,-30,-30,-30,-30,-40,-50,
-   -40,-20,  0,  5,  5,  0,-20,-40,
-   -30,  5, 10, 15, 15, 10,  5,-30,
-   -30,  0, 15, 20, 20, 15,  0,-30,
-   -30,  5, 15, 20, 20, 15,  5,-30,
-   -30,  0, 10, 15, 15, 10,  0,-30,
-   -40,-20,  0,  0,  0,  0,-20,-40,
-   -50,-40,-30,-30,-30,-30,-40,-50
-]
-
-PST_BISHOP = [
-   -20,-10,-10,-10,-10,-10,-10,-20,
-   -10,  5,  0,  0,  0,  0,  5,-10,
-   -10, 10, 10, 10, 10, 10, 10,-10,
-   -10,  0, 10, 10, 10, 10,  0,-10,
-   -10,  5,  5, 10, 10,  5,  5,-10,
-   -10,  0,  5, 10, 10,  5,  0,-10,
-   -10,  0,  0,  0,  0,  0,  0,-10,
-   -20,-10,-10,-10,-10,-10,-10,-20
-]
-
-PST_ROOK = [
-     0,  0,  5, 10, 10,  5,  0,  0,
-     0,  0,  5, 10, 10,  5,  0,  0,
-     0,  0,  5, 10, 10,  5,  0,  0,
-     0,  0,  5, 10, 10,  5,  0,  0,
-     0,  0,  5, 10, 10,  5,  0,  0,
-     0,  0,  5, 10, 10,  5,  0,  0,
-    25, 25, 25, 25, 25, 25, 25, 25,
-     0,  0,  5, 10, 10,  5,  0,  0
-]
-
-PST_QUEEN = [
-   -20,-10,-10, -5, -5,-10,-10,-20,
-   -10,  0,  0,  0,  0,  0,  0,-10,
-   -10,  0,  5,  5,  5,  5,  0,-10,
-    -5,  0,  5,  5,  5,  5,  0, -5,
-     0,  0,  5,  5,  5,  5,  0, -5,
-   -10,  5,  5,  5,  5,  5,  0,-10,
-   -10,  0,  5,  0,  0,  0,  0,-10,
-   -20,-10,-10, -5, -5,-10,-10,-20
-]
-
-PST_KING_MID = [
-   -30,-40,-40,-50,-50,-40,-40,-30,
-   -30,-40,-40,-50,-50,-40,-40,-30,
-   -30,-40,-40,-50,-50,-40,-40,-30,
-   -30,-40,-40,-50,-50,-40,-40,-30,
-   -20,-30,-30,-40,-40,-30,-30,-20,
-   -10,-20,-20,-20,-20,-20,-20,-10,
-    20, 20,  0,  0,  0,  0, 20, 20,
-    20, 30, 10,  0,  0, 10, 30, 20
-]
-
-PST_KING_END = [
-   -50,-40,-30,-20,-20,-30,-40,-50,
-   -30,-20,-10,  0,  0,-10,-20,-30,
-   -30,-10, 20, 30, 30, 20,-10,-30,
-   -30,-10, 30, 40, 40, 30,-10,-30,
-   -30,-10, 30, 40, 40, 30,-10,-30,
-   -30,-10, 20, 30, 30, 20,-10,-30,
-   -30,-30,  0,  0,  0,  0,-30,-30,
-   -50,-30,-30,-30,-30,-30,-30,-50
-]
-
 PST: Dict[int, List[int]] = {
     chess.PAWN: PST_PAWN,
     chess.KNIGHT: PST_KNIGHT,
     chess.BISHOP: PST_BISHOP,
     chess.ROOK: PST_ROOK,
     chess.QUEEN: PST_QUEEN,
-    # KING table chosen dynamically by phase
+    # KING: PST_KING_MID / PST_KING_END graduadas por fase
 }
 
 CENTER_SQUARES = {chess.D4, chess.D5, chess.E4, chess.E5}
 
 # -------------------------
-# Parámetros ajustables (tuning)
-# -------------------------
-WEIGHTS = {
-    "bishop_pair": 40,
-    "passed_pawn_base": 30,
-    "passed_pawn_advance": 10,
-    "isolated_pawn": -15,
-    "doubled_pawn": -10,
-    "outpost_knight": 25,
-    "outpost_bishop": 15,
-    "rook_open_file": 20,
-    "rook_semiopen_file": 10,
-    "connected_rooks": 20,
-    "king_shield": 8,
-    "space": 6,
-    "tempo": 10,
-    "exchange_when_ahead": 30,
-    "avoid_exchange_when_ahead": -20,
-    "pawn_majority": 12,
-    "king_activity_endgame": 30,
-    "book_bias": 25,  # small bias for opening book moves
-}
-
-# -------------------------
-# Opening bias (muy pequeño). No es un libro completo.
-# Mapea FEN prefix (solo apertura) a movimientos UCI comunes.
-# Puedes ampliar con un PGN externo si quieres.
+# Máscaras de bitboards (precalculadas al importar)
 # -------------------------
-OPENING_BIAS = {
-    # posición inicial -> favorece e2e4, d2d4, g1f3, c2c4
-    "start": ["e2e4", "d2d4", "g1f3", "c2c4"],
-    # Ejemplo: Sicilian after 1.e4 c5 -> favorece Nf3, d4
-    "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq -": ["g1f3", "d2d4"],
+def _file_span(file: int) -> int:
+    """Columnas file-1..file+1 (recortadas al tablero)."""
+    bb = 0
+    for f in range(max(0, file - 1), min(7, file + 1) + 1):
+        bb |= chess.BB_FILES[f]
+    return bb
+
+def _ranks(lo: int, hi: int) -> int:
+    bb = 0
+    for r in range(max(0, lo), min(7, hi) + 1):
+        bb |= chess.BB_RANKS[r]
+    return bb
+
+# columnas adyacentes (sin la propia): peón aislado si no hay peones propios aquí
+ADJACENT_FILES: List[int] = [_file_span(f) & ~chess.BB_FILES[f] for f in range(8)]
+
+# casillas por delante en la columna propia y adyacentes: peón pasado si no hay peones rivales
+PASSED_MASK: List[List[int]] = [[0] * 64, [0] * 64]
+# casillas desde las que un peón rival podría atacar la casilla (outpost si están vacías de peones rivales)
+OUTPOST_MASK: List[List[int]] = [[0] * 64, [0] * 64]
+# escudo de peones delante/alrededor del rey
+KING_SHIELD_MASK: List[List[int]] = [[0] * 64, [0] * 64]
+
+for _sq in chess.SQUARES:
+    _f = chess.square_file(_sq)
+    _r = chess.square_rank(_sq)
+    _span = _file_span(_f)
+    PASSED_MASK[chess.WHITE][_sq] = _span & _ranks(_r + 1, 7)
+    PASSED_MASK[chess.BLACK][_sq] = _span & _ranks(0, _r - 1)
+    OUTPOST_MASK[chess.WHITE][_sq] = ADJACENT_FILES[_f] & _ranks(_r - 1, _r - 1) if _r >= 1 else 0
+    OUTPOST_MASK[chess.BLACK][_sq] = ADJACENT_FILES[_f] & _ranks(_r + 1, _r + 1) if _r <= 6 else 0
+    KING_SHIELD_MASK[chess.WHITE][_sq] = _span & _ranks(_r, _r + 2)
+    KING_SHIELD_MASK[chess.BLACK][_sq] = _span & _ranks(_r - 1, _r)
+
+# un outpost debe estar en la mitad del rival
+OUTPOST_RANKS = [_ranks(0, 4), _ranks(3, 7)]  # indexado por color (BLACK=0, WHITE=1)
+QUEENSIDE = _ranks(0, 7) & (chess.BB_FILE_A | chess.BB_FILE_B | chess.BB_FILE_C | chess.BB_FILE_D)
+KINGSIDE = chess.BB_ALL & ~QUEENSIDE
+CENTER_MASK = chess.BB_D4 | chess.BB_D5 | chess.BB_E4 | chess.BB_E5
+BISHOP_HOME = [chess.BB_C8 | chess.BB_F8, chess.BB_C1 | chess.BB_F1]
+
+# pesos de fase por tipo de pieza (mayor peso = acelera hacia final)
+PHASE_WEIGHTS = {
+    chess.QUEEN: 4,
+    chess.ROOK: 2,
+    chess.BISHOP: 1,
+    chess.KNIGHT: 1,
+    chess.PAWN: 0.5,
 }
+MAX_PHASE = sum(2 * w for w in PHASE_WEIGHTS.values())  # máximo por pieza (ambos lados)
+# mismos pesos duplicados (enteros) para poder mantenerlos incrementalmente
+PHASE_UNITS = {pt: int(2 * w) for pt, w in PHASE_WEIGHTS.items()}
+PHASE_UNITS[chess.KING] = 0
+
+# PST con signo (+ blancas, - negras) indexadas por [color][pieza][casilla]
+PST_SIGNED: List[Dict[int, List[int]]] = [{}, {}]
+KING_MID_SIGNED: List[List[int]] = [[0] * 64, [0] * 64]
+KING_END_SIGNED: List[List[int]] = [[0] * 64, [0] * 64]
+for _color in chess.COLORS:
+    _sign = 1 if _color == chess.WHITE else -1
+    for _pt, _table in PST.items():
+        PST_SIGNED[_color][_pt] = [_sign * _table[_sq if _color == chess.WHITE else chess.square_mirror(_sq)]
+                                   for _sq in chess.SQUARES]
+    for _sq in chess.SQUARES:
+        _idx = _sq if _color == chess.WHITE else chess.square_mirror(_sq)
+        KING_MID_SIGNED[_color][_sq] = _sign * PST_KING_MID[_idx]
+        KING_END_SIGNED[_color][_sq] = _sign * PST_KING_END[_idx]
+
+popcount = chess.popcount
 
 # -------------------------
 # Utilidades de estructura de peones y posición
 # -------------------------
 def is_passed(board: chess.Board, sq: int, color: bool) -> bool:
-    file = chess.square_file(sq)
-    rank = chess.square_rank(sq)
-    if color == chess.WHITE:
-        rng = range(rank + 1, 8)
-    else:
-        rng = range(0, rank)
-    for f in range(max(0, file - 1), min(7, file + 1) + 1):
-        for r in rng:
-            s = chess.square(f, r)
-            if board.piece_type_at(s) == chess.PAWN and board.color_at(s) != color:
-                return False
-    return True
+    return not (PASSED_MASK[color][sq] & board.pawns & board.occupied_co[not color])
 
 def is_isolated(board: chess.Board, sq: int, color: bool) -> bool:
-    file = chess.square_file(sq)
-    for f in (file - 1, file + 1):
-        if 0 <= f <= 7:
-            for r in range(8):
-                s = chess.square(f, r)
-                if board.piece_type_at(s) == chess.PAWN and board.color_at(s) == color:
-                    return False
-    return True
+    return not (ADJACENT_FILES[chess.square_file(sq)] & board.pawns & board.occupied_co[color])
 
 def count_doubled(board: chess.Board, file: int, color: bool) -> int:
-    return sum(1 for sq in board.pieces(chess.PAWN, color) if chess.square_file(sq) == file)
+    return popcount(chess.BB_FILES[file] & board.pawns & board.occupied_co[color])
 
 # -------------------------
 # SEE simplificado (para ordering)
 # -------------------------
+def _least_valuable(board: chess.Board, attackers: int, color: bool) -> Tuple[int, int]:
+    """Atacante más barato de `color` dentro de `attackers`: (tipo, bitboard de su casilla)."""
+    for piece_type in chess.PIECE_TYPES:
+        bb = attackers & board.pieces_mask(piece_type, color)
+        if bb:
+            return piece_type, bb & -bb
+    return 0, 0
+
 def see_gain(board: chess.Board, move: chess.Move) -> int:
-    if not board.is_capture(move):
-        return 0
-    captured = board.piece_type_at(move.to_square)
+    """
+    Static exchange evaluation: material que gana (o pierde, si es negativo) el bando
+    que juega `move` si ambos recapturan en la casilla siempre con la pieza más barata
+    y pueden parar cuando no les conviene seguir. Las piezas que salen del tablero
+    descubren atacantes deslizantes detrás (rayos X). No tiene en cuenta clavadas.
+    Jugadas que no capturan: 0.
+    """
+    to_square = move.to_square
+    if board.is_en_passant(move):
+        captured = chess.PAWN
+        occupied = board.occupied ^ chess.BB_SQUARES[to_square ^ 8]
+    else:
+        captured = board.piece_type_at(to_square)
+        if captured is None:
+            return 0
+        occupied = board.occupied
     attacker = board.piece_type_at(move.from_square)
-    if captured is None or attacker is None:
+    if attacker is None:
         return 0
-    return VALUES.get(captured, 0) - VALUES.get(attacker, 0)
+
+    gain = [VALUES[captured]]
+    on_square = VALUES[attacker]
+    if move.promotion:
+        gain[0] += VALUES[move.promotion] - VALUES[chess.PAWN]
+        on_square = VALUES[move.promotion]
+    occupied ^= chess.BB_SQUARES[move.from_square]
+    promo_rank = chess.BB_RANK_1 | chess.BB_RANK_8
+    color = not board.turn
+
+    while True:
+        attackers = board.attackers_mask(color, to_square, occupied) & occupied
+        piece_type, bb = _least_valuable(board, attackers, color)
+        if not piece_type:
+            break
+        # el rey no puede capturar en una casilla que sigue defendida
+        if piece_type == chess.KING and board.attackers_mask(not color, to_square, occupied) & occupied:
+            break
+        gain.append(on_square - gain[-1])
+        on_square = VALUES[piece_type]
+        if piece_type == chess.PAWN and chess.BB_SQUARES[to_square] & promo_rank:
+            gain[-1] += VALUES[chess.QUEEN] - VALUES[chess.PAWN]
+            on_square = VALUES[chess.QUEEN]
+        occupied ^= bb
+        color = not color
+
+    # cada bando elige entre recapturar o quedarse como está
+    for d in range(len(gain) - 1, 0, -1):
+        gain[d - 1] = -max(-gain[d - 1], gain[d])
+    return gain[0]
 
 # -------------------------
 # Helpers posicionales
 # -------------------------
-def pst_value(piece_type: int, square: int, color: bool, phase: float) -> int:
+def pst_value(piece_type: int, square: int, color: bool, phase: float) -> float:
     # phase: 0.0 = opening/midgame, 1.0 = endgame
+    idx = square if color == chess.WHITE else chess.square_mirror(square)
     if piece_type == chess.KING:
-        table = PST_KING_END if phase > 0.6 else PST_KING_MID
-    else:
-        table = PST.get(piece_type)
+        # rey con tablas graduadas: mezcla medio juego / final según la fase
+        return PST_KING_MID[idx] * (1 - phase) + PST_KING_END[idx] * phase
+    table = PST.get(piece_type)
     if not table:
         return 0
-    idx = square if color == chess.WHITE else chess.square_mirror(square)
     return table[idx]
 
-def game_phase(board: chess.Board) -> float:
+def phase_from_units(units: int) -> float:
     """
-    Calcula fase de juego en [0,1]: 0 = medio/apertura, 1 = final.
-    Basado en material restante (simplificado).
+    Fase en [0,1] a partir de unidades de fase (PHASE_UNITS, pesos duplicados para ser enteros).
     """
-    total = 0
-    max_phase = 0
-    # pesos para fase (mayor peso = acelera hacia final)
-    phase_weights = {
-        chess.QUEEN: 4,
-        chess.ROOK: 2,
-        chess.BISHOP: 1,
-        chess.KNIGHT: 1,
-        chess.PAWN: 0.5,
-    }
-    for pt, w in phase_weights.items():
-        count = len(list(board.pieces(pt, chess.WHITE))) + len(list(board.pieces(pt, chess.BLACK)))
-        total += count * w
-        max_phase += 2 * w  # máximo por pieza (ambos lados)
     # normalizar y convertir a 0..1 inverso (menos material -> más endgame)
-    if max_phase == 0:
-        return 1.0
-    frac = total / max_phase
+    frac = units / (2 * MAX_PHASE)
     # frac cerca de 1 => mucha material => apertura/medio => phase ~0
     return max(0.0, min(1.0, 1.0 - frac))
 
+def game_phase(board: chess.Board) -> float:
+    """
+    Calcula fase de juego en [0,1]: 0 = medio/apertura, 1 = final.
+    Basado en material restante (simplificado).
+    """
+    return phase_from_units(phase_units(board))
+
+def phase_units(board: chess.Board) -> int:
+    return (popcount(board.queens) * PHASE_UNITS[chess.QUEEN]
+            + popcount(board.rooks) * PHASE_UNITS[chess.ROOK]
+            + popcount(board.bishops) * PHASE_UNITS[chess.BISHOP]
+            + popcount(board.knights) * PHASE_UNITS[chess.KNIGHT]
+            + popcount(board.pawns) * PHASE_UNITS[chess.PAWN])
+
+def material_pst(board: chess.Board) -> Tuple[int, int, int, int, int, int]:
+    """
+    Términos base desde cero: (material blanco, material negro, PST sin reyes,
+    PST rey medio juego, PST rey final, unidades de fase). PST con signo (+ = blancas).
+    SearchBoard mantiene la misma tupla de forma incremental.
+    """
+    material = [0, 0]
+    pst = 0
+    king_mid = 0
+    king_end = 0
+    for color in chess.COLORS:
+        for pt in chess.PIECE_TYPES:
+            bb = board.pieces_mask(pt, color)
+            if not bb:
+                continue
+            material[color] += popcount(bb) * VALUES[pt]
+            if pt == chess.KING:
+                for sq in chess.scan_reversed(bb):
+                    king_mid += KING_MID_SIGNED[color][sq]
+                    king_end += KING_END_SIGNED[color][sq]
+            else:
+                table = PST_SIGNED[color][pt]
+                for sq in chess.scan_reversed(bb):
+                    pst += table[sq]
+    return material[chess.WHITE], material[chess.BLACK], pst, king_mid, king_end, phase_units(board)
+
 def is_outpost(board: chess.Board, sq: int, color: bool) -> bool:
     """
     Detecta outpost: casilla avanzada (no puede ser atacada por peones enemigos desde atrás)
     y controlada por piezas propias (ideal para caballos).
     """
-    file = chess.square_file(sq)
-    rank = chess.square_rank(sq)
-    # outpost debe estar en la mitad del rival (rank alto para blancas)
-    if color == chess.WHITE and rank < 3:
-        return False
-    if color == chess.BLACK and rank > 4:
+    if not OUTPOST_RANKS[color] & chess.BB_SQUARES[sq]:
         return False
-    # no debe poder ser atacada por peones enemigos desde atrás (simplificado)
-    for df in (-1, 1):
-        f = file + df
-        r = rank - 1 if color == chess.WHITE else rank + 1
-        if 0 <= f <= 7 and 0 <= r <= 7:
-            s = chess.square(f, r)
-            if board.piece_type_at(s) == chess.PAWN and board.color_at(s) != color:
-                return False
-    return True
+    return not (OUTPOST_MASK[color][sq] & board.pawns & board.occupied_co[not color])
 
 def rook_on_open_file(board: chess.Board, sq: int, color: bool) -> int:
     """
     Devuelve 2 si la torre está en columna abierta (sin peones de ambos colores),
     1 si semiabierta (sin peones propios), 0 si bloqueada.
     """
-    file = chess.square_file(sq)
-    pawns_in_file = [board.piece_type_at(chess.square(file, r)) for r in range(8)]
-    has_white_pawn = any(board.piece_type_at(chess.square(file, r)) == chess.PAWN and board.color_at(chess.square(file, r)) == chess.WHITE for r in range(8))
-    has_black_pawn = any(board.piece_type_at(chess.square(file, r)) == chess.PAWN and board.color_at(chess.square(file, r)) == chess.BLACK for r in range(8))
-    if not has_white_pawn and not has_black_pawn:
+    file_pawns = chess.BB_FILES[chess.square_file(sq)] & board.pawns
+    if not file_pawns:
         return 2
-    if color == chess.WHITE and not has_white_pawn:
-        return 1
-    if color == chess.BLACK and not has_black_pawn:
+    if not file_pawns & board.occupied_co[color]:
         return 1
     return 0
 
@@ -267,18 +267,16 @@ def pawn_majority_score(board: chess.Board, color: bool) -> int:
     """
     Calcula ventaja de mayoría de peones en flanco (simplificado: cuenta peones en cada mitad).
     """
-    left_white = sum(1 for sq in board.pieces(chess.PAWN, color) if chess.square_file(sq) <= 3)
-    right_white = sum(1 for sq in board.pieces(chess.PAWN, color) if chess.square_file(sq) >= 4)
-    return abs(left_white - right_white)
+    pawns = board.pawns & board.occupied_co[color]
+    return abs(popcount(pawns & QUEENSIDE) - popcount(pawns & KINGSIDE))
 
 def king_activity_score(board: chess.Board, color: bool, phase: float) -> int:
     """
     En endgame, rey activo es valioso. Devuelve bonus según centralidad del rey.
     """
-    kings = list(board.pieces(chess.KING, color))
-    if not kings:
+    ksq = board.king(color)
+    if ksq is None:
         return 0
-    ksq = kings[0]
     file = chess.square_file(ksq)
     rank = chess.square_rank(ksq)
     # distancia al centro
@@ -286,148 +284,184 @@ def king_activity_score(board: chess.Board, color: bool, phase: float) -> int:
     # menor distancia => más activo => bonus en endgame
     return int((4.0 - dist) * WEIGHTS["king_activity_endgame"] * phase)
 
+def king_shield_score(board: chess.Board, color: bool) -> int:
+    ksq = board.king(color)
+    if ksq is None:
+        return 0
+    shield = popcount(KING_SHIELD_MASK[color][ksq] & board.pawns & board.occupied_co[color])
+    return shield * WEIGHTS["king_shield"]
+
 # -------------------------
-# Opening bias helper
+# Estructura de peones (cacheada)
 # -------------------------
-def opening_book_bonus(board: chess.Board) -> int:
+PAWN_HASH = PawnHashTable()
+
+def pawn_structure(board: chess.Board) -> PawnEntry:
     """
-    Si la posición coincide con una clave simple del opening bias y la jugada
-    recomendada está disponible, devuelve un pequeño bonus para favorecerla.
+    Términos que dependen solo de los peones: pasados, aislados, doblados y mayoría
+    de flanco, más los bitboards de pasados y columnas abiertas que reutilizan las torres.
     """
-    # clave simple: si posición es inicial
-    if board.fullmove_number == 1 and board.turn == chess.WHITE:
-        key = "start"
-    else:
-        # buscar coincidencia exacta en OPENING_BIAS keys (puedes ampliar)
-        fen_prefix = board.board_fen()
-        key = None
-        for k in OPENING_BIAS.keys():
-            if k != "start" and fen_prefix.startswith(k):
-                key = k
-                break
-    if key is None:
-        return 0
-    moves = OPENING_BIAS.get(key, [])
-    for uci in moves:
-        try:
-            mv = chess.Move.from_uci(uci)
-        except Exception:
-            continue
-        if mv in board.legal_moves:
-            return WEIGHTS["book_bias"]
-    return 0
+    white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+    black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+    entry = PAWN_HASH.probe(white_pawns, black_pawns)
+    if entry is not None:
+        return entry
+
+    score = 0
+    majority = 0
+    passed = [0, 0]
+    for color, own_pawns, enemy_pawns in ((chess.WHITE, white_pawns, black_pawns),
+                                          (chess.BLACK, black_pawns, white_pawns)):
+        sign = 1 if color == chess.WHITE else -1
+        passed_mask = PASSED_MASK[color]
+        for sq in chess.scan_reversed(own_pawns):
+            # passed pawn bonus (más si avanzado)
+            if not passed_mask[sq] & enemy_pawns:
+                passed[color] |= chess.BB_SQUARES[sq]
+                rank = chess.square_rank(sq)
+                advance = rank if color == chess.WHITE else (7 - rank)
+                score += sign * (WEIGHTS["passed_pawn_base"] + WEIGHTS["passed_pawn_advance"] * advance)
+            # isolated
+            file = chess.square_file(sq)
+            if not ADJACENT_FILES[file] & own_pawns:
+                score += sign * WEIGHTS["isolated_pawn"]
+            # doubled
+            count = popcount(chess.BB_FILES[file] & own_pawns)
+            if count > 1:
+                score += sign * WEIGHTS["doubled_pawn"] * (count - 1)
+        # Pawn majority (flank majority) incentive
+        majority += sign * abs(popcount(own_pawns & QUEENSIDE) - popcount(own_pawns & KINGSIDE)) * WEIGHTS["pawn_majority"]
+
+    open_files = 0
+    semiopen = [0, 0]
+    for bb_file in chess.BB_FILES:
+        if not bb_file & white_pawns:
+            if bb_file & black_pawns:
+                semiopen[chess.WHITE] |= bb_file
+            else:
+                open_files |= bb_file
+        elif not bb_file & black_pawns:
+            semiopen[chess.BLACK] |= bb_file
+
+    entry = PawnEntry(score, majority, tuple(passed), open_files, tuple(semiopen))
+    PAWN_HASH.store(white_pawns, black_pawns, entry)
+    return entry
 
 # -------------------------
-# Evaluación principal mejorada
+# Evaluación principal (bitboards)
 # -------------------------
+# Evaluación por niveles: si el nivel barato (material, PST, peones, pareja de alfiles)
+# queda a más de LAZY_MARGIN de la ventana, los términos posicionales no la meten dentro
+# y no se calculan (medido en nodos de quiescencia: el 99,9 % suman menos de 140 cp)
+LAZY_MARGIN = 150
+
 def evaluate(board: chess.Board) -> int:
     """
     Evaluación estratégica mejorada.
     Retorna centipawns (positivo = ventaja blanca).
     """
-    # Terminales
-    if board.is_checkmate():
-        return -100000 if board.turn == chess.WHITE else 100000
-    if board.is_stalemate():
+    # Terminales (las jugadas legales se reutilizan para la movilidad)
+    moves = list(board.generate_legal_moves())
+    if not moves:
+        if board.is_check():
+            return -100000 if board.turn == chess.WHITE else 100000
         return 0
+    return _positional(board, moves, *_base(board))
 
-    phase = game_phase(board)  # 0..1 (1 = endgame)
-    score = 0.0
-
-    # Material y PST
-    material_white = 0
-    material_black = 0
-    for sq, piece in board.piece_map().items():
-        pt = piece.piece_type
-        color = piece.color
-        sign = 1 if color == chess.WHITE else -1
-        score += sign * VALUES.get(pt, 0)
-        score += sign * pst_value(pt, sq, color, phase)
-        if color == chess.WHITE:
-            material_white += VALUES.get(pt, 0)
-        else:
-            material_black += VALUES.get(pt, 0)
-
-    # Pawn structure: passed, isolated, doubled
-    for sq, piece in board.piece_map().items():
-        if piece.piece_type != chess.PAWN:
-            continue
-        color = piece.color
-        sign = 1 if color == chess.WHITE else -1
-        # passed pawn bonus (más si avanzado)
-        if is_passed(board, sq, color):
-            rank = chess.square_rank(sq)
-            advance = rank if color == chess.WHITE else (7 - rank)
-            bonus = WEIGHTS["passed_pawn_base"] + WEIGHTS["passed_pawn_advance"] * advance
-            score += sign * bonus
-        # isolated
-        if is_isolated(board, sq, color):
-            score += sign * WEIGHTS["isolated_pawn"]
-        # doubled
-        file = chess.square_file(sq)
-        count = count_doubled(board, file, color)
-        if count > 1:
-            score += sign * WEIGHTS["doubled_pawn"] * (count - 1)
+def evaluate_lazy(board: chess.Board, alpha: int, beta: int) -> Tuple[int, bool]:
+    """
+    evaluate() desde el bando que mueve, pero si el nivel barato cae lejos de (alpha, beta)
+    se devuelve ese valor sin generar jugadas ni mirar ataques. Sin jaque no se comprueba
+    el ahogado en ese caso (como cota para la quiescencia basta).
+    Devuelve (puntuación, completa): completa=False si es solo el nivel barato.
+    """
+    sign = 1 if board.turn == chess.WHITE else -1
+    if board.is_check():
+        return sign * evaluate(board), True
+    base = _base(board)
+    cheap = sign * int(base[0])
+    if cheap + LAZY_MARGIN <= alpha or cheap - LAZY_MARGIN >= beta:
+        return cheap, False
+    moves = list(board.generate_legal_moves())
+    if not moves:
+        return 0, True
+    return sign * _positional(board, moves, *base), True
+
+def _base(board: chess.Board) -> Tuple[float, float, int, int, PawnEntry]:
+    """Nivel barato: (puntuación, fase, material blanco, material negro, entrada de peones)."""
+    white = board.occupied_co[chess.WHITE]
+    black = board.occupied_co[chess.BLACK]
+
+    # Material y PST: incrementales si el tablero los mantiene (SearchBoard), si no desde cero
+    incremental = getattr(board, "material_pst", None)
+    material_white, material_black, pst, king_mid, king_end, units = (
+        incremental() if incremental is not None else material_pst(board))
+    phase = phase_from_units(units)  # 0..1 (1 = endgame)
+    score = float(material_white - material_black + pst)
+    score += king_mid * (1 - phase) + king_end * phase
+
+    # Pawn structure: passed, isolated, doubled (cacheado por peones)
+    pawn_entry = pawn_structure(board)
+    score += pawn_entry.score
 
     # Bishop pair
-    if len(list(board.pieces(chess.BISHOP, chess.WHITE))) >= 2:
+    if popcount(board.bishops & white) >= 2:
         score += WEIGHTS["bishop_pair"]
-    if len(list(board.pieces(chess.BISHOP, chess.BLACK))) >= 2:
+    if popcount(board.bishops & black) >= 2:
         score -= WEIGHTS["bishop_pair"]
-
-    # Mobility y actividad de piezas (ponderado por tipo)
-    mobility_score = 0
-    for move in board.legal_moves:
-        mobility_score += 3 if board.is_capture(move) else 1
+    return score, phase, material_white, material_black, pawn_entry
+
+def _positional(board: chess.Board, moves: List[chess.Move], score: float, phase: float,
+                material_white: int, material_black: int, pawn_entry: PawnEntry) -> int:
+    """Nivel caro: movilidad, piezas, seguridad del rey, espacio... sobre el nivel barato."""
+    pawns = board.pawns
+    occupied = board.occupied
+    white = board.occupied_co[chess.WHITE]
+    black = board.occupied_co[chess.BLACK]
+
+    # Mobility y actividad de piezas (ponderado por tipo): capturas cuentan triple
+    them = board.occupied_co[not board.turn]
+    ep_square = board.ep_square
+    mobility_score = len(moves)
+    for move in moves:
+        to_square = move.to_square
+        if chess.BB_SQUARES[to_square] & them or (to_square == ep_square and chess.BB_SQUARES[move.from_square] & pawns):
+            mobility_score += 2
     score += (mobility_score if board.turn == chess.WHITE else -mobility_score) * 0.2
 
     # Outposts y piezas activas
-    for sq, piece in board.piece_map().items():
-        pt = piece.piece_type
-        color = piece.color
+    for color, own, other in ((chess.WHITE, white, black), (chess.BLACK, black, white)):
         sign = 1 if color == chess.WHITE else -1
-        # knights on outpost
-        if pt == chess.KNIGHT and is_outpost(board, sq, color):
-            score += sign * WEIGHTS["outpost_knight"]
-        # bishops on outpost (lesser)
-        if pt == chess.BISHOP and is_outpost(board, sq, color):
-            score += sign * WEIGHTS["outpost_bishop"]
-        # queen centralization bonus
-        if pt == chess.QUEEN:
-            if sq in CENTER_SQUARES:
-                score += sign * 12 * (1 - phase)  # queen center more valuable in midgame
+        enemy_pawns = pawns & other
+        outpost_mask = OUTPOST_MASK[color]
+        candidates = (board.knights | board.bishops) & own & OUTPOST_RANKS[color]
+        for sq in chess.scan_reversed(candidates):
+            if not outpost_mask[sq] & enemy_pawns:
+                if board.knights & chess.BB_SQUARES[sq]:
+                    score += sign * WEIGHTS["outpost_knight"]
+                else:
+                    score += sign * WEIGHTS["outpost_bishop"]
+        # queen centralization bonus (más valioso en medio juego)
+        for _ in chess.scan_reversed(board.queens & own & CENTER_MASK):
+            score += sign * 12 * (1 - phase)
 
     # Rooks on open/semi-open files and connected rooks
-    for color in (chess.WHITE, chess.BLACK):
-        rooks = list(board.pieces(chess.ROOK, color))
+    for color, own in ((chess.WHITE, white), (chess.BLACK, black)):
+        sign = 1 if color == chess.WHITE else -1
+        rooks = list(chess.scan_forward(board.rooks & own))
+        semiopen = pawn_entry.semiopen[color]
         for r in rooks:
-            rscore = rook_on_open_file(board, r, color)
-            sign = 1 if color == chess.WHITE else -1
-            if rscore == 2:
+            if pawn_entry.open_files & chess.BB_SQUARES[r]:
                 score += sign * WEIGHTS["rook_open_file"]
-            elif rscore == 1:
+            elif semiopen & chess.BB_SQUARES[r]:
                 score += sign * WEIGHTS["rook_semiopen_file"]
-        # connected rooks bonus
-        if len(rooks) >= 2:
-            # si hay dos torres en la misma fila o columna sin piezas entre ellas, bonus
-            for i in range(len(rooks)):
-                for j in range(i + 1, len(rooks)):
-                    a = rooks[i]; b = rooks[j]
-                    af = chess.square_file(a); ar = chess.square_rank(a)
-                    bf = chess.square_file(b); br = chess.square_rank(b)
-                    if af == bf or ar == br:
-                        # comprobar si hay piezas entre ellas
-                        between = False
-                        if af == bf:
-                            for r in range(min(ar, br) + 1, max(ar, br)):
-                                if board.piece_type_at(chess.square(af, r)) is not None:
-                                    between = True; break
-                        else:
-                            for f in range(min(af, bf) + 1, max(af, bf)):
-                                if board.piece_type_at(chess.square(f, ar)) is not None:
-                                    between = True; break
-                        if not between:
-                            score += (WEIGHTS["connected_rooks"] if color == chess.WHITE else -WEIGHTS["connected_rooks"])
+        # connected rooks bonus: misma fila o columna sin piezas entre ellas
+        for i in range(len(rooks)):
+            for j in range(i + 1, len(rooks)):
+                a = rooks[i]; b = rooks[j]
+                if chess.square_file(a) == chess.square_file(b) or chess.square_rank(a) == chess.square_rank(b):
+                    if not chess.between(a, b) & occupied:
+                        score += sign * WEIGHTS["connected_rooks"]
 
     # King safety: shield and exposure (menos importante en endgame)
     score += king_shield_score(board, chess.WHITE) * (1 - phase)
@@ -438,37 +472,19 @@ def evaluate(board: chess.Board) -> int:
     score -= king_activity_score(board, chess.BLACK, phase)
 
     # Pawn majority (flank majority) incentive
-    for color in (chess.WHITE, chess.BLACK):
-        maj = pawn_majority_score(board, color)
-        sign = 1 if color == chess.WHITE else -1
-        score += sign * maj * WEIGHTS["pawn_majority"]
-
-    # Space control: casillas controladas en el centro y avance
-    center_control_white = 0
-    center_control_black = 0
-    for sq in CENTER_SQUARES:
-        attackers_w = board.attackers(chess.WHITE, sq)
-        attackers_b = board.attackers(chess.BLACK, sq)
-        center_control_white += len(attackers_w)
-        center_control_black += len(attackers_b)
-    score += (center_control_white - center_control_black) * WEIGHTS["space"]
-
-    # Tempo: si la última jugada fue desarrollo o enroque, pequeño bonus
-    # (no siempre disponible; usamos heurística: si hay menos piezas desarrolladas, premiar desarrollo)
-    # Conteo simple: piezas menores desarrolladas (no en su casilla inicial)
-    def development_score(color: bool) -> int:
-        dev = 0
-        for sq in board.pieces(chess.KNIGHT, color):
-            if (color == chess.WHITE and sq not in (chess.B1, chess.G1)) and (color == chess.BLACK and sq not in (chess.B8, chess.G8)):
-                dev += 1
-        for sq in board.pieces(chess.BISHOP, color):
-            # bishop initial squares: c1,f1 for white; c8,f8 for black
-            if color == chess.WHITE and sq not in (chess.C1, chess.F1):
-                dev += 1
-            if color == chess.BLACK and sq not in (chess.C8, chess.F8):
-                dev += 1
-        return dev
-    score += (development_score(chess.WHITE) - development_score(chess.BLACK)) * WEIGHTS["tempo"]
+    score += pawn_entry.majority
+
+    # Space control: casillas controladas en el centro
+    center_control = 0
+    for sq in chess.scan_reversed(CENTER_MASK):
+        center_control += popcount(board.attackers_mask(chess.WHITE, sq))
+        center_control -= popcount(board.attackers_mask(chess.BLACK, sq))
+    score += center_control * WEIGHTS["space"]
+
+    # Tempo: alfiles desarrollados (fuera de su casilla inicial).
+    # Los caballos nunca puntuaron aquí (condición siempre falsa en la versión por casillas).
+    development = popcount(board.bishops & white & ~BISHOP_HOME[chess.WHITE]) - popcount(board.bishops & black & ~BISHOP_HOME[chess.BLACK])
+    score += development * WEIGHTS["tempo"]
 
     # Exchange preference: si estamos materialmente por delante, favorecer simplificaciones
     material_diff = material_white - material_black
@@ -479,24 +495,5 @@ def evaluate(board: chess.Board) -> int:
         # si estamos por detrás, evitar cambios
         score += WEIGHTS["avoid_exchange_when_ahead"]
 
-    # Opening bias (pequeño)
-    score += opening_book_bonus(board)
-
     # Final rounding
     return int(score)
-
-def king_shield_score(board: chess.Board, color: bool) -> int:
-    kings = list(board.pieces(chess.KING, color))
-    if not kings:
-        return 0
-    ksq = kings[0]
-    kf = chess.square_file(ksq)
-    kr = chess.square_rank(ksq)
-    shield = 0
-    ranks = range(kr, min(7, kr + 2) + 1) if color == chess.WHITE else range(max(0, kr - 1), kr + 1)
-    for f in range(max(0, kf - 1), min(7, kf + 1) + 1):
-        for r in ranks:
-            s = chess.square(f, r)
-            if board.piece_type_at(s) == chess.PAWN and board.color_at(s) == color:
-                shield += 1
-    return shield * WEIGHTS["king_shield"]
@@ -0,0 +1,143 @@
+# src/chess_backend/chess/load_bench.py
+import argparse
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from chess_backend.core.config import ENGINE_MAX_PENDING_PER_USER
+from chess_backend.chess.batch import WINDOW_PER_WORKER
+from chess_backend.chess.scheduler import Budget, FairScheduler, LEVELS, batch_window
+
+# -------------------------
+# Carga simulada del planificador
+#   python -m chess_backend.chess.load_bench --slots 4 --concurrency 4 8 16 32 64
+# Clientes en bucle cerrado (jugada, pausa, jugada...) contra `slots` workers virtuales:
+# cada búsqueda es un asyncio.sleep de su tiempo concedido (peor caso: agota el
+# presupuesto), escalado por --speed para que la simulación dure poco.
+# - fifo: semáforo y presupuesto completo (el servicio sin planificador)
+# - fair: FairScheduler (DRR por usuario + presupuesto según la cola)
+# Se mide la latencia de cada jugada (espera + búsqueda) en segundos "reales" (÷ speed).
+# Con --batch, además, un usuario con un /batch en marcha todo el rato: en fifo con la
+# ventana que tenía sin planificador (slots × WINDOW_PER_WORKER), en fair como lo envía
+# ahora la ruta (ventana batch_window, a nombre de "<user>/batch").
+# -------------------------
+
+class FifoScheduler:
+    """Referencia: turno por orden de llegada y presupuesto sin recortar."""
+
+    def __init__(self, slots: int):
+        self._sem = asyncio.Semaphore(slots)
+
+    @asynccontextmanager
+    async def slot(self, user: str, cost: float):
+        async with self._sem:
+            yield None
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def client(scheduler, user: str, budget: Budget, moves: int, speed: float, think: float,
+                 rng: random.Random, latencies: List[float]) -> None:
+    for _ in range(moves):
+        await asyncio.sleep(rng.uniform(0, think) * speed)
+        start = time.perf_counter()
+        async with scheduler.slot(user, budget.time_limit) as ticket:
+            scale = ticket.scale if ticket is not None else 1.0
+            await asyncio.sleep(budget.scaled(scale).time_limit * speed)
+        latencies.append((time.perf_counter() - start) / speed)
+
+
+async def batch_client(scheduler, cost: float, speed: float, done: asyncio.Event) -> None:
+    """Una posición del lote tras otra (sin pausa) hasta que acaban los demás clientes."""
+    while not done.is_set():
+        async with scheduler.slot("batch", cost) as ticket:
+            scale = ticket.scale if ticket is not None else 1.0
+            await asyncio.sleep(Budget(0, cost, None).scaled(scale).time_limit * speed)
+
+
+async def simulate(kind: str, slots: int, users: Dict[str, Budget], moves: int, speed: float,
+                   think: float, seed: int, heavy: int = 0, batch: int = 0,
+                   batch_time: float = 5.0) -> Dict[str, List[float]]:
+    """
+    Latencias por usuario: un cliente por usuario y, con `heavy`, un usuario "heavy" con
+    `heavy` clientes en paralelo y sin pausa. Con `batch`, un lote con `batch` posiciones
+    en vuelo de `batch_time` s cada una mientras dura la simulación.
+    """
+    # sin rechazos: aquí se mide la cola, no el límite de admisión
+    scheduler = (FifoScheduler(slots) if kind == "fifo"
+                 else FairScheduler(slots, max_pending=1 << 30, max_per_user=1 << 30))
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = {user: [] for user in users}
+    tasks = [client(scheduler, user, budget, moves, speed, think, rng, latencies[user])
+             for user, budget in users.items()]
+    if heavy:
+        latencies["heavy"] = []
+        tasks += [client(scheduler, "heavy", LEVELS["hard"], moves, speed, 0.0, rng, latencies["heavy"])
+                  for _ in range(heavy)]
+    done = asyncio.Event()
+    batchers = [asyncio.create_task(batch_client(scheduler, batch_time, speed, done)) for _ in range(batch)]
+    await asyncio.gather(*tasks)
+    done.set()
+    await asyncio.gather(*batchers)
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> str:
+    return (f"{label:<6} p50={percentile(latencies, 0.5):6.2f}s p99={percentile(latencies, 0.99):6.2f}s "
+            f"max={max(latencies):6.2f}s")
+
+
+def run(slots: int, concurrency: List[int], moves: int, speed: float, think: float, seed: int,
+        heavy: Optional[int], batch: int = 0, batch_time: float = 5.0) -> None:
+    hard = LEVELS["hard"]
+    print(f"{slots} workers, nivel hard ({hard.time_limit:.1f} s/jugada), pausa 0-{think:.1f} s, {moves} jugadas/cliente")
+    for n in concurrency:
+        users = {f"u{i}": hard for i in range(n)}
+        line = [f"clientes={n:<4}"]
+        for kind in ("fifo", "fair"):
+            res = asyncio.run(simulate(kind, slots, users, moves, speed, think, seed))
+            line.append(report(kind, [x for v in res.values() for x in v]))
+        print("  ".join(line))
+    if heavy:
+        # un usuario con `heavy` clientes en paralelo frente a usuarios de un cliente
+        print(f"\nun usuario con {heavy} clientes + {slots * 2} usuarios de 1 cliente (latencia de estos)")
+        for kind in ("fifo", "fair"):
+            users = {f"u{i}": hard for i in range(slots * 2)}
+            res = asyncio.run(simulate(kind, slots, users, moves, speed, think, seed, heavy))
+            print(f"  {report(kind, [x for u, v in res.items() if u != 'heavy' for x in v])}  "
+                  f"(heavy: p50={percentile(res['heavy'], 0.5):.2f}s)")
+    if batch:
+        # un /batch en marcha frente a usuarios de un cliente
+        windows = {"fifo": batch, "fair": min(batch, batch_window(slots, ENGINE_MAX_PENDING_PER_USER))}
+        print(f"\nun lote ({batch_time:.1f} s/posición; en vuelo: fifo {windows['fifo']}, fair {windows['fair']})"
+              f" + {slots * 2} usuarios de 1 cliente (latencia de estos)")
+        for kind in ("fifo", "fair"):
+            users = {f"u{i}": hard for i in range(slots * 2)}
+            res = asyncio.run(simulate(kind, slots, users, moves, speed, think, seed,
+                                       batch=windows[kind], batch_time=batch_time))
+            print(f"  {report(kind, [x for v in res.values() for x in v])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carga simulada del planificador del motor")
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--moves", type=int, default=20, help="jugadas por cliente")
+    parser.add_argument("--think", type=float, default=1.0, help="pausa máxima entre jugadas (s)")
+    parser.add_argument("--speed", type=float, default=0.05, help="factor de tiempo de la simulación")
+    parser.add_argument("--heavy", type=int, default=32, help="clientes del usuario pesado (0 = no)")
+    parser.add_argument("--batch", type=int, default=None,
+                        help="posiciones en vuelo del lote sin planificador (por defecto slots × 4; 0 = no)")
+    parser.add_argument("--batch-time", type=float, default=5.0, help="tiempo por posición del lote (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    batch = args.slots * WINDOW_PER_WORKER if args.batch is None else args.batch
+    run(args.slots, args.concurrency, args.moves, args.speed, args.think, args.seed, args.heavy,
+        batch, args.batch_time)
+
+if __name__ == "__main__":
+    main()
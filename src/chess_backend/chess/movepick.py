@@ -0,0 +1,113 @@
+# src/chess_backend/chess/movepick.py
+from typing import Iterator, List, Optional, Tuple
+import chess
+from chess_backend.chess.evaluate import VALUES, see_gain
+
+MAX_PLY = 128
+
+# -------------------------
+# MVV-LVA: víctima más valiosa primero, y entre iguales el atacante más barato
+# -------------------------
+def mvv_lva(board: chess.Board, move: chess.Move) -> int:
+    victim = board.piece_type_at(move.to_square) or chess.PAWN  # en passant
+    attacker = board.piece_type_at(move.from_square)
+    return 8 * victim - attacker
+
+
+def is_losing_capture(board: chess.Board, move: chess.Move) -> bool:
+    """
+    SEE < 0. Si la víctima vale al menos lo que el atacante la captura no puede perder
+    material, así el intercambio completo solo se calcula cuando hace falta.
+    """
+    victim = board.piece_type_at(move.to_square) or chess.PAWN
+    if VALUES[victim] >= VALUES[board.piece_type_at(move.from_square)]:
+        return False
+    return see_gain(board, move) < 0
+
+
+class MoveOrdering:
+    """
+    Heurísticas de ordenación de una búsqueda: killers por ply, historial
+    [color][from][to] y contrajugada [from][to] de la jugada anterior.
+    """
+
+    def __init__(self, root_ply: int = 0):
+        self.root_ply = root_ply
+        self.killers: List[List[Optional[chess.Move]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[[0] * 64 for _ in range(64)] for _ in chess.COLORS]
+        self.countermoves: List[List[Optional[chess.Move]]] = [[None] * 64 for _ in range(64)]
+
+    def ply(self, board: chess.Board) -> int:
+        return min(len(board.move_stack) - self.root_ply, MAX_PLY - 1)
+
+    def countermove(self, board: chess.Board) -> Optional[chess.Move]:
+        if not board.move_stack:
+            return None
+        prev = board.move_stack[-1]
+        return self.countermoves[prev.from_square][prev.to_square]
+
+    def record_cutoff(self, board: chess.Board, move: chess.Move, depth: int) -> None:
+        """Una jugada tranquila produjo corte beta: killer, historial y contrajugada."""
+        killers = self.killers[self.ply(board)]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[board.turn][move.from_square][move.to_square] += depth * depth
+        if board.move_stack:
+            prev = board.move_stack[-1]
+            self.countermoves[prev.from_square][prev.to_square] = move
+
+
+def split_captures(board: chess.Board) -> Tuple[List[chess.Move], List[chess.Move]]:
+    """Capturas legales por MVV-LVA, separadas en (no pierden material, pierden según SEE)."""
+    captures = list(board.generate_legal_captures())
+    captures.sort(key=lambda m: mvv_lva(board, m), reverse=True)
+    good, bad = [], []
+    for move in captures:
+        (bad if is_losing_capture(board, move) else good).append(move)
+    return good, bad
+
+
+def ordered_captures(board: chess.Board) -> List[chess.Move]:
+    """Capturas para la quiescencia: las que pierden material según SEE se descartan."""
+    return split_captures(board)[0]
+
+
+def ordered_moves(board: chess.Board, tt_move: Optional[chess.Move], ordering: MoveOrdering) -> Iterator[chess.Move]:
+    """
+    Generador por etapas:
+      1. jugada de la TT (si es legal);
+      2. capturas que no pierden material según SEE, por MVV-LVA;
+      3. killers del ply y contrajugada de la jugada anterior;
+      4. tranquilas: promociones primero y el resto por historial;
+      5. capturas que pierden material (SEE < 0), por MVV-LVA.
+    Las capturas se generan y clasifican todas juntas al llegar a la etapa 2 y las
+    tranquilas al llegar a la 4: un corte beta antes no paga su generación.
+    """
+    tried = []
+    if tt_move is not None and board.is_legal(tt_move):
+        tried.append(tt_move)
+        yield tt_move
+
+    good, bad = split_captures(board)
+    for move in good:
+        if move not in tried:
+            yield move
+
+    them = board.occupied_co[not board.turn]
+    for move in ordering.killers[ordering.ply(board)] + [ordering.countermove(board)]:
+        if (move is not None and move not in tried and not chess.BB_SQUARES[move.to_square] & them
+                and board.is_pseudo_legal(move) and not board.is_en_passant(move) and board.is_legal(move)):
+            tried.append(move)
+            yield move
+
+    history = ordering.history[board.turn]
+    quiets = [m for m in board.generate_legal_moves(chess.BB_ALL, chess.BB_ALL & ~them)
+              if m not in tried and not board.is_en_passant(m)]
+    # promociones tranquilas delante; el resto por historial
+    quiets.sort(key=lambda m: (m.promotion or 0, history[m.from_square][m.to_square]), reverse=True)
+    yield from quiets
+
+    for move in bad:
+        if move not in tried:
+            yield move
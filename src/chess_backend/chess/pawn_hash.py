@@ -0,0 +1,62 @@
+# src/chess_backend/chess/pawn_hash.py
+from typing import NamedTuple, Optional
+from chess_backend.core.config import PAWN_HASH_ENTRIES
+
+
+class PawnEntry(NamedTuple):
+    """
+    Resultado cacheado de la estructura de peones (positivo = ventaja blanca).
+    passed / semiopen se indexan por color (BLACK=0, WHITE=1).
+    """
+    score: int         # pasados, aislados y doblados
+    majority: int      # mayoría de flanco
+    passed: tuple      # bitboards de peones pasados
+    open_files: int    # columnas sin peones
+    semiopen: tuple    # columnas sin peones propios pero con peones rivales
+
+
+class PawnHashTable:
+    """
+    Tabla de tamaño fijo indexada por los dos bitboards de peones.
+    Reemplazo siempre: la estructura de peones cambia poco entre nodos vecinos.
+    """
+
+    def __init__(self, entries: int = PAWN_HASH_ENTRIES):
+        self.size = 1 << (max(1, entries).bit_length() - 1)
+        self._mask = self.size - 1
+        self._keys = [None] * self.size
+        self._entries = [None] * self.size
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self) -> None:
+        self._keys = [None] * self.size
+        self._entries = [None] * self.size
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, white_pawns: int, black_pawns: int) -> Optional[PawnEntry]:
+        self.probes += 1
+        key = (white_pawns, black_pawns)
+        i = hash(key) & self._mask
+        if self._keys[i] == key:
+            self.hits += 1
+            return self._entries[i]
+        return None
+
+    def store(self, white_pawns: int, black_pawns: int, entry: PawnEntry) -> None:
+        key = (white_pawns, black_pawns)
+        i = hash(key) & self._mask
+        self._keys[i] = key
+        self._entries[i] = entry
+
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+        }
@@ -1,13 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import io
+import itertools
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool
 import chess
-from chess_backend.chess.engine import best_move
+from chess_backend.chess.batch import analyze_fens, annotate_pgn
+from chess_backend.chess.engine import allocate_time
+from chess_backend.chess.service import engine_service, EngineOverloaded, EngineCancelled
+from chess_backend.chess.scheduler import Budget, LEVELS, DEFAULT_LEVEL, batch_window
+from chess_backend.chess.sessions import SessionStore, SessionConflict, SessionBusy
 from chess_backend.auth.utils import get_current_user
+from chess_backend.db.models import GAMES
+from chess_backend.core.config import (
+    ENGINE_SMP_MAX_WORKERS, ANALYSIS_MAX_TIME, BATCH_MAX_POSITIONS, GAMES_PAGE_SIZE, GAMES_PAGE_MAX,
+)
 
 router = APIRouter()
 
-board = chess.Board()
+# Una partida por usuario (y game_id opcional), con bloqueo por partida
+sessions = SessionStore()
 
-def serialize_state():
+def game_key(user: dict, game_id: Optional[str]) -> str:
+    return f"{user['username']}:{game_id or 'default'}"
+
+def serialize_state(board: chess.Board):
     return {
         "fen": board.fen(),
         "turn": "w" if board.turn else "b",
@@ -15,42 +35,327 @@ def serialize_state():
         "result": board.result() if board.is_game_over() else None
     }
 
+def commit_or_409(sess):
+    try:
+        sessions.commit(sess)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="La partida cambió en otra sesión, vuelve a cargarla")
+
+async def commit_async_or_409(sess):
+    try:
+        await sessions.commit_async(sess)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="La partida cambió en otra sesión, vuelve a cargarla")
+
 @router.get("/state")
-def get_state(user=Depends(get_current_user)):
-    return serialize_state()
+def get_state(game_id: Optional[str] = None, user=Depends(get_current_user)):
+    with sessions.session(game_key(user, game_id)) as sess:
+        return serialize_state(sess.board)
 
 @router.post("/move")
-def move(payload: dict, user=Depends(get_current_user)):
+async def move(payload: dict, request: Request, game_id: Optional[str] = None, user=Depends(get_current_user)):
     human_move = payload.get("move")
     if not human_move:
         raise HTTPException(status_code=400, detail="Falta 'move'")
 
+    try:
+        # no bloquear el event loop: si la partida está ocupada, 409; la E/S del backend, en un hilo
+        async with sessions.session_async(game_key(user, game_id)) as sess:
+            state = await play_move(sess, human_move, request, search_workers(payload),
+                                    search_limits(payload), user["username"])
+            if state["game_over"]:
+                # SQLite síncrono: en un hilo, con la sesión aún tomada
+                await asyncio.to_thread(GAMES.save, user["id"], game_id or "default", sess.board)
+            return state
+    except SessionBusy:
+        raise HTTPException(status_code=409, detail="Ya hay una jugada en curso en esta partida")
+
+def search_workers(payload: dict) -> int:
+    """Procesos para la búsqueda de esta petición ('workers' opcional, acotado por config)."""
+    try:
+        workers = int(payload.get("workers", 1))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="'workers' debe ser un entero")
+    return max(1, min(workers, ENGINE_SMP_MAX_WORKERS))
+
+# Con reloj la profundidad la limita el tiempo, no este tope
+CLOCK_MAX_DEPTH = 64
+
+def search_limits(payload: dict) -> Budget:
+    """
+    Presupuesto de la búsqueda. Con 'clock' = {remaining, increment, moves_to_go} en
+    segundos se reparte el reloj (sin tope de nodos); si no, el de 'level'
+    ("easy", "medium", "hard"; por defecto DEFAULT_LEVEL).
+    """
+    clock = payload.get("clock")
+    if not clock:
+        level = payload.get("level", DEFAULT_LEVEL)
+        if level not in LEVELS:
+            raise HTTPException(status_code=400, detail=f"'level' debe ser uno de: {', '.join(LEVELS)}")
+        return LEVELS[level]
+    try:
+        remaining = float(clock["remaining"])
+        increment = float(clock.get("increment", 0))
+        moves_to_go = int(clock["moves_to_go"]) if clock.get("moves_to_go") else None
+    except (KeyError, TypeError, ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="'clock' inválido: usa {remaining, increment, moves_to_go}")
+    if remaining <= 0 or increment < 0:
+        raise HTTPException(status_code=400, detail="'clock' inválido: tiempos negativos")
+    return Budget(CLOCK_MAX_DEPTH, allocate_time(remaining, increment, moves_to_go), None)
+
+async def play_move(sess, human_move: str, request: Request, workers: int = 1,
+                    budget: Budget = LEVELS[DEFAULT_LEVEL], user: str = ""):
+    board = sess.board
     try:
         if len(human_move) in (4, 5):  # UCI
-            board.push(chess.Move.from_uci(human_move))
+            mv = chess.Move.from_uci(human_move)
+            if mv not in board.legal_moves:
+                raise ValueError(human_move)
+            board.push(mv)
         else:  # SAN
             board.push_san(human_move)
     except Exception:
         raise HTTPException(status_code=400, detail="Jugada inválida")
 
     if board.is_game_over():
-        return serialize_state()
+        await commit_async_or_409(sess)
+        return serialize_state(board)
+
+    try:
+        ai_move, search_info = await engine_service.search(board, budget, workers=workers, user=user,
+                                                           is_disconnected=request.is_disconnected)
+    except EngineOverloaded as exc:
+        board.pop()
+        detail = ("Tienes demasiadas jugadas en cola, espera a que terminen" if exc.reason == "user_limit"
+                  else "Motor ocupado, reintenta en unos segundos")
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": "1"})
+    except EngineCancelled:
+        board.pop()
+        raise HTTPException(status_code=499, detail="Cliente desconectado")
+    except BaseException:
+        # cualquier otro fallo del motor (p. ej. BrokenProcessPool): la jugada no se confirmó
+        board.pop()
+        raise
 
-    ai_move = best_move(board, 3)
     if ai_move not in board.legal_moves:
+        board.pop()
         raise HTTPException(status_code=400, detail=f"IA sugirió jugada ilegal: {ai_move}")
 
     ai_move_san = board.san(ai_move)
     board.push(ai_move)
+    await commit_async_or_409(sess)
 
     return {
         "ai_move_uci": ai_move.uci(),
         "ai_move_san": ai_move_san,
-        **serialize_state()
+        "search_info": search_info,
+        **serialize_state(board)
     }
 
 @router.post("/reset")
-def reset(user=Depends(get_current_user)):
-    global board
-    board = chess.Board()
-    return serialize_state()
+def reset(game_id: Optional[str] = None, user=Depends(get_current_user)):
+    with sessions.session(game_key(user, game_id)) as sess:
+        # se guarda como una versión más: los otros workers ven la partida nueva
+        sess.board = chess.Board()
+        commit_or_409(sess)
+        return serialize_state(sess.board)
+
+# -------------------------
+# Historial de partidas terminadas
+#   GET /chess/games?limit=&before=<id>          más recientes primero; next_before = siguiente página
+#   GET /chess/games/{id}?start=&limit=          jugadas [start, start + limit) con SAN y la posición al inicio
+# -------------------------
+def page_size(limit: Optional[int]) -> int:
+    if limit is None:
+        return GAMES_PAGE_SIZE
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="'limit' debe ser positivo")
+    return min(limit, GAMES_PAGE_MAX)
+
+@router.get("/games")
+def list_games(limit: Optional[int] = None, before: Optional[int] = None, user=Depends(get_current_user)):
+    size = page_size(limit)
+    games = GAMES.history(user["id"], size, before)
+    return {
+        "games": [g.to_dict() for g in games],
+        "next_before": games[-1].id if len(games) == size else None,
+    }
+
+@router.get("/games/{stored_id}")
+def replay_game(stored_id: int, start: int = 0, limit: Optional[int] = None, user=Depends(get_current_user)):
+    if start < 0:
+        raise HTTPException(status_code=400, detail="'start' no puede ser negativo")
+    size = page_size(limit)
+    found = GAMES.replay(user["id"], stored_id, start, size)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+    game, moves = found
+    board = chess.Board(game.root_fen or chess.STARTING_FEN)
+    # las jugadas anteriores a la página solo se aplican; las de la página se devuelven con SAN
+    for mv in itertools.islice(moves, start):
+        board.push(mv)
+    position = board.fen()
+    page = []
+    for ply, mv in enumerate(moves, start):
+        page.append({"ply": ply, "uci": mv.uci(), "san": board.san(mv)})
+        board.push(mv)
+    end = start + len(page)
+    return {
+        **game.to_dict(),
+        "start": start,
+        "position": position,
+        "moves": page,
+        "next_start": end if end < game.plies else None,
+    }
+
+# -------------------------
+# Análisis en streaming (WebSocket)
+#   conectar:  /chess/analyze?token=<jwt>&game_id=<opcional>
+#   cliente:   {"type": "go", "fen": opcional, "depth": opcional, "time_limit": opcional}
+#              {"type": "stop"}
+#   servidor:  {"type": "info", "depth", "score", "best_move", "pv", "nodes", "nps", "time"}
+#              {"type": "bestmove", "move", "search_info"}   (tras terminar o "stop")
+#              {"type": "error", "detail"}
+# -------------------------
+async def analysis_board(user: dict, game_id: Optional[str], msg: dict) -> chess.Board:
+    """Posición a analizar: la FEN del mensaje o, si no viene, la de la partida."""
+    fen = msg.get("fen")
+    if fen:
+        try:
+            return chess.Board(fen)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="FEN inválida")
+    try:
+        async with sessions.session_async(game_key(user, game_id)) as sess:
+            return sess.board.copy()
+    except SessionBusy:
+        raise HTTPException(status_code=409, detail="Ya hay una jugada en curso en esta partida")
+
+def analysis_limits(msg: dict):
+    try:
+        depth = int(msg.get("depth", CLOCK_MAX_DEPTH))
+        time_limit = float(msg.get("time_limit", ANALYSIS_MAX_TIME))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="'depth' y 'time_limit' deben ser números")
+    return max(1, min(depth, CLOCK_MAX_DEPTH)), max(0.01, min(time_limit, ANALYSIS_MAX_TIME))
+
+@router.websocket("/analyze")
+async def analyze(websocket: WebSocket, token: str = "", game_id: Optional[str] = None):
+    # los navegadores no pueden poner cabeceras en un WebSocket: el token va en la query
+    try:
+        user = await get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    try:
+        while True:
+            msg = await websocket.receive_json()
+            if msg.get("type") != "go":
+                continue
+            try:
+                board = await analysis_board(user, game_id, msg)
+                depth, time_limit = analysis_limits(msg)
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "detail": e.detail})
+                continue
+            if board.is_game_over():
+                await websocket.send_json({"type": "bestmove", "move": None, "search_info": None})
+                continue
+            if not await stream_analysis(websocket, board, depth, time_limit, user["username"]):
+                return
+    except WebSocketDisconnect:
+        return
+
+async def stream_analysis(websocket: WebSocket, board: chess.Board, depth: int, time_limit: float,
+                          user: str = "") -> bool:
+    """
+    Una búsqueda de análisis: reenvía cada iteración y al final la mejor jugada.
+    Mientras tanto escucha "stop". Devuelve False si el cliente se desconectó.
+    """
+    stop = asyncio.Event()
+    connected = True
+
+    async def listen():
+        nonlocal connected
+        try:
+            while True:
+                msg = await websocket.receive_json()
+                if msg.get("type") == "stop":
+                    stop.set()
+                    return
+        except WebSocketDisconnect:
+            connected = False
+            stop.set()
+
+    async def send_info(update: dict):
+        if connected:
+            await websocket.send_json({"type": "info", **update})
+
+    listener = asyncio.create_task(listen())
+    try:
+        move, info = await engine_service.analyze(board, depth, time_limit, send_info, stop, user)
+    except EngineOverloaded:
+        await websocket.send_json({"type": "error", "detail": "Motor ocupado, reintenta en unos segundos"})
+        return True
+    except EngineCancelled:
+        # "stop" (o desconexión) antes de que le tocara turno
+        move, info = None, {}
+    finally:
+        listener.cancel()
+    if not connected:
+        return False
+    await websocket.send_json({"type": "bestmove", "move": move.uci() if move else None, "search_info": info})
+    return True
+
+# -------------------------
+# Análisis por lotes (NDJSON en el orden de entrada)
+#   {"fens": [...]} o {"pgn": "..."}, con "depth" (0 = solo evaluación) y "time_limit" por posición
+# -------------------------
+@router.post("/batch")
+async def batch(payload: dict, user=Depends(get_current_user)):
+    fens, pgn = payload.get("fens"), payload.get("pgn")
+    if bool(fens) == bool(pgn):
+        raise HTTPException(status_code=400, detail="Envía 'fens' (lista) o 'pgn' (texto), no ambos")
+    if fens is not None and not isinstance(fens, list):
+        raise HTTPException(status_code=400, detail="'fens' debe ser una lista")
+    if fens is not None and len(fens) > BATCH_MAX_POSITIONS:
+        raise HTTPException(status_code=413, detail=f"Máximo {BATCH_MAX_POSITIONS} posiciones por lote")
+    try:
+        depth = max(0, min(int(payload.get("depth", 2)), CLOCK_MAX_DEPTH))
+        time_limit = max(0.01, min(float(payload.get("time_limit", 5.0)), ANALYSIS_MAX_TIME))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="'depth' y 'time_limit' deben ser números")
+
+    try:
+        submit = engine_service.open_batch(user["username"])
+    except EngineOverloaded as exc:
+        detail = ("Ya tienes un lote en marcha, espera a que termine" if exc.reason == "user_limit"
+                  else "Motor ocupado, reintenta en unos segundos")
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": "1"})
+    # las posiciones pasan por el planificador (ver batch_window)
+    window = batch_window(engine_service.workers, engine_service.scheduler.max_per_user)
+    if fens is not None:
+        records = analyze_fens([str(f) for f in fens], submit, depth, time_limit, window)
+    else:
+        records = annotate_pgn(io.StringIO(str(pgn)), submit, depth, time_limit, window,
+                               max_positions=BATCH_MAX_POSITIONS)
+    body = ndjson(records)
+
+    async def finish():
+        # corre también si el cliente se desconecta: Starlette deja entonces el generador
+        # parado en un yield, así que hay que cerrarlo aquí (y con él el lote)
+        await body.aclose()
+        engine_service.close_batch(user["username"], submit)
+
+    return StreamingResponse(body, media_type="application/x-ndjson", background=BackgroundTask(finish))
+
+async def ndjson(records):
+    """Registros del lote como NDJSON."""
+    try:
+        # generador síncrono: se avanza en el threadpool, sin bloquear el event loop
+        async for record in iterate_in_threadpool(records):
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    finally:
+        # cerrarlo antes de terminar cancela las posiciones que queden en vuelo
+        records.close()
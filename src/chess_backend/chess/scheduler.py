@@ -0,0 +1,230 @@
+# src/chess_backend/chess/scheduler.py
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, NamedTuple, Optional
+from chess_backend.core.config import (
+    ENGINE_WORKERS, ENGINE_MAX_PENDING, ENGINE_MAX_PENDING_PER_USER, ENGINE_MIN_BUDGET_SCALE,
+)
+from chess_backend.core.metrics import (
+    ENGINE_PENDING, ENGINE_QUEUED, ENGINE_QUEUE_WAIT, ENGINE_BUDGET_SCALE, ENGINE_REJECTED,
+)
+
+# -------------------------
+# Presupuestos por nivel de dificultad
+# -------------------------
+class Budget(NamedTuple):
+    depth: int
+    time_limit: float
+    max_nodes: Optional[int]  # None = sin tope de nodos
+
+    def scaled(self, scale: float) -> "Budget":
+        """El mismo presupuesto reducido a `scale` (tiempo y nodos; la profundidad no)."""
+        nodes = max(MIN_NODES, int(self.max_nodes * scale)) if self.max_nodes else None
+        return Budget(self.depth, max(MIN_TIME, self.time_limit * scale), nodes)
+
+
+LEVELS: Dict[str, Budget] = {
+    "easy": Budget(2, 0.2, 2000),
+    "medium": Budget(4, 0.5, 8000),
+    "hard": Budget(6, 1.0, 20000),
+}
+DEFAULT_LEVEL = "hard"
+# Suelo de un presupuesto reducido: por debajo la jugada ya no merece la pena
+MIN_TIME = 0.02
+MIN_NODES = 200
+
+# Crédito (segundos de presupuesto) que recibe un usuario en cada vuelta del reparto
+QUANTUM = 1.0
+
+
+def batch_window(slots: int, max_per_user: int) -> int:
+    """
+    Posiciones de un lote en vuelo a la vez: como mucho la mitad de los slots (y lo que
+    admite el planificador por usuario). Una posición no se interrumpe y puede durar
+    segundos: con todos los slots para el lote, una jugada esperaría una posición entera.
+    """
+    return max(1, min(slots // 2, max_per_user))
+
+
+class SchedulerFull(Exception):
+    """No se admiten más búsquedas: `reason` es "overloaded" (cola global) o "user_limit"."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Ticket:
+    """Una petición en el planificador; `scale` y `waited` se fijan al empezar."""
+
+    __slots__ = ("user", "cost", "enqueued", "started", "scale", "waited", "future")
+
+    def __init__(self, user: str, cost: float, future: asyncio.Future):
+        self.user = user
+        self.cost = cost
+        self.enqueued = time.monotonic()
+        self.started: Optional[float] = None
+        self.scale = 1.0
+        self.waited = 0.0
+        self.future = future
+
+
+# -------------------------
+# Planificador
+# -------------------------
+class FairScheduler:
+    """
+    Reparte los `slots` del motor entre usuarios con deficit round robin: cada usuario con
+    peticiones en cola recibe QUANTUM segundos de crédito por vuelta y una petición sale
+    cuando su crédito cubre su coste (el tiempo pedido). Así quien manda muchas búsquedas,
+    o búsquedas caras, no deja sin turno al resto.
+
+    La carga se reparte también en el presupuesto: al empezar, una búsqueda recibe la
+    fracción slots / (slots + en cola) de lo pedido (nunca menos de `min_scale`), de modo
+    que espera + búsqueda se mantiene cerca del tiempo pedido aunque crezca la cola.
+
+    Vive en el event loop (sin locks): submit/release/cancel desde corrutinas.
+    """
+
+    def __init__(self, slots: int = ENGINE_WORKERS, max_pending: int = ENGINE_MAX_PENDING,
+                 max_per_user: int = ENGINE_MAX_PENDING_PER_USER,
+                 min_scale: float = ENGINE_MIN_BUDGET_SCALE, quantum: float = QUANTUM):
+        self.slots = max(1, slots)
+        self.max_pending = max_pending
+        self.max_per_user = max_per_user
+        self.min_scale = min_scale
+        self.quantum = quantum
+        # usuarios con peticiones en cola, en orden de turno (el primero es el actual)
+        self._queues: "OrderedDict[str, Deque[Ticket]]" = OrderedDict()
+        self._deficit: Dict[str, float] = {}
+        self._per_user: Dict[str, int] = {}
+        self.queued = 0
+        self.running = 0
+
+    @property
+    def pending(self) -> int:
+        return self.queued + self.running
+
+    def scale(self) -> float:
+        """Fracción del presupuesto para la búsqueda que empieza ahora."""
+        return max(self.min_scale, self.slots / (self.slots + self.queued))
+
+    def full(self, user: str) -> Optional[str]:
+        """Por qué no cabría ahora una petición de `user` ("overloaded" o "user_limit"), o None."""
+        if self.pending >= self.max_pending:
+            return "overloaded"
+        if self._per_user.get(user, 0) >= self.max_per_user:
+            return "user_limit"
+        return None
+
+    def submit(self, user: str, cost: float) -> Ticket:
+        """Encola una petición; SchedulerFull si no cabe. Esperar a `ticket.future`."""
+        reason = self.full(user)
+        if reason is not None:
+            ENGINE_REJECTED.inc(1, reason)
+            raise SchedulerFull(reason)
+        ticket = Ticket(user, max(cost, 1e-3), asyncio.get_running_loop().create_future())
+        queue = self._queues.get(user)
+        if queue is None:
+            queue = self._queues[user] = deque()
+            self._deficit[user] = 0.0
+            if len(self._queues) == 1:
+                self._deficit[user] = self.quantum
+        queue.append(ticket)
+        self._per_user[user] = self._per_user.get(user, 0) + 1
+        self.queued += 1
+        self._dispatch()
+        self._update_gauges()
+        return ticket
+
+    def release(self, ticket: Ticket) -> None:
+        """La búsqueda terminó (o falló): libera su slot."""
+        if ticket.started is None:
+            self.cancel(ticket)
+            return
+        self.running -= 1
+        self._forget(ticket.user)
+        self._dispatch()
+        self._update_gauges()
+
+    def cancel(self, ticket: Ticket) -> None:
+        """Retira una petición que aún no empezó (cliente desconectado)."""
+        if ticket.started is not None:
+            return
+        queue = self._queues.get(ticket.user)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            self._drop(ticket.user)
+        self.queued -= 1
+        self._forget(ticket.user)
+        ticket.future.cancel()
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self, user: str, cost: float) -> AsyncIterator[Ticket]:
+        """Espera turno y ocupa un slot mientras dura el bloque."""
+        ticket = self.submit(user, cost)
+        try:
+            await ticket.future
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    # -------------------------
+    # Deficit round robin
+    # -------------------------
+    def _dispatch(self) -> None:
+        while self.running < self.slots and self.queued:
+            ticket = self._next()
+            self.queued -= 1
+            self.running += 1
+            ticket.started = time.monotonic()
+            ticket.waited = ticket.started - ticket.enqueued
+            ticket.scale = self.scale()
+            ENGINE_QUEUE_WAIT.observe(ticket.waited)
+            ENGINE_BUDGET_SCALE.observe(ticket.scale)
+            ticket.future.set_result(ticket)
+
+    def _next(self) -> Ticket:
+        # el primero de _queues tiene el turno y ya recibió el crédito de esta vuelta
+        while True:
+            user, queue = next(iter(self._queues.items()))
+            if self._deficit[user] >= queue[0].cost:
+                ticket = queue.popleft()
+                self._deficit[user] -= ticket.cost
+                if not queue:
+                    self._drop(user)
+                return ticket
+            self._queues.move_to_end(user)
+            self._credit_front()
+
+    def _drop(self, user: str) -> None:
+        """El usuario se queda sin cola: pierde su crédito (no se acumula sin pedir)."""
+        front = next(iter(self._queues)) == user
+        del self._queues[user]
+        del self._deficit[user]
+        if front:
+            self._credit_front()
+
+    def _credit_front(self) -> None:
+        if self._queues:
+            self._deficit[next(iter(self._queues))] += self.quantum
+
+    def _forget(self, user: str) -> None:
+        left = self._per_user[user] - 1
+        if left:
+            self._per_user[user] = left
+        else:
+            del self._per_user[user]
+
+    def _update_gauges(self) -> None:
+        ENGINE_QUEUED.set(self.queued)
+        ENGINE_PENDING.set(self.pending)
+
+    def stats(self) -> dict:
+        return {"slots": self.slots, "queued": self.queued, "running": self.running,
+                "users": len(self._per_user), "scale": self.scale()}
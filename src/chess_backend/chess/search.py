@@ -1,29 +1,195 @@
 # src/chess_backend/chess/search.py
 import time
 import math
+import random
+from typing import Callable, Dict, List, Optional
 import chess
-from chess_backend.chess.evaluate import evaluate, see_gain  # IMPORTAR AQUÍ (no al revés)
+from chess.polyglot import zobrist_hash
+from chess_backend.chess.evaluate import VALUES, evaluate, evaluate_lazy, popcount  # IMPORTAR AQUÍ (no al revés)
+from chess_backend.chess.tt import TranspositionTable, EXACT, LOWER, UPPER
+from chess_backend.chess.eval_hash import EvalHashTable
+from chess_backend.chess.search_board import SearchBoard
+from chess_backend.chess.movepick import MAX_PLY, MoveOrdering, ordered_moves, ordered_captures
+from chess_backend.chess.book import BOOK
+from chess_backend.chess.tablebase import TABLEBASES, TB_WIN, wdl_score
+from chess_backend.chess.analysis_cache import ANALYSIS_CACHE
 
-# Transposition table simple: fen -> (value, depth, flag, best_move)
-TT = {}
+# Transposition table: zobrist -> (value, depth, flag, best_move), tamaño fijo
+TT = TranspositionTable()
+# Evaluaciones por hash Zobrist, aparte de la TT (ver eval_hash.py)
+EVAL_HASH = EvalHashTable()
 
 INFTY = 999999
 
+# Cada cuántos nodos se mira el reloj: en Python un nodo cuesta ~100 µs, así que
+# 64 nodos dan una granularidad de unos pocos ms sin que time.time() se note
+CHECK_EVERY = 64
+# No empezar otra iteración si ya se gastó esta fracción del tiempo: casi nunca terminaría
+SOFT_LIMIT = 0.5
+
+# -------------------------
+# Búsqueda selectiva
+# -------------------------
+# Puntuaciones de mate o de tablebase: no se podan ni se devuelven desde un null move
+DECISIVE = TB_WIN - MAX_PLY
+# Banda de las de tablebase (dependen del ply) en la TT: hasta medio camino del mate (100000)
+TB_BAND = (TB_WIN + 100000) // 2
+# Null move: reducción R (R + 1 con profundidad >= NULL_DEEP) a partir de NULL_MIN_DEPTH
+NULL_MIN_DEPTH = 3
+NULL_R = 2
+NULL_DEEP = 7
+# LMR: jugadas tranquilas a partir de la LMR_FULL_MOVES-ésima, con profundidad >= LMR_MIN_DEPTH
+LMR_MIN_DEPTH = 3
+LMR_FULL_MOVES = 3
+# Futility: a profundidad 1 y 2, margen por profundidad restante
+FUTILITY_MARGIN = (0, 200, 400)
+# Delta pruning en la quiescencia: margen sobre el valor de la pieza capturada, y solo
+# con más de DELTA_MIN_PIECES piezas (sin contar peones ni reyes) en el tablero
+DELTA_MARGIN = 200
+DELTA_MIN_PIECES = 2
+# Séptima fila de cada bando (indexado por color): con un peón ahí no hay corte global
+PROMOTION_RANKS = [chess.BB_RANK_2, chess.BB_RANK_7]
+# Ventana de aspiración alrededor de la puntuación anterior (se amplía ×4 al fallar)
+ASPIRATION_WINDOW = 50
+ASPIRATION_MIN_DEPTH = 3
+
+class SearchTimeout(Exception):
+    """Se agotó el tiempo (o se pidió parar): desenrolla la búsqueda hasta la raíz."""
+
+class SearchController:
+    """
+    Reloj de una búsqueda: cuenta nodos y cada `check_every` comprueba el deadline,
+    el presupuesto de nodos y la parada externa; si toca parar lanza SearchTimeout.
+    También lleva las estadísticas de la búsqueda (ver info()): son sumas de enteros
+    en atributos, baratas frente al coste de un nodo.
+    """
+
+    def __init__(self, deadline: Optional[float] = None,
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 check_every: int = CHECK_EVERY, max_nodes: Optional[int] = None):
+        self.deadline = deadline
+        self.should_stop = should_stop
+        self.max_nodes = max_nodes
+        self.check_every = check_every
+        self.nodes = 0
+        self._next_check = check_every
+        self.start = time.time()
+        self.qnodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.eval_probes = 0
+        self.eval_hits = 0
+        self.depth = 0
+        self.score = 0
+        self.iteration_nodes: List[int] = []
+        # Ply hasta el que se extienden los jaques (la iteración lo baja a 2 × profundidad)
+        self.extend_ply = MAX_PLY - 1
+
+    def tick(self) -> None:
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._next_check = self.nodes + self.check_every
+            self.check()
+
+    def check(self) -> None:
+        if self.deadline is not None and time.time() >= self.deadline:
+            raise SearchTimeout()
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchTimeout()
+        if self.should_stop is not None and self.should_stop():
+            raise SearchTimeout()
+
+    def iteration_done(self, depth: int, score: int) -> None:
+        self.iteration_nodes.append(self.nodes - sum(self.iteration_nodes))
+        self.depth = depth
+        self.score = score
+
+    def info(self) -> Dict:
+        """
+        Estadísticas de la búsqueda: nodos (incluida quiescencia), TT, caché de evaluación, cortes beta,
+        factor de ramificación efectivo (nodos de la última iteración / la anterior),
+        profundidad completada y tiempo.
+        """
+        elapsed = time.time() - self.start
+        last = self.iteration_nodes[-2:]
+        return {
+            "depth": self.depth,
+            "score": self.score,
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "time": round(elapsed, 4),
+            "nps": int(self.nodes / elapsed) if elapsed > 0 else 0,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": round(self.first_move_cutoffs / self.beta_cutoffs, 4) if self.beta_cutoffs else 0.0,
+            "eval_hash_probes": self.eval_probes,
+            "eval_hash_hits": self.eval_hits,
+            "eval_hash_hit_rate": round(self.eval_hits / self.eval_probes, 4) if self.eval_probes else 0.0,
+            "ebf": round(last[1] / last[0], 2) if len(last) == 2 and last[0] else None,
+        }
+
+# Controlador y heurísticas de ordenación de la búsqueda en curso
+# (un worker del motor hace una búsqueda a la vez)
+_ctl = SearchController()
+_ordering = MoveOrdering()
+
+def bound_flag(val: int, alpha: int, beta: int) -> int:
+    """
+    Tipo de cota de un resultado respecto a la ventana original (alpha, beta).
+    """
+    if val <= alpha:
+        return UPPER
+    if val >= beta:
+        return LOWER
+    return EXACT
+
+def position_key(board: chess.Board) -> int:
+    """Hash Zobrist (Polyglot): incremental en SearchBoard, desde cero en un chess.Board."""
+    incremental = getattr(board, "zobrist", None)
+    return incremental() if incremental is not None else zobrist_hash(board)
+
 def quiescence(board: chess.Board, alpha: int, beta: int) -> int:
     """
     Búsqueda de quiescencia: explora capturas (y checks) hasta que la posición esté quieta.
     """
-    stand_pat = evaluate(board)
+    _ctl.tick()
+    _ctl.qnodes += 1
+    # Evaluación cacheada o, si no está, por niveles desde el bando que mueve: lejos de la
+    # ventana basta material/PST (y entonces no se guarda, no es la evaluación completa)
+    key = position_key(board)
+    _ctl.eval_probes += 1
+    cached = EVAL_HASH.probe(key)
+    if cached is not None:
+        _ctl.eval_hits += 1
+        stand_pat = cached if board.turn == chess.WHITE else -cached
+    else:
+        stand_pat, complete = evaluate_lazy(board, alpha, beta)
+        if complete:
+            EVAL_HASH.store(key, stand_pat if board.turn == chess.WHITE else -stand_pat)
     if stand_pat >= beta:
         return beta
     if alpha < stand_pat:
         alpha = stand_pat
 
-    # Ordenar capturas por SEE (mejores primero)
-    captures = [m for m in board.legal_moves if board.is_capture(m)]
-    captures.sort(key=lambda m: see_gain(board, m), reverse=True)
+    # Delta pruning: si ni ganando la pieza capturada (más un margen) se llega a alpha, la
+    # captura no se explora. No con poco material, donde un peón pasado lo cambia todo
+    delta = popcount(board.occupied & ~(board.pawns | board.kings)) > DELTA_MIN_PIECES
+    if (delta and stand_pat + VALUES[chess.QUEEN] + DELTA_MARGIN <= alpha
+            and not board.pawns & board.occupied_co[board.turn] & PROMOTION_RANKS[board.turn]):
+        return alpha
 
-    for m in captures:
+    # Capturas por MVV-LVA; las que pierden material (SEE < 0) no se exploran
+    for m in ordered_captures(board):
+        if delta and not m.promotion:
+            victim = board.piece_type_at(m.to_square) or chess.PAWN  # en passant
+            if stand_pat + VALUES[victim] + DELTA_MARGIN <= alpha:
+                continue
         board.push(m)
         score = -quiescence(board, -beta, -alpha)
         board.pop()
@@ -33,31 +199,133 @@ def quiescence(board: chess.Board, alpha: int, beta: int) -> int:
             alpha = score
     return alpha
 
+def lmr_reduction(depth: int, index: int) -> int:
+    """Plies que se reduce la jugada `index` (0 = primera) a `depth`; crece con ambos."""
+    return max(1, int(0.5 + math.log(depth) * math.log(index) / 2))
+
+def static_eval(board: chess.Board, key: int) -> int:
+    """evaluate() desde el bando que mueve, pasando por la caché de evaluaciones."""
+    _ctl.eval_probes += 1
+    score = EVAL_HASH.probe(key)
+    if score is None:
+        score = evaluate(board)
+        EVAL_HASH.store(key, score)
+    else:
+        _ctl.eval_hits += 1
+    return score if board.turn == chess.WHITE else -score
+
+def score_to_tt(score: int, ply: int) -> int:
+    """
+    Puntuación para la TT: las de tablebase (TB_WIN - ply de la hoja) se guardan como
+    distancia desde este nodo, así valen igual si se llega a la posición por otro camino
+    (transposición, otro ply). Los mates (±100000) no dependen del ply y no se tocan.
+    """
+    if DECISIVE <= score < TB_BAND:
+        return score + ply
+    if -TB_BAND < score <= -DECISIVE:
+        return score - ply
+    return score
+
+def score_from_tt(score: int, ply: int) -> int:
+    """Inversa de score_to_tt: de distancia desde el nodo a distancia desde la raíz."""
+    if DECISIVE <= score < TB_BAND:
+        return score - ply
+    if -TB_BAND < score <= -DECISIVE:
+        return score + ply
+    return score
+
 def alphabeta(board: chess.Board, depth: int, alpha: int, beta: int) -> int:
     """
-    Alpha-beta con TT y ordenación básica de jugadas.
+    PVS con TT y ordenación por etapas (TT, capturas, killers, historial).
+    La primera jugada se busca con la ventana completa y el resto con ventana nula,
+    repitiendo solo si mejora alpha. Poda selectiva fuera de la variante principal:
+    null move, futility cerca de las hojas y LMR; las posiciones en jaque se extienden.
     """
-    key = board.fen()
-    tt = TT.get(key)
+    _ctl.tick()
+    alpha_orig = alpha
+    pv_node = beta - alpha > 1
+    ply = _ordering.ply(board)
+    key = position_key(board)
+    tt = TT.probe(key)
+    _ctl.tt_probes += 1
+    tt_move = None
+    if tt:
+        _ctl.tt_hits += 1
+        tt_move = tt[3]
     if tt and tt[1] >= depth:
-        # Devolvemos el valor cacheado si la profundidad es suficiente
-        return tt[0]
+        # Solo usamos el valor cacheado si su cota sirve para esta ventana
+        val = score_from_tt(tt[0], ply)
+        flag = tt[2]
+        if flag == EXACT or (flag == LOWER and val >= beta) or (flag == UPPER and val <= alpha):
+            _ctl.tt_cutoffs += 1
+            return val
+
+    # Tablebases: resultado exacto al entrar en las tablas. Solo tras captura o jugada de
+    # peón (contador a cero), que es cuando el WDL no depende de la regla de 50 jugadas
+    if board.halfmove_clock == 0:
+        wdl = TABLEBASES.probe_wdl(board)
+        if wdl is not None:
+            val = wdl_score(wdl, ply)
+            TT.store(key, score_to_tt(val, ply), depth, EXACT, None)
+            return val
+
+    in_check = board.is_check()
+    # Extensión de jaque: no entrar en la quiescencia (que no genera evasiones) estando en jaque.
+    # Acotada por ply: una serie de jaques no alarga la rama más del doble de la iteración
+    if in_check and ply < _ctl.extend_ply:
+        depth += 1
 
-    if depth == 0 or board.is_game_over():
+    if depth <= 0 or board.is_game_over():
         val = quiescence(board, alpha, beta)
-        TT[key] = (val, depth, 'EXACT', None)
+        TT.store(key, score_to_tt(val, ply), 0, bound_flag(val, alpha_orig, beta), None)
         return val
 
+    # Evaluación estática solo si alguna poda la va a usar
+    eval_ = None
+    if not pv_node and not in_check:
+        if depth <= 2 and abs(alpha) < DECISIVE:
+            eval_ = static_eval(board, key)
+        # Null move: pasar el turno; si aun así la búsqueda reducida llega a beta, cortar.
+        # No en jaque, ni tras otro null move, ni con solo peones (zugzwang)
+        elif (depth >= NULL_MIN_DEPTH and abs(beta) < DECISIVE and board.move_stack and board.move_stack[-1]
+              and board.occupied_co[board.turn] & ~(board.pawns | board.kings)):
+            eval_ = static_eval(board, key)
+            if eval_ >= beta:
+                r = NULL_R + 1 if depth >= NULL_DEEP else NULL_R
+                board.push(chess.Move.null())
+                val = -alphabeta(board, depth - 1 - r, -beta, -beta + 1)
+                board.pop()
+                if val >= beta:
+                    # no fiarse de un mate encontrado sin jugar
+                    TT.store(key, score_to_tt(beta, ply), depth, LOWER, None)
+                    return beta
+    # Futility: a 1-2 plies del horizonte, las tranquilas sin jaque no pueden subir alpha
+    futile = eval_ is not None and depth <= 2 and eval_ + FUTILITY_MARGIN[depth] <= alpha
+    killers = _ordering.killers[ply]
+
     best = -INFTY
     best_move = None
 
-    moves = list(board.legal_moves)
-    # Ordering: capturas (por SEE) primero, luego quiet moves
-    moves.sort(key=lambda m: (board.is_capture(m), see_gain(board, m)), reverse=True)
-
-    for m in moves:
+    for i, m in enumerate(ordered_moves(board, tt_move, _ordering)):
+        quiet = not m.promotion and not board.is_capture(m)
         board.push(m)
-        val = -alphabeta(board, depth - 1, -beta, -alpha)
+        gives_check = board.is_check()
+        if i > 0 and quiet and not gives_check and futile:
+            board.pop()
+            continue
+        if i == 0:
+            val = -alphabeta(board, depth - 1, -beta, -alpha)
+        else:
+            # LMR: las tranquilas tardías se buscan reducidas; si mejoran alpha, sin reducir
+            r = 0
+            if (i >= LMR_FULL_MOVES and depth >= LMR_MIN_DEPTH and quiet and not in_check
+                    and not gives_check and m not in killers):
+                r = min(lmr_reduction(depth, i), depth - 2)
+            val = -alphabeta(board, depth - 1 - r, -alpha - 1, -alpha)
+            if r and val > alpha:
+                val = -alphabeta(board, depth - 1, -alpha - 1, -alpha)
+            if alpha < val < beta:
+                val = -alphabeta(board, depth - 1, -beta, -alpha)
         board.pop()
 
         if val > best:
@@ -66,16 +334,134 @@ def alphabeta(board: chess.Board, depth: int, alpha: int, beta: int) -> int:
         if val > alpha:
             alpha = val
         if alpha >= beta:
+            _ctl.beta_cutoffs += 1
+            if i == 0:
+                _ctl.first_move_cutoffs += 1
+            if quiet:
+                _ordering.record_cutoff(board, m, depth)
             break
 
-    TT[key] = (best, depth, 'EXACT', best_move)
+    TT.store(key, score_to_tt(best, ply), depth, bound_flag(best, alpha_orig, beta), best_move)
     return best
 
-def find_best(board: chess.Board, max_depth: int = 4, time_limit: float = 1.0) -> chess.Move:
+def current_info() -> Dict:
+    """Estadísticas de la búsqueda en curso (p. ej. desde on_iteration)."""
+    return _ctl.info()
+
+def principal_variation(board: chess.Board, first_move: chess.Move, max_len: int = 16) -> List[chess.Move]:
+    """
+    Variante principal desde `board`: first_move y luego las mejores jugadas guardadas
+    en la TT mientras sean legales y no repitan posición. Deja `board` como estaba.
+    """
+    pv = [first_move]
+    board.push(first_move)
+    seen = {position_key(board)}
+    while len(pv) < max_len:
+        entry = TT.probe(position_key(board))
+        move = entry[3] if entry else None
+        if move is None or not board.is_legal(move):
+            break
+        board.push(move)
+        key = position_key(board)
+        pv.append(move)
+        if key in seen:
+            break
+        seen.add(key)
+    for _ in pv:
+        board.pop()
+    return pv
+
+def find_best(board: chess.Board, max_depth: int = 4, time_limit: float = 1.0, workers: int = 1,
+              use_book: bool = True, info: Optional[Dict] = None,
+              max_nodes: Optional[int] = None) -> chess.Move:
     """
     Iterative deepening simple con control de tiempo.
     Devuelve la mejor jugada encontrada (chess.Move) o None si no hay jugadas.
+    Si la posición está en el libro de aperturas, en las tablebases o en la caché de análisis
+    (a profundidad suficiente) se responde sin buscar; lo buscado a fondo se guarda en la caché.
+    Con workers > 1 se usa Lazy SMP (ver smp.py): varios procesos con TT compartida.
+    info: si se pasa un dict, se rellena con las estadísticas (ver SearchController.info)
+    y con "source" = "book", "tablebase", "cache" o "search".
+    max_nodes: presupuesto de nodos (con Lazy SMP, del proceso principal).
+    """
+    if info is None:
+        info = {}
+    if use_book:
+        move = BOOK.pick(board)
+        if move is not None:
+            info["source"] = "book"
+            return move
+    move = TABLEBASES.root_move(board)
+    if move is not None:
+        info["source"] = "tablebase"
+        return move
+
+    key = zobrist_hash(board)
+    cached = ANALYSIS_CACHE.lookup(key)
+    if (cached is not None and cached.flag == EXACT and cached.depth >= max_depth
+            and cached.move is not None and board.is_legal(cached.move)):
+        info.update(source="cache", depth=cached.depth, score=cached.score)
+        return cached.move
+
+    info["source"] = "search"
+    if workers > 1:
+        from chess_backend.chess.smp import lazy_smp
+        move = lazy_smp(board, max_depth, time_limit, workers, info=info, max_nodes=max_nodes)
+    else:
+        TT.new_search()
+        # Tablero de búsqueda con material/PST incrementales (no modifica el del llamador)
+        move = iterative_deepening(SearchBoard.from_board(board), max_depth, time_limit, info=info,
+                                   max_nodes=max_nodes)
+    # la raíz se busca con ventana completa: el resultado es exacto
+    ANALYSIS_CACHE.put(key, info.get("score", 0), info.get("depth", 0), EXACT, move)
+    return move
+
+def search_root(board: chess.Board, moves: List[chess.Move], depth: int,
+                alpha: int, beta: int):
+    """
+    PVS en la raíz sobre `moves` (en orden). Devuelve (puntuación, mejor jugada);
+    si la puntuación queda fuera de (alpha, beta) es solo una cota.
+    """
+    best_score = -INFTY
+    best = None
+    for i, m in enumerate(moves):
+        board.push(m)
+        if i == 0:
+            score = -alphabeta(board, depth - 1, -beta, -alpha)
+        else:
+            score = -alphabeta(board, depth - 1, -alpha - 1, -alpha)
+            if alpha < score < beta:
+                score = -alphabeta(board, depth - 1, -beta, -alpha)
+        board.pop()
+
+        if score > best_score:
+            best_score = score
+            best = m
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+    return best_score, best
+
+def iterative_deepening(board: chess.Board, max_depth: int, time_limit: float,
+                        start_depth: int = 1,
+                        rng: Optional[random.Random] = None,
+                        should_stop: Optional[Callable[[], bool]] = None,
+                        on_iteration: Optional[Callable[[int, int, chess.Move], None]] = None,
+                        info: Optional[Dict] = None,
+                        max_nodes: Optional[int] = None) -> Optional[chess.Move]:
+    """
+    Bucle de profundización sobre `board` (que se modifica con push/pop y se deja igual).
+    - El reloj se comprueba cada CHECK_EVERY nodos; al agotarse se aborta la iteración
+      en curso y se devuelve la mejor jugada de la última iteración completa.
+    - La mejor jugada de la iteración anterior se prueba primero en la siguiente.
+    - rng: desordena las jugadas raíz (helpers de Lazy SMP).
+    - should_stop: parada externa, comprobada junto al tiempo.
+    - on_iteration(depth, score, move): se llama al completar cada profundidad.
+    - info: dict que se rellena al terminar con las estadísticas de la búsqueda.
+    - max_nodes: presupuesto de nodos; al agotarse se para como con el tiempo.
     """
+    global _ctl, _ordering
     start = time.time()
     best_move = None
 
@@ -84,27 +470,61 @@ def find_best(board: chess.Board, max_depth: int = 4, time_limit: float = 1.0) -
     if not legal:
         return None
 
-    for depth in range(1, max_depth + 1):
-        best_score = -INFTY
-        # Recolectar lista de jugadas y ordenarlas por heurística simple
-        moves = list(board.legal_moves)
-        moves.sort(key=lambda m: (board.is_capture(m), see_gain(board, m)), reverse=True)
-
-        for m in moves:
-            # Comprobar tiempo antes de cada evaluación pesada
-            if time.time() - start > time_limit:
-                return best_move
+    previous_ctl, previous_ordering = _ctl, _ordering
+    _ctl = SearchController(deadline=start + time_limit, should_stop=should_stop, max_nodes=max_nodes)
+    root_ply = len(board.move_stack)
+    _ordering = MoveOrdering(root_ply)
+    try:
+        for depth in range(start_depth, max_depth + 1):
+            iteration_best = None
+            _ctl.extend_ply = min(2 * depth, MAX_PLY - 1)
+            # Jugadas raíz en el orden del picker (la mejor anterior va delante)
+            moves = list(ordered_moves(board, best_move, _ordering))
+            if rng is not None:
+                rng.shuffle(moves)
+            if best_move is not None:
+                moves.remove(best_move)
+                moves.insert(0, best_move)
 
-            board.push(m)
-            score = -alphabeta(board, depth - 1, -INFTY, INFTY)
-            board.pop()
+            # Ventana de aspiración alrededor de la puntuación anterior; si el resultado
+            # cae fuera se amplía ese lado y se repite la iteración
+            delta = ASPIRATION_WINDOW
+            if depth >= ASPIRATION_MIN_DEPTH and abs(_ctl.score) < DECISIVE:
+                alpha, beta = _ctl.score - delta, _ctl.score + delta
+            else:
+                alpha, beta = -INFTY, INFTY
+            while True:
+                best_score, iteration_best = search_root(board, moves, depth, alpha, beta)
+                if best_score <= alpha and alpha > -INFTY:
+                    alpha = max(-INFTY, best_score - delta)
+                elif best_score >= beta and beta < INFTY:
+                    beta = min(INFTY, best_score + delta)
+                    # la jugada que falló alto va primero en la repetición
+                    moves.remove(iteration_best)
+                    moves.insert(0, iteration_best)
+                else:
+                    break
+                delta *= 4
 
-            if score > best_score:
-                best_score = score
-                best_move = m
+            best_move = iteration_best
+            _ctl.iteration_done(depth, best_score)
+            if on_iteration is not None:
+                on_iteration(depth, best_score, best_move)
 
-        # Si se agotó el tiempo, salimos con la mejor encontrada hasta ahora
-        if time.time() - start > time_limit:
-            break
+            # Sin tiempo para otra iteración completa: salimos con esta
+            if time.time() - start > time_limit * SOFT_LIMIT:
+                break
+            _ctl.check()
+    except SearchTimeout:
+        # deshacer las jugadas que quedaron a medias en el tablero
+        while len(board.move_stack) > root_ply:
+            board.pop()
+        if best_move is None:
+            # ni la primera iteración terminó: cualquier jugada legal es mejor que nada
+            best_move = iteration_best or moves[0]
+    finally:
+        if info is not None:
+            info.update(_ctl.info())
+        _ctl, _ordering = previous_ctl, previous_ordering
 
     return best_move
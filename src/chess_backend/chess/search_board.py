@@ -0,0 +1,169 @@
+# src/chess_backend/chess/search_board.py
+from typing import Optional, Tuple
+import chess
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY, zobrist_hash
+from chess_backend.chess.evaluate import (
+    VALUES, PHASE_UNITS, PST_SIGNED, KING_MID_SIGNED, KING_END_SIGNED, material_pst,
+)
+
+# Claves Zobrist Polyglot por [color][tipo de pieza][casilla] (las mismas que zobrist_hash;
+# indexado por color: BLACK=0, WHITE=1)
+ZOBRIST_PIECES = [
+    [[0] * 64] + [[POLYGLOT_RANDOM_ARRAY[64 * ((pt - 1) * 2 + color) + sq] for sq in chess.SQUARES]
+                  for pt in chess.PIECE_TYPES]
+    for color in (chess.BLACK, chess.WHITE)
+]
+ZOBRIST_CASTLING = ((chess.BB_H1, POLYGLOT_RANDOM_ARRAY[768]), (chess.BB_A1, POLYGLOT_RANDOM_ARRAY[769]),
+                    (chess.BB_H8, POLYGLOT_RANDOM_ARRAY[770]), (chess.BB_A8, POLYGLOT_RANDOM_ARRAY[771]))
+ZOBRIST_EP = POLYGLOT_RANDOM_ARRAY[772:780]
+ZOBRIST_TURN = POLYGLOT_RANDOM_ARRAY[780]
+
+
+class SearchBoard(chess.Board):
+    """
+    Tablero para la búsqueda: mantiene material, PST (medio juego / final del rey)
+    y unidades de fase como deltas en cada push/pop, de modo que la parte base
+    de evaluate() es O(1) por nodo. También la parte de piezas del hash Zobrist
+    (ver zobrist()).
+
+    Los deltas se aplican en los hooks de bajo nivel (_set_piece_at / _remove_piece_at)
+    que usa push(); pop() restaura la tupla guardada.
+    """
+
+    def __init__(self, fen: Optional[str] = chess.STARTING_FEN, *, chess960: bool = False):
+        self._inc_stack = []
+        self._terms = [0, 0, 0, 0, 0, 0]
+        self._piece_key = 0
+        super().__init__(fen, chess960=chess960)
+        self._recompute()
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> "SearchBoard":
+        """
+        Copia un chess.Board conservando el historial (necesario para repeticiones).
+        """
+        sb = cls(board.root().fen(), chess960=board.chess960)
+        for move in board.move_stack:
+            sb.push(move)
+        return sb
+
+    def material_pst(self) -> Tuple[int, int, int, int, int, int]:
+        """
+        (material blanco, material negro, PST sin reyes, PST rey medio juego,
+        PST rey final, unidades de fase), igual que evaluate.material_pst().
+        """
+        return tuple(self._terms)
+
+    def zobrist(self) -> int:
+        """
+        Igual que chess.polyglot.zobrist_hash(self), sin recorrer las piezas: su parte se
+        mantiene en push/pop y aquí solo se añaden enroques, al paso y turno.
+        """
+        if self.chess960:
+            return zobrist_hash(self)
+        key = self._piece_key
+        castling = self.clean_castling_rights()
+        if castling:
+            for mask, value in ZOBRIST_CASTLING:
+                if castling & mask:
+                    key ^= value
+        ep_square = self.ep_square
+        if ep_square is not None:
+            # solo si hay un peón que pueda capturar (como en Polyglot)
+            if self.turn == chess.WHITE:
+                ep_mask = chess.shift_down(chess.BB_SQUARES[ep_square])
+            else:
+                ep_mask = chess.shift_up(chess.BB_SQUARES[ep_square])
+            ep_mask = chess.shift_left(ep_mask) | chess.shift_right(ep_mask)
+            if ep_mask & self.pawns & self.occupied_co[self.turn]:
+                key ^= ZOBRIST_EP[ep_square & 7]
+        if self.turn == chess.WHITE:
+            key ^= ZOBRIST_TURN
+        return key
+
+    # -------------------------
+    # Make / unmake
+    # -------------------------
+    def push(self, move: chess.Move) -> None:
+        self._inc_stack.append((tuple(self._terms), self._piece_key))
+        super().push(move)
+
+    def pop(self) -> chess.Move:
+        move = super().pop()
+        if self._inc_stack:
+            terms, self._piece_key = self._inc_stack.pop()
+            self._terms = list(terms)
+        else:
+            # historial anterior a la copia: recalcular desde cero
+            self._recompute()
+        return move
+
+    def _remove_piece_at(self, square: chess.Square) -> Optional[chess.PieceType]:
+        color = bool(self.occupied_co[chess.WHITE] & chess.BB_SQUARES[square])
+        piece_type = super()._remove_piece_at(square)
+        if piece_type:
+            self._update(piece_type, square, color, -1)
+        return piece_type
+
+    def _set_piece_at(self, square: chess.Square, piece_type: chess.PieceType, color: chess.Color, promoted: bool = False) -> None:
+        super()._set_piece_at(square, piece_type, color, promoted)
+        self._update(piece_type, square, color, 1)
+
+    def _update(self, piece_type: chess.PieceType, square: chess.Square, color: chess.Color, delta: int) -> None:
+        self._piece_key ^= ZOBRIST_PIECES[color][piece_type][square]
+        t = self._terms
+        if color == chess.WHITE:
+            t[0] += delta * VALUES[piece_type]
+        else:
+            t[1] += delta * VALUES[piece_type]
+        if piece_type == chess.KING:
+            t[3] += delta * KING_MID_SIGNED[color][square]
+            t[4] += delta * KING_END_SIGNED[color][square]
+        else:
+            t[2] += delta * PST_SIGNED[color][piece_type][square]
+            t[5] += delta * PHASE_UNITS[piece_type]
+
+    # -------------------------
+    # Cambios masivos del tablero: recalcular
+    # -------------------------
+    def _recompute(self) -> None:
+        self._terms = list(material_pst(self))
+        key = 0
+        for square, piece in self.piece_map().items():
+            key ^= ZOBRIST_PIECES[piece.color][piece.piece_type][square]
+        self._piece_key = key
+
+    def _reset_board(self) -> None:
+        super()._reset_board()
+        self._recompute()
+
+    def _clear_board(self) -> None:
+        super()._clear_board()
+        self._recompute()
+
+    def _set_board_fen(self, fen: str) -> None:
+        super()._set_board_fen(fen)
+        self._recompute()
+
+    def _set_piece_map(self, pieces) -> None:
+        super()._set_piece_map(pieces)
+        self._recompute()
+
+    def _set_chess960_pos(self, scharnagl: int) -> None:
+        super()._set_chess960_pos(scharnagl)
+        self._recompute()
+
+    def apply_transform(self, f) -> None:
+        super().apply_transform(f)
+        self._recompute()
+
+    def copy(self, *, stack=True) -> "SearchBoard":
+        board = super().copy(stack=stack)
+        board._recompute()
+        kept = len(board.move_stack)
+        board._inc_stack = self._inc_stack[-kept:] if kept else []
+        return board
+
+    def clear_stack(self) -> None:
+        super().clear_stack()
+        self._inc_stack = []
@@ -0,0 +1,384 @@
+# src/chess_backend/chess/service.py
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import chess
+from chess_backend.core.config import ENGINE_WORKERS, ENGINE_MAX_PENDING
+from chess_backend.core.metrics import record_search, ENGINE_REJECTED, ENGINE_BUDGET_SECONDS
+from chess_backend.chess.scheduler import Budget, FairScheduler, SchedulerFull, Ticket, LEVELS, DEFAULT_LEVEL
+
+
+class EngineOverloaded(Exception):
+    """
+    Hay demasiadas búsquedas en cola (`reason` = "overloaded") o el usuario ya tiene
+    demasiadas (`reason` = "user_limit"): el cliente debe reintentar más tarde.
+    """
+
+    def __init__(self, reason: str = "overloaded"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class EngineCancelled(Exception):
+    """El cliente se desconectó antes de que terminara la búsqueda."""
+
+
+# -------------------------
+# Lado del worker (proceso del pool)
+# -------------------------
+def _init_worker(snapshot: Optional[str] = None) -> None:
+    """
+    Calienta el worker: importa el motor (máscaras, TT propia del proceso), precarga en
+    la TT lo más usado de la caché de análisis y hace una búsqueda mínima para que la
+    primera petición real no pague el arranque. Con `snapshot` (AnalysisCache.snapshot)
+    la TT se lee de ese fichero en vez de rehacerla desde la caché.
+    """
+    from chess_backend.chess.engine import best_move
+    from chess_backend.chess import search
+    from chess_backend.chess.analysis_cache import ANALYSIS_CACHE
+    if not (snapshot and search.TT.load(snapshot)):
+        ANALYSIS_CACHE.warm(search.TT)
+    best_move(chess.Board(), 1, 1.0)
+
+
+def _ready() -> int:
+    # tarea vacía: termina cuando el worker ha pasado _init_worker
+    return os.getpid()
+
+
+def _build_snapshot() -> Optional[str]:
+    from chess_backend.chess.analysis_cache import ANALYSIS_CACHE
+    return ANALYSIS_CACHE.snapshot()
+
+
+def _search_job(root_fen: str, moves: List[str], depth: int, time_limit: float,
+                workers: int, max_nodes: Optional[int] = None) -> Tuple[Optional[str], Dict]:
+    from chess_backend.chess.engine import best_move
+    board = chess.Board(root_fen)
+    for uci in moves:
+        board.push(chess.Move.from_uci(uci))
+    info: Dict = {}
+    move = best_move(board, depth, time_limit, workers, info=info, max_nodes=max_nodes)
+    return (move.uci() if move else None), info
+
+
+def _analysis_job(root_fen: str, moves: List[str], depth: int, time_limit: float,
+                  updates, stop) -> Tuple[Optional[str], Dict]:
+    """
+    Búsqueda de análisis: tras cada iteración completa manda a `updates` (cola del
+    Manager) profundidad, puntuación, PV, nodos y NPS. `stop` (Event del Manager)
+    la termina antes de tiempo con la mejor jugada de la última iteración.
+    """
+    from chess_backend.chess import search
+    from chess_backend.chess.search_board import SearchBoard
+    board = SearchBoard(root_fen)
+    for uci in moves:
+        board.push(chess.Move.from_uci(uci))
+
+    def report(d: int, score: int, move: Optional[chess.Move]) -> None:
+        if move is None:
+            return
+        stats = search.current_info()
+        updates.put({
+            "depth": d,
+            "score": score,
+            "best_move": move.uci(),
+            "pv": [m.uci() for m in search.principal_variation(board, move)],
+            "nodes": stats["nodes"],
+            "nps": stats["nps"],
+            "time": stats["time"],
+        })
+
+    info: Dict = {"source": "search"}
+    search.TT.new_search()
+    move = search.iterative_deepening(board, depth, time_limit, should_stop=stop.is_set,
+                                      on_iteration=report, info=info)
+    return (move.uci() if move else None), info
+
+
+def _drain(updates, timeout: float) -> List[Dict]:
+    """
+    Espera hasta `timeout` s a la siguiente actualización de `updates` y recoge también
+    las que ya haya. Corre en un hilo: cada llamada a la cola del Manager es una ida y
+    vuelta síncrona con su proceso y en el event loop lo bloquearía.
+    """
+    batch = []
+    try:
+        batch.append(updates.get(timeout=timeout))
+        while True:
+            batch.append(updates.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+
+# -------------------------
+# Lado del servidor (event loop)
+# -------------------------
+def batch_user(user: str) -> str:
+    """Usuario del planificador para los lotes de `user`."""
+    return f"{user}/batch"
+
+
+class EngineService:
+    """
+    Pool de procesos con el motor caliente. Las rutas async envían búsquedas aquí,
+    así las búsquedas (CPU, GIL) no bloquean el event loop ni entre sí.
+
+    Delante del pool va un FairScheduler: una búsqueda espera su turno (reparto justo
+    entre usuarios) y al empezar recibe su presupuesto reducido según la cola.
+    """
+
+    def __init__(self, workers: int = ENGINE_WORKERS, max_pending: int = ENGINE_MAX_PENDING,
+                 poll_interval: float = 0.1, update_interval: float = 0.02):
+        self.workers = max(1, workers)
+        self.scheduler = FairScheduler(self.workers, max_pending)
+        self.poll_interval = poll_interval
+        # el análisis reenvía las iteraciones con poca latencia (las primeras tardan ms)
+        self.update_interval = update_interval
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._snapshot: Optional[str] = None
+        # Manager (colas y eventos entre procesos) para el análisis; se crea al primer uso.
+        # Sus proxies se usan desde _ipc, un hilo por análisis posible (uno por slot)
+        self._manager = None
+        self._ipc: Optional[ThreadPoolExecutor] = None
+        # lotes abiertos: usuario -> su submit (uno por usuario)
+        self._batches: Dict[str, Callable[..., Future]] = {}
+
+    def start(self) -> None:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._snapshot,),
+            )
+        if self._ipc is None:
+            self._ipc = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="engine-ipc")
+
+    async def warm_up(self) -> float:
+        """
+        Arranca ya los procesos del pool (si no, se crean con la primera búsqueda) y espera
+        a que todos hayan pasado _init_worker. Antes guarda el snapshot de la TT que leen
+        al arrancar. Devuelve los segundos que tardó.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            self._snapshot = await loop.run_in_executor(None, _build_snapshot)
+        self.start()
+        # cada submit sin worker libre lanza un proceso nuevo: `workers` tareas, `workers` procesos
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ready) for _ in range(self.workers)))
+        return time.perf_counter() - start
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._ipc is not None:
+            self._ipc.shutdown(wait=False, cancel_futures=True)
+            self._ipc = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def open_batch(self, user: str) -> Callable[..., Future]:
+        """
+        Admite un lote de `user` y devuelve su `submit` para batch.analyze_fens/annotate_pgn,
+        que lo llaman desde el hilo que recorre el lote (llamar a open_batch en el event
+        loop). Cada posición pasa por el planificador como una búsqueda de "<user>/batch"
+        (reparto propio, sin quitar cupo a las jugadas del usuario) con coste su tiempo, y
+        al empezar su tiempo se recorta según la cola como el de una jugada. El submit
+        devuelve un concurrent Future con el resultado.
+        EngineOverloaded si la cola está llena ("overloaded") o el usuario ya tiene un lote
+        abierto ("user_limit"). El lote queda abierto hasta close_batch(user, submit).
+        """
+        if user in self._batches:
+            reason = "user_limit"
+        elif self.scheduler.pending >= self.scheduler.max_pending:
+            reason = "overloaded"
+        else:
+            reason = None
+        if reason is not None:
+            ENGINE_REJECTED.inc(1, reason)
+            raise EngineOverloaded(reason)
+        loop = asyncio.get_running_loop()
+        key = batch_user(user)
+
+        def submit(fn, fen: str, depth: int, time_limit: float) -> Future:
+            return asyncio.run_coroutine_threadsafe(self._batch_job(key, fn, fen, depth, time_limit), loop)
+
+        self._batches[user] = submit
+        return submit
+
+    def close_batch(self, user: str, submit: Callable[..., Future]) -> None:
+        """Cierra el lote de open_batch (idempotente; no toca un lote posterior del usuario)."""
+        if self._batches.get(user) is submit:
+            del self._batches[user]
+
+    async def _batch_job(self, user: str, fn, fen: str, depth: int, time_limit: float):
+        # con la cola llena la posición espera sitio en vez de romper el lote a medias
+        while self.scheduler.full(user):
+            await asyncio.sleep(self.poll_interval)
+        ticket = self._submit(user, time_limit)
+        job = None
+        try:
+            await ticket.future
+            granted = Budget(depth, time_limit, None).scaled(ticket.scale)
+            ENGINE_BUDGET_SECONDS.observe(granted.time_limit)
+            self.start()
+            job = self._pool.submit(fn, fen, depth, granted.time_limit)
+            return await asyncio.wrap_future(job)
+        finally:
+            self._release_when_done(ticket, job)
+
+    def _get_manager(self):
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    def _channels(self):
+        """(hilo) Cola de actualizaciones y evento de parada nuevos para un análisis."""
+        manager = self._get_manager()
+        return manager.Queue(), manager.Event()
+
+    def _submit(self, user: str, cost: float) -> Ticket:
+        try:
+            return self.scheduler.submit(user, cost)
+        except SchedulerFull as exc:
+            raise EngineOverloaded(exc.reason)
+
+    async def _turn(self, ticket: Ticket, cancelled: Callable[[], Awaitable[bool]]) -> None:
+        """Espera a que el planificador dé slot a `ticket`; EngineCancelled si `cancelled()`."""
+        while True:
+            done, _ = await asyncio.wait({ticket.future}, timeout=self.poll_interval)
+            if done:
+                return
+            if await cancelled():
+                self.scheduler.cancel(ticket)
+                ENGINE_REJECTED.inc(1, "cancelled")
+                raise EngineCancelled()
+
+    def _release_when_done(self, ticket: Ticket, job: Optional[Future]) -> None:
+        """
+        Libera el slot de `ticket` cuando su worker queda libre de verdad. Un trabajo que
+        ya corre no se puede cancelar (acaba por su presupuesto): hasta entonces el slot
+        sigue ocupado, si no el planificador daría ese worker a otra búsqueda.
+        """
+        if job is None or job.done():
+            self.scheduler.release(ticket)
+            return
+        loop = asyncio.get_running_loop()
+
+        def done(_: Future) -> None:
+            # hilo del pool: la liberación se hace en el event loop
+            try:
+                loop.call_soon_threadsafe(self.scheduler.release, ticket)
+            except RuntimeError:
+                pass  # loop cerrado (apagado)
+
+        job.add_done_callback(done)
+
+    async def search(self, board: chess.Board, budget: Budget = LEVELS[DEFAULT_LEVEL], workers: int = 1,
+                     user: str = "", is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+                     ) -> Tuple[Optional[chess.Move], Dict]:
+        """
+        Busca la mejor jugada en un worker (workers > 1: Lazy SMP desde ese worker).
+        Espera turno en el planificador (coste: tiempo × workers) y busca con `budget`
+        reducido según la cola en ese momento.
+        Devuelve (jugada, estadísticas de la búsqueda, con la espera y el presupuesto).
+        EngineOverloaded si la cola (o la del usuario) está llena;
+        EngineCancelled si `is_disconnected()` pasa a True mientras se espera.
+        """
+        ticket = self._submit(user, budget.time_limit * workers)
+        job = None
+        try:
+            if is_disconnected is not None:
+                await self._turn(ticket, is_disconnected)
+            else:
+                await ticket.future
+            granted = budget.scaled(ticket.scale)
+            ENGINE_BUDGET_SECONDS.observe(granted.time_limit)
+            self.start()
+            job = self._pool.submit(
+                _search_job,
+                board.root().fen(), [m.uci() for m in board.move_stack],
+                granted.depth, granted.time_limit, workers, granted.max_nodes,
+            )
+            future = asyncio.wrap_future(job)
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=self.poll_interval)
+                if done:
+                    uci, info = future.result()
+                    record_search(info)
+                    info.update(queue_wait=round(ticket.waited, 4), budget_scale=round(ticket.scale, 3),
+                                budget_time=round(granted.time_limit, 3), budget_nodes=granted.max_nodes)
+                    return (chess.Move.from_uci(uci) if uci else None), info
+                if is_disconnected is not None and await is_disconnected():
+                    # si ya corre acaba por su presupuesto, sin nadie esperando el resultado,
+                    # y su slot no se libera hasta entonces (_release_when_done)
+                    job.cancel()
+                    ENGINE_REJECTED.inc(1, "cancelled")
+                    raise EngineCancelled()
+        finally:
+            self._release_when_done(ticket, job)
+
+    async def analyze(self, board: chess.Board, depth: int, time_limit: float,
+                      on_update: Callable[[Dict], Awaitable[None]],
+                      stop: asyncio.Event, user: str = "") -> Tuple[Optional[chess.Move], Dict]:
+        """
+        Análisis en un worker con actualizaciones por iteración: `on_update(dict)` se
+        llama con cada una (profundidad, puntuación, PV, nodos, NPS). Si `stop` se activa,
+        o esta corrutina termina antes (cliente desconectado), el worker para enseguida.
+        Ocupa un slot del planificador con el presupuesto completo (el análisis lo pide
+        alguien mirando, no se recorta); si `stop` llega en la cola, EngineCancelled.
+        Devuelve (mejor jugada, estadísticas).
+        """
+        ticket = self._submit(user, time_limit)
+        loop = asyncio.get_running_loop()
+        job = None
+        try:
+            async def stopped() -> bool:
+                return stop.is_set()
+
+            await self._turn(ticket, stopped)
+            self.start()
+            ipc = self._ipc
+            # los proxies del Manager solo se tocan desde hilos de _ipc
+            updates, remote_stop = await loop.run_in_executor(ipc, self._channels)
+            job = self._pool.submit(
+                _analysis_job,
+                board.root().fen(), [m.uci() for m in board.move_stack], depth, time_limit,
+                updates, remote_stop,
+            )
+            stopping = False
+            while True:
+                # terminado el trabajo, sus actualizaciones ya están todas en la cola
+                done = job.done()
+                for update in await loop.run_in_executor(ipc, _drain, updates,
+                                                         0 if done else self.update_interval):
+                    await on_update(update)
+                if done:
+                    uci, info = job.result()
+                    record_search(info)
+                    return (chess.Move.from_uci(uci) if uci else None), info
+                if stop.is_set() and not stopping:
+                    stopping = True
+                    await loop.run_in_executor(ipc, remote_stop.set)
+        finally:
+            if job is not None and not job.done():
+                # cancelación o error: parar el worker (sin esperar a la IPC, que puede
+                # llegar en plena cancelación); el slot se libera cuando pare
+                job.cancel()
+                try:
+                    ipc.submit(remote_stop.set)
+                except RuntimeError:
+                    pass  # servicio ya apagado: el Manager se lleva el evento
+            self._release_when_done(ticket, job)
+
+
+engine_service = EngineService()
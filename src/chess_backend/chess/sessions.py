@@ -0,0 +1,276 @@
+# src/chess_backend/chess/sessions.py
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+import chess
+from chess_backend.core.config import (
+    SESSION_BACKEND, SESSION_DB_PATH, SESSION_MAX, SESSION_IDLE_TIMEOUT,
+)
+
+
+class SessionConflict(Exception):
+    """La partida fue modificada por otro worker mientras se jugaba aquí."""
+
+
+class SessionBusy(Exception):
+    """La partida ya está siendo usada por otra petición."""
+
+
+class GameSession:
+    """
+    Una partida en memoria. `lock` serializa las peticiones sobre la misma partida;
+    `version` se compara con la del backend para detectar cambios de otros workers.
+    """
+
+    def __init__(self, game_id: str, board: chess.Board, version: int = 0):
+        self.game_id = game_id
+        self.board = board
+        self.version = version
+        self.lock = threading.Lock()
+        self.last_access = time.monotonic()
+
+
+# -------------------------
+# Backends
+# -------------------------
+class MemorySessionBackend:
+    """
+    Sin persistencia: el LRU del SessionStore es la única copia (un solo worker).
+    """
+
+    def load(self, game_id: str) -> Optional[Tuple[str, List[str], int]]:
+        return None
+
+    def version(self, game_id: str) -> Optional[int]:
+        return None
+
+    def save(self, game_id: str, board: chess.Board, expected_version: int) -> bool:
+        return True
+
+    def delete(self, game_id: str) -> None:
+        pass
+
+    def purge(self, older_than: float) -> None:
+        pass
+
+
+class SqliteSessionBackend:
+    """
+    Partidas en un SQLite local (WAL) compartido por varios workers uvicorn.
+    Se guarda la FEN inicial y las jugadas UCI, así el historial (repeticiones) se conserva.
+    Las escrituras usan control optimista por versión.
+    """
+
+    def __init__(self, path: str = SESSION_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " game_id TEXT PRIMARY KEY,"
+            " root_fen TEXT NOT NULL,"
+            " moves TEXT NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, game_id: str) -> Optional[Tuple[str, List[str], int]]:
+        row = self._conn().execute(
+            "SELECT root_fen, moves, version FROM sessions WHERE game_id = ?", (game_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        root_fen, moves, version = row
+        return root_fen, moves.split() if moves else [], version
+
+    def version(self, game_id: str) -> Optional[int]:
+        row = self._conn().execute(
+            "SELECT version FROM sessions WHERE game_id = ?", (game_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, game_id: str, board: chess.Board, expected_version: int) -> bool:
+        root_fen = board.root().fen()
+        moves = " ".join(m.uci() for m in board.move_stack)
+        now = time.time()
+        conn = self._conn()
+        if expected_version == 0:
+            cur = conn.execute(
+                "INSERT INTO sessions (game_id, root_fen, moves, version, updated) VALUES (?, ?, ?, 1, ?)"
+                " ON CONFLICT(game_id) DO NOTHING",
+                (game_id, root_fen, moves, now),
+            )
+        else:
+            cur = conn.execute(
+                "UPDATE sessions SET root_fen = ?, moves = ?, version = version + 1, updated = ?"
+                " WHERE game_id = ? AND version = ?",
+                (root_fen, moves, now, game_id, expected_version),
+            )
+        return cur.rowcount == 1
+
+    def delete(self, game_id: str) -> None:
+        self._conn().execute("DELETE FROM sessions WHERE game_id = ?", (game_id,))
+
+    def purge(self, older_than: float) -> None:
+        self._conn().execute("DELETE FROM sessions WHERE updated < ?", (older_than,))
+
+
+def create_backend(name: str = SESSION_BACKEND):
+    if name == "memory":
+        return MemorySessionBackend()
+    if name == "sqlite":
+        return SqliteSessionBackend()
+    raise ValueError(f"SESSION_BACKEND desconocido: {name!r}")
+
+
+# -------------------------
+# Store
+# -------------------------
+def _release_opened(opening: "asyncio.Future") -> None:
+    if not opening.cancelled() and opening.exception() is None:
+        opening.result().lock.release()
+
+
+class SessionStore:
+    """
+    Partidas activas por id, con bloqueo por partida y expulsión LRU / por inactividad.
+    El número de partidas en memoria está acotado por `max_sessions`.
+    """
+
+    def __init__(self, backend=None, max_sessions: int = SESSION_MAX, idle_timeout: float = SESSION_IDLE_TIMEOUT):
+        self.backend = backend if backend is not None else create_backend()
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @contextmanager
+    def session(self, game_id: str, blocking: bool = True) -> Iterator[GameSession]:
+        """
+        Bloquea la partida (la crea si no existe) y la sincroniza con el backend.
+        Los cambios deben confirmarse con commit() antes de salir.
+        Con blocking=False lanza SessionBusy en vez de esperar.
+        """
+        sess = self._open(game_id, blocking)
+        try:
+            yield sess
+        finally:
+            sess.lock.release()
+
+    @asynccontextmanager
+    async def session_async(self, game_id: str) -> AsyncIterator[GameSession]:
+        """
+        session(blocking=False) para rutas async: la E/S del backend (sincronizar, purgar)
+        corre en un hilo, así una base de datos bloqueada no para el event loop.
+        """
+        opening = asyncio.ensure_future(asyncio.to_thread(self._open, game_id, False))
+        try:
+            sess = await asyncio.shield(opening)
+        except asyncio.CancelledError:
+            # el hilo sigue: si llega a tomar la partida, se suelta al terminar
+            opening.add_done_callback(_release_opened)
+            raise
+        try:
+            yield sess
+        finally:
+            sess.lock.release()
+
+    def commit(self, sess: GameSession) -> None:
+        """Guarda la partida en el backend; SessionConflict si otro worker la cambió."""
+        try:
+            saved = self.backend.save(sess.game_id, sess.board, sess.version)
+        except BaseException:
+            # no se sabe qué quedó guardado: recargar en la próxima petición
+            sess.version = -1
+            raise
+        if not saved:
+            # forzar recarga en la próxima petición
+            sess.version = -1
+            raise SessionConflict(sess.game_id)
+        sess.version += 1
+
+    async def commit_async(self, sess: GameSession) -> None:
+        """commit() en un hilo; si se cancela la espera, la partida sigue tomada hasta que termine."""
+        saving = asyncio.ensure_future(asyncio.to_thread(self.commit, sess))
+        try:
+            await asyncio.shield(saving)
+        except asyncio.CancelledError:
+            await asyncio.wait({saving})
+            if not saving.cancelled():
+                saving.exception()  # ya se propaga la cancelación
+            raise
+
+    def _open(self, game_id: str, blocking: bool) -> GameSession:
+        """Toma la partida y la sincroniza con el backend (la devuelve bloqueada)."""
+        sess = self._get(game_id)
+        if not sess.lock.acquire(blocking=blocking):
+            raise SessionBusy(game_id)
+        try:
+            self._sync(sess)
+        except BaseException:
+            sess.lock.release()
+            raise
+        sess.last_access = time.monotonic()
+        return sess
+
+    def _get(self, game_id: str) -> GameSession:
+        with self._lock:
+            sess = self._sessions.get(game_id)
+            if sess is None:
+                sess = GameSession(game_id, chess.Board(), version=-1)
+                self._sessions[game_id] = sess
+            sess.last_access = time.monotonic()
+            self._sessions.move_to_end(game_id)
+            self._evict()
+            return sess
+
+    def _sync(self, sess: GameSession) -> None:
+        version = self.backend.version(sess.game_id)
+        if version is None:
+            # sin copia en el backend (memoria, o partida purgada): vale la local
+            sess.version = 0
+            return
+        if version == sess.version:
+            return
+        state = self.backend.load(sess.game_id)
+        if state is None:
+            return
+        root_fen, moves, version = state
+        board = chess.Board(root_fen)
+        for uci in moves:
+            board.push(chess.Move.from_uci(uci))
+        sess.board = board
+        sess.version = version
+
+    def _evict(self) -> None:
+        """Expulsa partidas inactivas y, si se supera el máximo, las menos usadas (con self._lock)."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for game_id, sess in list(self._sessions.items()):
+            full = len(self._sessions) > self.max_sessions
+            if not full and sess.last_access >= cutoff:
+                break
+            if sess.lock.locked():
+                continue
+            del self._sessions[game_id]
+        now = time.time()
+        if now - self._last_purge > 60:
+            self._last_purge = now
+            self.backend.purge(now - self.idle_timeout)
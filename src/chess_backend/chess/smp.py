@@ -0,0 +1,155 @@
+# src/chess_backend/chess/smp.py
+import argparse
+import multiprocessing
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+import chess
+from chess_backend.core.config import ENGINE_SMP_TT_MB
+from chess_backend.chess import search
+from chess_backend.chess.search_board import SearchBoard
+from chess_backend.chess.tt import TranspositionTable, ENTRY_BYTES, table_entries
+
+# -------------------------
+# Lazy SMP: N procesos buscan la misma raíz con profundidades y órdenes distintos,
+# compartiendo una TT en memoria compartida (entradas verificadas por XOR, sin locks).
+# Se devuelve el resultado de la iteración completa más profunda.
+# -------------------------
+
+def _mp_context():
+    # fork es barato y los workers del motor no tienen hilos; spawn donde no hay fork
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+def _replay(root_fen: str, moves: List[str]) -> SearchBoard:
+    board = SearchBoard(root_fen)
+    for uci in moves:
+        board.push(chess.Move.from_uci(uci))
+    return board
+
+def _helper(worker_id: int, shm_name: str, root_fen: str, moves: List[str],
+            max_depth: int, time_limit: float, stop, results) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    table = TranspositionTable(buffer=shm.buf)
+    search.TT = table
+
+    def report(depth: int, score: int, move: Optional[chess.Move]) -> None:
+        results.put((worker_id, depth, score, move.uci() if move else None))
+        if depth >= max_depth:
+            stop.set()
+
+    try:
+        # la mitad de los helpers empieza una profundidad más arriba; todos desordenan la raíz
+        search.iterative_deepening(
+            _replay(root_fen, moves), max_depth, time_limit,
+            start_depth=1 + worker_id % 2,
+            rng=random.Random(worker_id),
+            should_stop=stop.is_set,
+            on_iteration=report,
+        )
+    finally:
+        table.release()
+        shm.close()
+
+def lazy_smp(board: chess.Board, max_depth: int, time_limit: float, workers: int,
+             info: Optional[Dict] = None, max_nodes: Optional[int] = None) -> Optional[chess.Move]:
+    """
+    Búsqueda paralela de una posición con `workers` procesos (incluido el actual).
+    info: estadísticas del proceso principal, más "workers" y la profundidad y puntuación
+    del resultado (las del proceso que lo encontró, sea el principal o un helper).
+    max_nodes: presupuesto del proceso principal; los helpers paran con él.
+    """
+    ctx = _mp_context()
+    shm = shared_memory.SharedMemory(create=True, size=table_entries(ENGINE_SMP_TT_MB) * ENTRY_BYTES)
+    stop = ctx.Event()
+    results = ctx.Queue()
+    root_fen = board.root().fen()
+    moves = [m.uci() for m in board.move_stack]
+
+    procs = [
+        ctx.Process(target=_helper, args=(i, shm.name, root_fen, moves, max_depth, time_limit, stop, results),
+                    daemon=True)
+        for i in range(1, workers)
+    ]
+    for p in procs:
+        p.start()
+
+    completed = []  # (depth, prioridad, score, uci): el hilo principal gana en empates
+
+    def report_main(depth: int, score: int, move: Optional[chess.Move]) -> None:
+        completed.append((depth, 1, score, move.uci() if move else None))
+
+    table = TranspositionTable(buffer=shm.buf)
+    previous = search.TT
+    search.TT = table
+    try:
+        main_move = search.iterative_deepening(
+            SearchBoard.from_board(board), max_depth, time_limit,
+            should_stop=stop.is_set, on_iteration=report_main, info=info, max_nodes=max_nodes,
+        )
+    finally:
+        stop.set()
+        search.TT = previous
+        for p in procs:
+            p.join(timeout=0.5)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        table.release()
+        shm.close()
+        shm.unlink()
+
+    while True:
+        try:
+            _, depth, score, uci = results.get(timeout=0.01)
+        except queue.Empty:
+            break
+        completed.append((depth, 0, score, uci))
+
+    completed = [c for c in completed if c[3]]
+    if info is not None:
+        info["workers"] = workers
+    if not completed:
+        return main_move
+    depth, _, score, uci = max(completed, key=lambda c: (c[0], c[1]))
+    if info is not None:
+        # jugada, profundidad y puntuación de la misma iteración: find_best las guarda juntas
+        info["depth"] = depth
+        info["score"] = score
+    return chess.Move.from_uci(uci)
+
+
+# -------------------------
+# Benchmark: tiempo hasta profundidad con 1, 2, 4 y 8 procesos
+#   python -m chess_backend.chess.smp --depth 4 --workers 1 2 4 8
+# -------------------------
+BENCH_FENS = [
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8",
+    "r2q1rk1/1b1nbppp/pp1ppn2/8/2PNP3/1PN1BP2/P2QB1PP/R4RK1 w - - 0 12",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+]
+
+def time_to_depth(fen: str, depth: int, workers: int) -> float:
+    board = chess.Board(fen)
+    search.TT.clear()
+    start = time.perf_counter()
+    search.find_best(board, max_depth=depth, time_limit=1e9, workers=workers, use_book=False)
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lazy SMP: tiempo hasta profundidad")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    base = None
+    for workers in args.workers:
+        total = sum(time_to_depth(fen, args.depth, workers) for fen in BENCH_FENS)
+        base = base or total
+        print(f"workers={workers:<2} depth={args.depth} time={total:8.2f}s speedup={base / total:5.2f}x")
+
+if __name__ == "__main__":
+    main()
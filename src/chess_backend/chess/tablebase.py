@@ -0,0 +1,150 @@
+# src/chess_backend/chess/tablebase.py
+import os
+from collections import OrderedDict
+from typing import Optional
+import chess
+import chess.syzygy
+from chess.polyglot import zobrist_hash
+from chess_backend.core.config import SYZYGY_PATH, SYZYGY_CACHE
+
+# Puntuación de una victoria de tablebase: por debajo del mate (100000) y por encima
+# de cualquier evaluación; se le resta el ply para preferir la ruta más corta
+TB_WIN = 50000
+
+# -------------------------
+# WDL (desde el bando que mueve): 2 gana, 1 gana pero la regla de 50 lo anula,
+# 0 tablas, -1 pierde pero se salva por la regla de 50, -2 pierde
+# -------------------------
+def wdl_score(wdl: int, ply: int) -> int:
+    """Puntuación negamax de un resultado WDL; las victorias/derrotas "malditas" cuentan como tablas."""
+    if wdl >= 2:
+        return TB_WIN - ply
+    if wdl <= -2:
+        return -TB_WIN + ply
+    return 0
+
+
+def rule50_wdl(wdl: int, dtz: int, clock: int) -> int:
+    """
+    WDL corregido con el contador de 50 jugadas `clock` de la posición sondeada (las tablas
+    lo suponen a cero); `dtz` son los plies hasta el cero (captura, peón o mate).
+    El DTZ puede venir redondeado un ply de menos: se cuenta en contra del que gana,
+    que solo conserva la victoria si el cero llega con ese ply de margen.
+    """
+    if wdl == 2 and clock + abs(dtz) + 1 > 100:
+        return 1
+    if wdl == -2 and clock + abs(dtz) > 100:
+        return -1
+    return wdl
+
+
+class Tablebases:
+    """
+    Sondeo de tablebases Syzygy locales (WDL en la búsqueda, DTZ en la raíz).
+
+    Los ficheros se abren al primer sondeo en cada proceso. Los resultados WDL se
+    guardan en un LRU por hash Zobrist. Sin directorios configurados (o sin tablas
+    dentro) todos los sondeos devuelven None.
+    """
+
+    def __init__(self, path: str = SYZYGY_PATH, cache_size: int = SYZYGY_CACHE):
+        self.path = path
+        self.cache_size = cache_size
+        self.max_pieces = 0
+        self._tb: Optional[chess.syzygy.Tablebase] = None
+        self._opened = False
+        self._cache: "OrderedDict[int, Optional[int]]" = OrderedDict()
+        self.probes = 0
+        self.hits = 0
+        self.cache_hits = 0
+
+    def _open(self) -> Optional[chess.syzygy.Tablebase]:
+        if not self._opened:
+            self._opened = True
+            tb = chess.syzygy.Tablebase()
+            for directory in filter(None, self.path.split(os.pathsep)):
+                try:
+                    tb.add_directory(directory, load_dtz=True)
+                except OSError:
+                    continue
+            if tb.wdl:
+                # "KQvKR" -> 4 piezas
+                self.max_pieces = max(len(name) - 1 for name in tb.wdl)
+                self._tb = tb
+        return self._tb
+
+    def available(self, board: chess.Board) -> bool:
+        """La posición cabe en las tablas (piezas y sin derechos de enroque)."""
+        if self._open() is None:
+            return False
+        return chess.popcount(board.occupied) <= self.max_pieces and not board.castling_rights
+
+    def probe_wdl(self, board: chess.Board) -> Optional[int]:
+        """WDL del bando que mueve, o None si no está en las tablas instaladas."""
+        if not self.available(board):
+            return None
+        self.probes += 1
+        key = zobrist_hash(board)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            wdl = self._cache[key]
+        else:
+            wdl = self._tb.get_wdl(board)
+            self._cache[key] = wdl
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        if wdl is not None:
+            self.hits += 1
+        return wdl
+
+    def root_move(self, board: chess.Board) -> Optional[chess.Move]:
+        """
+        Jugada óptima según DTZ: la que mejor resultado WDL conserva; ganando, la que
+        pone a cero el contador antes (captura/peón primero); perdiendo, la que más lo
+        alarga. None si falta alguna tabla para las posiciones resultantes.
+
+        Las tablas suponen el contador de 50 jugadas a cero: con el de la partida, una
+        victoria cuyo cero no llega a tiempo es solo "maldita" (y una derrota así, salvada).
+        """
+        if not self.available(board):
+            return None
+        best, best_key = None, None
+        for move in board.legal_moves:
+            zeroing = board.is_zeroing(move)
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    return move
+                wdl = self._tb.get_wdl(board)
+                dtz = self._tb.get_dtz(board)
+                clock = board.halfmove_clock
+            finally:
+                board.pop()
+            self.probes += 1
+            if wdl is None or dtz is None:
+                return None
+            self.hits += 1
+            # resultado propio = -wdl del rival; dtz del rival negativo cuando pierde
+            result = rule50_wdl(-wdl, dtz, clock)
+            if result > 0:
+                key = (result, 1 if zeroing else 0, dtz)
+            elif result < 0:
+                key = (result, 0 if zeroing else 1, dtz)
+            else:
+                key = (result, 0, 0)
+            if best_key is None or key > best_key:
+                best, best_key = move, key
+        return best
+
+    def stats(self) -> dict:
+        return {
+            "max_pieces": self.max_pieces,
+            "probes": self.probes,
+            "hits": self.hits,
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cache),
+        }
+
+
+TABLEBASES = Tablebases()
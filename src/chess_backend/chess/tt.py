@@ -0,0 +1,214 @@
+# src/chess_backend/chess/tt.py
+import os
+from array import array
+from typing import Optional, Tuple
+import chess
+from chess_backend.core.config import TT_SIZE_MB
+
+# -------------------------
+# Tipos de cota
+# -------------------------
+EXACT = 0
+LOWER = 1  # fail-high: el valor real es >= score
+UPPER = 2  # fail-low: el valor real es <= score
+
+# Cada entrada ocupa dos uint64: (key ^ data, data). La clave se verifica con
+# XOR, así una entrada escrita a medias nunca se confunde con una válida.
+ENTRY_BYTES = 16
+
+# -------------------------
+# Empaquetado de datos (64 bits)
+#   bits  0-31  score + SCORE_OFFSET
+#   bits 32-39  depth
+#   bits 40-41  flag
+#   bits 42-47  age
+#   bits 48-63  move (ver encode_move)
+# -------------------------
+SCORE_OFFSET = 1 << 31
+AGE_MASK = 0x3F
+MASK64 = (1 << 64) - 1
+
+
+def encode_move(move: Optional[chess.Move]) -> int:
+    """
+    Codifica una jugada en 16 bits: from | to << 6 | promotion << 12.
+    0 significa "sin jugada" (a1a1 nunca es legal).
+    """
+    if move is None:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int) -> Optional[chess.Move]:
+    if not code:
+        return None
+    promotion = (code >> 12) & 0x7
+    return chess.Move(code & 0x3F, (code >> 6) & 0x3F, promotion or None)
+
+
+def table_entries(size_mb: float) -> int:
+    """Número de entradas (potencia de dos) que caben en size_mb."""
+    entries = max(2, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+    return 1 << (entries.bit_length() - 1)
+
+
+def _pack(score: int, depth: int, flag: int, age: int, move_code: int) -> int:
+    return ((score + SCORE_OFFSET)
+            | (depth & 0xFF) << 32
+            | flag << 40
+            | age << 42
+            | move_code << 48)
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo, preasignada e indexada por hash Zobrist.
+
+    Buckets de dos entradas: al guardar se reutiliza la entrada con la misma clave;
+    si no existe, se reemplaza la de una búsqueda anterior o la de menor profundidad.
+    """
+
+    def __init__(self, size_mb: float = TT_SIZE_MB, buffer=None):
+        """
+        buffer: memoria externa (p. ej. SharedMemory.buf) en lugar de un array propio;
+        su tamaño manda sobre size_mb.
+        """
+        if buffer is not None:
+            size_mb = len(buffer) / (1024 * 1024)
+        self.size = table_entries(size_mb)
+        self._mask = (self.size - 1) & ~1
+        if buffer is not None:
+            self._table = memoryview(buffer)[:self.size * ENTRY_BYTES].cast("Q")
+        else:
+            self._table = array("Q", bytes(self.size * ENTRY_BYTES))
+        self.age = 0
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self) -> None:
+        # en sitio: si la memoria es compartida, los otros procesos la ven vacía también
+        self._table[:] = array("Q", bytes(self.size * ENTRY_BYTES))
+        self.age = 0
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def release(self) -> None:
+        """Suelta la vista sobre la memoria externa (necesario antes de cerrar un SharedMemory)."""
+        if isinstance(self._table, memoryview):
+            self._table.release()
+
+    # -------------------------
+    # Snapshot en disco: [entradas, usadas] + la tabla tal cual (uint64 nativos)
+    # -------------------------
+    def save(self, path: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(array("Q", (self.size, self.used)).tobytes())
+            f.write(memoryview(self._table).cast("B"))
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """
+        Carga un snapshot de save(); False (tabla intacta) si no existe, está truncado
+        o es de otro tamaño.
+        """
+        try:
+            with open(path, "rb") as f:
+                raw = f.read(16)
+                # array("Q", ...) lanza ValueError si la cabecera no es múltiplo de 8 bytes
+                if len(raw) != 16:
+                    return False
+                header = array("Q", raw)
+                if header[0] != self.size:
+                    return False
+                if f.readinto(memoryview(self._table).cast("B")) != self.size * ENTRY_BYTES:
+                    self.clear()
+                    return False
+        except OSError:
+            return False
+        self.used = header[1]
+        return True
+
+    def new_search(self) -> None:
+        """Avanza la edad: las entradas de búsquedas anteriores pasan a ser reemplazables."""
+        self.age = (self.age + 1) & AGE_MASK
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, Optional[chess.Move]]]:
+        """
+        Devuelve (score, depth, flag, best_move) o None si la posición no está.
+        """
+        self.probes += 1
+        t = self._table
+        i = (key & self._mask) << 1
+        for j in (i, i + 2):
+            data = t[j + 1]
+            if data and t[j] ^ data == key:
+                self.hits += 1
+                return ((data & 0xFFFFFFFF) - SCORE_OFFSET,
+                        (data >> 32) & 0xFF,
+                        (data >> 40) & 0x3,
+                        decode_move(data >> 48))
+        return None
+
+    def store(self, key: int, score: int, depth: int, flag: int, move: Optional[chess.Move]) -> None:
+        t = self._table
+        i = (key & self._mask) << 1
+        move_code = encode_move(move)
+
+        slot = -1
+        for j in (i, i + 2):
+            data = t[j + 1]
+            if data and t[j] ^ data == key:
+                # misma posición: conservar la jugada previa si la nueva no trae
+                if not move_code:
+                    move_code = data >> 48
+                slot = j
+                break
+        if slot < 0:
+            slot = self._victim(i)
+            if not t[slot + 1]:
+                self.used += 1
+
+        data = _pack(score, depth, flag, self.age, move_code)
+        t[slot] = (key ^ data) & MASK64
+        t[slot + 1] = data
+        self.stores += 1
+
+    def _victim(self, i: int) -> int:
+        """Elige la entrada a reemplazar dentro del bucket: vacía, vieja o menos profunda."""
+        t = self._table
+        best, best_prio = i, None
+        for j in (i, i + 2):
+            data = t[j + 1]
+            if not data:
+                return j
+            stale = ((data >> 42) & AGE_MASK) != self.age
+            prio = (0 if stale else 1, (data >> 32) & 0xFF)
+            if best_prio is None or prio < best_prio:
+                best, best_prio = j, prio
+        return best
+
+    # -------------------------
+    # Estadísticas
+    # -------------------------
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill_rate(self) -> float:
+        return self.used / self.size
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "size_mb": self.size * ENTRY_BYTES / (1024 * 1024),
+            "used": self.used,
+            "fill_rate": self.fill_rate(),
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+            "stores": self.stores,
+        }
@@ -0,0 +1,465 @@
+# src/chess_backend/chess/tuning.py
+# Anotaciones sin evaluar: el módulo se importa aunque falte numpy (np.ndarray)
+from __future__ import annotations
+import argparse
+import io
+import math
+import os
+import re
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import chess
+import chess.pgn
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional: solo hace falta para afinar, no para jugar (ver main)
+    np = None
+from chess_backend.chess import evaluate as ev
+from chess_backend.chess import weights as current
+
+# -------------------------
+# Afinado Texel de las PST y WEIGHTS (chess/weights.py)
+#   python -m chess_backend.chess.tuning extract --epd posiciones.epd --out feats.npy --workers 4
+#   python -m chess_backend.chess.tuning extract --pgn partidas.pgn --out feats.npy
+#   python -m chess_backend.chess.tuning fit feats.npy --epochs 300   (reescribe chess/weights.py)
+#   python -m chess_backend.chess.tuning check --epd posiciones.epd   (modelo lineal vs evaluate())
+# La evaluación es lineal en los pesos: evaluate() = fijo + X·θ, con X los conteos de cada
+# término (blancas - negras) y "fijo" lo que no se afina (material, movilidad, dama central).
+# `extract` pasa una vez cada posición etiquetada a un registro .npy (bitboards uint64 +
+# conteos de los términos), en paralelo; `fit` lo abre como memmap, reconstruye X por
+# bloques con NumPy (las PST salen de desempaquetar los bitboards) y minimiza el error
+# Texel: media de (resultado - sigmoide(K·eval))², con K ajustada antes a los pesos actuales.
+# EPD con resultado en el opcode c9 ("1-0", "0-1", "1/2-1/2") o al final entre corchetes
+# ([1.0], [0.5], [0.0]); PGN: posiciones de cada partida con su resultado, sin jaques ni
+# las que siguen a una captura (no son quietas) ni las primeras MIN_PLY jugadas.
+# -------------------------
+
+TERMS: Tuple[str, ...] = tuple(current.WEIGHTS)
+PST_PIECES = (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+PST_NAMES = {chess.PAWN: "PST_PAWN", chess.KNIGHT: "PST_KNIGHT", chess.BISHOP: "PST_BISHOP",
+             chess.ROOK: "PST_ROOK", chess.QUEEN: "PST_QUEEN"}
+# θ = [PST de PST_PIECES (64 c/u), rey medio juego (64), rey final (64), WEIGHTS]
+KING_MID_AT = 64 * len(PST_PIECES)
+KING_END_AT = KING_MID_AT + 64
+TERMS_AT = KING_END_AT + 64
+NPARAMS = TERMS_AT + len(TERMS)
+
+# Un registro por posición: bitboards [blancas P..K, negras P..K], conteos de TERMS,
+# fase (0 = medio juego, 1 = final), parte fija de la evaluación y resultado (blancas)
+RECORD = np.dtype([
+    ("bitboards", "<u8", (12,)),
+    ("terms", "<f4", (len(TERMS),)),
+    ("phase", "<f4"),
+    ("offset", "<f4"),
+    ("result", "<f4"),
+]) if np is not None else None
+
+MIN_PLY = 8
+CHUNK_LINES = 2000   # líneas EPD por tarea del pool
+CHUNK_GAMES = 50     # partidas PGN por tarea
+WINDOW_PER_WORKER = 4
+BLOCK = 32768        # filas de X por bloque al afinar
+CACHE_MB = 4096      # X en memoria entre épocas si cabe (1M posiciones ≈ 1,8 GB)
+
+RESULTS = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+_BRACKET = re.compile(r"\[\s*([01](?:\.\d+)?)\s*\]\s*$")
+MIRROR = np.array([chess.square_mirror(sq) for sq in chess.SQUARES]) if np is not None else None
+popcount = chess.popcount
+
+
+# -------------------------
+# Extracción (lado del worker)
+# -------------------------
+def trace(board: chess.Board) -> Optional[Tuple[List[float], float, float]]:
+    """
+    (conteos de TERMS, fase, parte fija) de la posición, con los mismos criterios que
+    evaluate(). None si no hay jugadas (mate o ahogado: no se afinan).
+    """
+    moves = list(board.generate_legal_moves())
+    if not moves:
+        return None
+    t: Dict[str, float] = dict.fromkeys(TERMS, 0.0)
+    pawns = board.pawns
+    occupied = board.occupied
+    material_white, material_black, _, _, _, units = ev.material_pst(board)
+    phase = ev.phase_from_units(units)
+    pawn_entry = ev.pawn_structure(board)
+
+    them = board.occupied_co[not board.turn]
+    mobility = len(moves)
+    for move in moves:
+        if chess.BB_SQUARES[move.to_square] & them or board.is_en_passant(move):
+            mobility += 2
+    offset = float(material_white - material_black)
+    offset += (mobility if board.turn == chess.WHITE else -mobility) * 0.2
+
+    for color in (chess.WHITE, chess.BLACK):
+        sign = 1 if color == chess.WHITE else -1
+        own = board.occupied_co[color]
+        own_pawns = pawns & own
+        enemy_pawns = pawns & board.occupied_co[not color]
+        # peones
+        for sq in chess.scan_reversed(own_pawns):
+            if not ev.PASSED_MASK[color][sq] & enemy_pawns:
+                rank = chess.square_rank(sq)
+                t["passed_pawn_base"] += sign
+                t["passed_pawn_advance"] += sign * (rank if color == chess.WHITE else 7 - rank)
+            file = chess.square_file(sq)
+            if not ev.ADJACENT_FILES[file] & own_pawns:
+                t["isolated_pawn"] += sign
+            count = popcount(chess.BB_FILES[file] & own_pawns)
+            if count > 1:
+                t["doubled_pawn"] += sign * (count - 1)
+        t["pawn_majority"] += sign * abs(popcount(own_pawns & ev.QUEENSIDE) - popcount(own_pawns & ev.KINGSIDE))
+        if popcount(board.bishops & own) >= 2:
+            t["bishop_pair"] += sign
+        # outposts y dama central
+        for sq in chess.scan_reversed((board.knights | board.bishops) & own & ev.OUTPOST_RANKS[color]):
+            if not ev.OUTPOST_MASK[color][sq] & enemy_pawns:
+                t["outpost_knight" if board.knights & chess.BB_SQUARES[sq] else "outpost_bishop"] += sign
+        offset += sign * 12 * (1 - phase) * popcount(board.queens & own & ev.CENTER_MASK)
+        # torres
+        rooks = list(chess.scan_forward(board.rooks & own))
+        for r in rooks:
+            if pawn_entry.open_files & chess.BB_SQUARES[r]:
+                t["rook_open_file"] += sign
+            elif pawn_entry.semiopen[color] & chess.BB_SQUARES[r]:
+                t["rook_semiopen_file"] += sign
+        for i in range(len(rooks)):
+            for j in range(i + 1, len(rooks)):
+                a, b = rooks[i], rooks[j]
+                if (chess.square_file(a) == chess.square_file(b) or chess.square_rank(a) == chess.square_rank(b)) \
+                        and not chess.between(a, b) & occupied:
+                    t["connected_rooks"] += sign
+        # rey: escudo (medio juego) y actividad (final)
+        ksq = board.king(color)
+        if ksq is not None:
+            t["king_shield"] += sign * popcount(ev.KING_SHIELD_MASK[color][ksq] & own_pawns) * (1 - phase)
+            dist = abs(3.5 - chess.square_file(ksq)) + abs(3.5 - chess.square_rank(ksq))
+            t["king_activity_endgame"] += sign * (4.0 - dist) * phase
+
+    for sq in chess.scan_reversed(ev.CENTER_MASK):
+        t["space"] += popcount(board.attackers_mask(chess.WHITE, sq)) - popcount(board.attackers_mask(chess.BLACK, sq))
+    white = board.occupied_co[chess.WHITE]
+    black = board.occupied_co[chess.BLACK]
+    t["tempo"] = (popcount(board.bishops & white & ~ev.BISHOP_HOME[chess.WHITE])
+                  - popcount(board.bishops & black & ~ev.BISHOP_HOME[chess.BLACK]))
+    material_diff = material_white - material_black
+    t["exchange_when_ahead"] = float(material_diff > 150)
+    t["avoid_exchange_when_ahead"] = float(material_diff < -150)
+    return [t[name] for name in TERMS], phase, offset
+
+def _record(board: chess.Board, result: float, out: np.ndarray, i: int) -> bool:
+    traced = trace(board)
+    if traced is None:
+        return False
+    terms, phase, offset = traced
+    row = out[i]
+    row["bitboards"] = [board.pieces_mask(pt, color) for color in (chess.WHITE, chess.BLACK)
+                        for pt in chess.PIECE_TYPES]
+    row["terms"] = terms
+    row["phase"] = phase
+    row["offset"] = offset
+    row["result"] = result
+    return True
+
+def parse_epd(line: str) -> Optional[Tuple[chess.Board, float]]:
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    bracket = _BRACKET.search(line)
+    if bracket:
+        line = line[:bracket.start()]
+    try:
+        board, ops = chess.Board.from_epd(line)
+    except ValueError:
+        return None
+    if bracket:
+        return board, float(bracket.group(1))
+    result = RESULTS.get(str(ops.get("c9", "")))
+    return (board, result) if result is not None else None
+
+def extract_epd(lines: List[str]) -> np.ndarray:
+    out = np.zeros(len(lines), RECORD)
+    n = 0
+    for line in lines:
+        parsed = parse_epd(line)
+        if parsed is not None and _record(parsed[0], parsed[1], out, n):
+            n += 1
+    return out[:n]
+
+def extract_pgn(games: List[str]) -> np.ndarray:
+    rows: List[np.ndarray] = []
+    for text in games:
+        game = chess.pgn.read_game(io.StringIO(text))
+        result = RESULTS.get(game.headers.get("Result", "*")) if game is not None else None
+        if result is None:
+            continue
+        board = game.board()
+        out = np.zeros(len(list(game.mainline_moves())), RECORD)
+        n = 0
+        for ply, move in enumerate(game.mainline_moves()):
+            noisy = board.is_capture(move) or move.promotion
+            board.push(move)
+            if ply + 1 >= MIN_PLY and not noisy and not board.is_check() and _record(board, result, out, n):
+                n += 1
+        rows.append(out[:n])
+    return np.concatenate(rows) if rows else np.zeros(0, RECORD)
+
+
+# -------------------------
+# Extracción (lado del proceso principal)
+# -------------------------
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _pgn_games(f: io.TextIOBase) -> Iterator[str]:
+    """Texto de cada partida (se parte por las líneas [Event ...], sin interpretar nada)."""
+    lines: List[str] = []
+    for line in f:
+        if line.startswith("[Event ") and any(not l.startswith("[") and l.strip() for l in lines):
+            yield "".join(lines)
+            lines = []
+        lines.append(line)
+    if lines:
+        yield "".join(lines)
+
+def _imap(pool: ProcessPoolExecutor, fn, chunks: Iterable, window: int) -> Iterator:
+    """Como pool.map pero con `window` tareas en vuelo (la entrada no se lee entera)."""
+    pending: deque = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(fn, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def write_npy(path: str, parts: Iterable[np.ndarray]) -> int:
+    """Escribe los registros en un .npy sin juntarlos en memoria; devuelve cuántos."""
+    raw = path + ".part"
+    n = 0
+    with open(raw, "wb") as f:
+        for part in parts:
+            f.write(part.tobytes())
+            n += len(part)
+    with open(path, "wb") as out, open(raw, "rb") as f:
+        np.lib.format.write_array_header_1_0(
+            out, {"descr": np.lib.format.dtype_to_descr(RECORD), "fortran_order": False, "shape": (n,)})
+        shutil.copyfileobj(f, out)
+    os.remove(raw)
+    return n
+
+def extract(out: str, epd: Optional[str], pgn: Optional[str], workers: int) -> int:
+    import multiprocessing
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool, \
+            open(epd or pgn, encoding="utf-8", errors="replace") as f:
+        if epd:
+            parts = _imap(pool, extract_epd, _chunks(f, CHUNK_LINES), workers * WINDOW_PER_WORKER)
+        else:
+            parts = _imap(pool, extract_pgn, _chunks(_pgn_games(f), CHUNK_GAMES), workers * WINDOW_PER_WORKER)
+        return write_npy(out, parts)
+
+
+# -------------------------
+# Modelo lineal y ajuste
+# -------------------------
+def initial_params() -> np.ndarray:
+    theta = np.zeros(NPARAMS, np.float64)
+    for i, pt in enumerate(PST_PIECES):
+        theta[64 * i:64 * (i + 1)] = ev.PST[pt]
+    theta[KING_MID_AT:KING_END_AT] = ev.PST_KING_MID
+    theta[KING_END_AT:TERMS_AT] = ev.PST_KING_END
+    theta[TERMS_AT:] = [current.WEIGHTS[name] for name in TERMS]
+    return theta
+
+def features(rows: np.ndarray) -> np.ndarray:
+    """X (filas × NPARAMS) de un bloque de registros."""
+    n = len(rows)
+    bb = rows["bitboards"].astype("<u8")
+    # PST con signo: las piezas negras se reflejan (misma tabla para ambos colores);
+    # reflejar filas = invertir el orden de los bytes del bitboard
+    bb[:, 6:] = bb[:, 6:].byteswap()
+    bits = np.unpackbits(bb.view(np.uint8).reshape(n, 12, 8), axis=2, bitorder="little").reshape(n, 12, 64)
+    signed = bits[:, :6].astype(np.float32)
+    signed -= bits[:, 6:]
+    phase = rows["phase"].astype(np.float32)[:, None]
+    x = np.empty((n, NPARAMS), np.float32)
+    x[:, :KING_MID_AT] = signed[:, :5].reshape(n, KING_MID_AT)
+    np.multiply(signed[:, 5], 1 - phase, out=x[:, KING_MID_AT:KING_END_AT])
+    np.multiply(signed[:, 5], phase, out=x[:, KING_END_AT:TERMS_AT])
+    x[:, TERMS_AT:] = rows["terms"]
+    return x
+
+def _blocks(data: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """(parte fija, resultado, X) por bloques de BLOCK filas."""
+    for start in range(0, len(data), BLOCK):
+        rows = data[start:start + BLOCK]
+        yield np.asarray(rows["offset"]), np.asarray(rows["result"]), features(rows)
+
+def sigmoid(score: np.ndarray, k: float) -> np.ndarray:
+    return 1.0 / (1.0 + np.power(10.0, -k * score / 400.0))
+
+def evals(data: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    return np.concatenate([offset + x @ theta.astype(np.float32) for offset, _, x in _blocks(data)])
+
+def texel_error(scores: np.ndarray, results: np.ndarray, k: float) -> float:
+    return float(np.mean((results - sigmoid(scores, k)) ** 2))
+
+def fit_k(scores: np.ndarray, results: np.ndarray, lo: float = 0.05, hi: float = 5.0) -> float:
+    """K que minimiza el error con la evaluación actual (sección áurea)."""
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(60):
+        a = hi - ratio * (hi - lo)
+        b = lo + ratio * (hi - lo)
+        if texel_error(scores, results, a) < texel_error(scores, results, b):
+            hi = b
+        else:
+            lo = a
+    return (lo + hi) / 2
+
+def fit(data: np.ndarray, theta: np.ndarray, k: float, epochs: int, lr: float,
+        cache_mb: int = CACHE_MB, log_every: int = 10) -> np.ndarray:
+    """
+    Adam sobre el error Texel con el gradiente completo (todas las posiciones por época,
+    por bloques). Los parámetros son centipawns: `lr` es lo que puede moverse cada uno
+    por época como mucho. Si X cabe en `cache_mb` se construye una vez; si no, cada época
+    la rehace por bloques desde el memmap.
+    """
+    cached = len(data) * NPARAMS * 4 <= cache_mb << 20
+    blocks = list(_blocks(data)) if cached else None
+    theta = theta.astype(np.float64).copy()
+    m = np.zeros_like(theta)
+    v = np.zeros_like(theta)
+    beta1, beta2, eps = 0.9, 0.999, 1e-12
+    scale = k * math.log(10) / 400.0
+    n = len(data)
+    for epoch in range(1, epochs + 1):
+        grad = np.zeros_like(theta)
+        error = 0.0
+        theta32 = theta.astype(np.float32)
+        for offset, result, x in (blocks if cached else _blocks(data)):
+            p = sigmoid(offset + x @ theta32, k)
+            diff = result - p
+            error += float(diff @ diff)
+            grad += x.T @ (-2.0 * diff * p * (1 - p) * scale)
+        grad /= n
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad * grad
+        theta -= lr * (m / (1 - beta1 ** epoch)) / (np.sqrt(v / (1 - beta2 ** epoch)) + eps)
+        if log_every and (epoch % log_every == 0 or epoch == 1):
+            print(f"época {epoch:4d}  error {error / n:.6f}", flush=True)
+    return theta
+
+
+# -------------------------
+# Módulo de pesos generado
+# -------------------------
+def _table(name: str, values: Iterable[int]) -> str:
+    values = list(values)
+    rows = ["    " + ", ".join(f"{v:4d}" for v in values[r * 8:(r + 1) * 8]) + "," for r in range(8)]
+    return f"{name} = [\n" + "\n".join(rows) + "\n]\n"
+
+def render_weights(theta: np.ndarray, origin: str) -> str:
+    ints = [int(round(float(v))) for v in theta]
+    parts = [
+        "# src/chess_backend/chess/weights.py\n"
+        "# Pesos de la evaluación (evaluate.py): PST desde el lado de las blancas (a1 = índice 0)\n"
+        "# y WEIGHTS en centipawns. Lo genera `python -m chess_backend.chess.tuning fit`.\n"
+        f"# {origin}\n"
+    ]
+    for i, pt in enumerate(PST_PIECES):
+        parts.append(_table(PST_NAMES[pt], ints[64 * i:64 * (i + 1)]))
+    parts.append(_table("PST_KING_MID", ints[KING_MID_AT:KING_END_AT]))
+    parts.append(_table("PST_KING_END", ints[KING_END_AT:TERMS_AT]))
+    parts.append("WEIGHTS = {\n" + "".join(f'    "{name}": {v},\n' for name, v in zip(TERMS, ints[TERMS_AT:])) + "}\n")
+    return "\n".join(parts)
+
+def write_weights(path: str, theta: np.ndarray, origin: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_weights(theta, origin))
+    os.replace(tmp, path)
+
+
+# -------------------------
+# CLI
+# -------------------------
+WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.py")
+
+def cmd_extract(args) -> None:
+    if bool(args.epd) == bool(args.pgn):
+        sys.exit("Indica --epd o --pgn")
+    start = time.perf_counter()
+    n = extract(args.out, args.epd, args.pgn, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{n} posiciones -> {args.out} en {elapsed:.1f} s ({n / max(elapsed, 1e-9):.0f} pos/s, "
+          f"{args.workers} procesos)")
+
+def cmd_fit(args) -> None:
+    data = np.load(args.features, mmap_mode="r")
+    results = np.asarray(data["result"], np.float64)
+    theta = initial_params()
+    start = time.perf_counter()
+    k = args.k or fit_k(evals(data, theta), results)
+    before = texel_error(evals(data, theta), results, k)
+    print(f"{len(data)} posiciones, K = {k:.4f}, error inicial {before:.6f}")
+    theta = fit(data, theta, k, args.epochs, args.lr, args.cache_mb)
+    after = texel_error(evals(data, np.round(theta)), results, k)
+    print(f"error final {after:.6f} ({args.epochs} épocas, {time.perf_counter() - start:.1f} s)")
+    origin = (f"Afinado Texel: {len(data)} posiciones de {os.path.basename(args.features)}, K = {k:.4f}, "
+              f"error {before:.6f} -> {after:.6f}")
+    write_weights(args.out, theta, origin)
+    print(f"pesos -> {args.out}")
+
+def cmd_check(args) -> None:
+    """Compara el modelo lineal (pesos actuales) con evaluate() en las primeras posiciones de un EPD."""
+    with open(args.epd, encoding="utf-8", errors="replace") as f:
+        lines = [line for _, line in zip(range(args.positions), f)]
+    boards = [parsed[0] for parsed in map(parse_epd, lines) if parsed is not None and trace(parsed[0])]
+    linear = evals(extract_epd(lines), initial_params())
+    diffs = np.abs(linear - np.array([ev.evaluate(board) for board in boards], np.float32))
+    print(f"{len(boards)} posiciones, diferencia con evaluate(): media {diffs.mean():.2f} cp, "
+          f"máxima {diffs.max():.2f} cp")
+
+NUMPY_MISSING = "El afinado necesita numpy (dependencia opcional, no hace falta para jugar): pip install numpy"
+
+def main() -> None:
+    if np is None:
+        raise ImportError(NUMPY_MISSING)
+    parser = argparse.ArgumentParser(description="Afinado Texel de la evaluación")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("extract", help="posiciones etiquetadas -> registros .npy")
+    p.add_argument("--epd")
+    p.add_argument("--pgn")
+    p.add_argument("--out", default="features.npy")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.set_defaults(run=cmd_extract)
+    p = sub.add_parser("fit", help="ajusta los pesos y escribe el módulo")
+    p.add_argument("features")
+    p.add_argument("--epochs", type=int, default=300)
+    p.add_argument("--lr", type=float, default=1.0, help="paso máximo por época (cp)")
+    p.add_argument("--k", type=float, default=None, help="K fija (por defecto se ajusta)")
+    p.add_argument("--cache-mb", type=int, default=CACHE_MB, help="memoria para X entre épocas")
+    p.add_argument("--out", default=WEIGHTS_PATH)
+    p.set_defaults(run=cmd_fit)
+    p = sub.add_parser("check", help="modelo lineal frente a evaluate()")
+    p.add_argument("--epd", required=True)
+    p.add_argument("--positions", type=int, default=2000)
+    p.set_defaults(run=cmd_check)
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
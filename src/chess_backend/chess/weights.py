@@ -0,0 +1,101 @@
+# src/chess_backend/chess/weights.py
+# Pesos de la evaluación (evaluate.py): PST desde el lado de las blancas (a1 = índice 0)
+# y WEIGHTS en centipawns. Lo genera `python -m chess_backend.chess.tuning fit`.
+# Valores iniciales hechos a mano (sin afinar).
+
+PST_PAWN = [
+       0,    0,    0,    0,    0,    0,    0,    0,
+       5,   10,   10,  -20,  -20,   10,   10,    5,
+       5,   -5,  -10,    0,    0,  -10,   -5,    5,
+       0,    0,    0,   20,   20,    0,    0,    0,
+       5,    5,   10,   25,   25,   10,    5,    5,
+      10,   10,   20,   30,   30,   20,   10,   10,
+      50,   50,   50,   50,   50,   50,   50,   50,
+       0,    0,    0,    0,    0,    0,    0,    0,
+]
+
+PST_KNIGHT = [
+     -50,  -40,  -30,  -30,  -30,  -30,  -40,  -50,
+     -40,  -20,    0,    5,    5,    0,  -20,  -40,
+     -30,    5,   10,   15,   15,   10,    5,  -30,
+     -30,    0,   15,   20,   20,   15,    0,  -30,
+     -30,    5,   15,   20,   20,   15,    5,  -30,
+     -30,    0,   10,   15,   15,   10,    0,  -30,
+     -40,  -20,    0,    0,    0,    0,  -20,  -40,
+     -50,  -40,  -30,  -30,  -30,  -30,  -40,  -50,
+]
+
+PST_BISHOP = [
+     -20,  -10,  -10,  -10,  -10,  -10,  -10,  -20,
+     -10,    5,    0,    0,    0,    0,    5,  -10,
+     -10,   10,   10,   10,   10,   10,   10,  -10,
+     -10,    0,   10,   10,   10,   10,    0,  -10,
+     -10,    5,    5,   10,   10,    5,    5,  -10,
+     -10,    0,    5,   10,   10,    5,    0,  -10,
+     -10,    0,    0,    0,    0,    0,    0,  -10,
+     -20,  -10,  -10,  -10,  -10,  -10,  -10,  -20,
+]
+
+PST_ROOK = [
+       0,    0,    5,   10,   10,    5,    0,    0,
+       0,    0,    5,   10,   10,    5,    0,    0,
+       0,    0,    5,   10,   10,    5,    0,    0,
+       0,    0,    5,   10,   10,    5,    0,    0,
+       0,    0,    5,   10,   10,    5,    0,    0,
+       0,    0,    5,   10,   10,    5,    0,    0,
+      25,   25,   25,   25,   25,   25,   25,   25,
+       0,    0,    5,   10,   10,    5,    0,    0,
+]
+
+PST_QUEEN = [
+     -20,  -10,  -10,   -5,   -5,  -10,  -10,  -20,
+     -10,    0,    0,    0,    0,    0,    0,  -10,
+     -10,    0,    5,    5,    5,    5,    0,  -10,
+      -5,    0,    5,    5,    5,    5,    0,   -5,
+       0,    0,    5,    5,    5,    5,    0,   -5,
+     -10,    5,    5,    5,    5,    5,    0,  -10,
+     -10,    0,    5,    0,    0,    0,    0,  -10,
+     -20,  -10,  -10,   -5,   -5,  -10,  -10,  -20,
+]
+
+PST_KING_MID = [
+     -30,  -40,  -40,  -50,  -50,  -40,  -40,  -30,
+     -30,  -40,  -40,  -50,  -50,  -40,  -40,  -30,
+     -30,  -40,  -40,  -50,  -50,  -40,  -40,  -30,
+     -30,  -40,  -40,  -50,  -50,  -40,  -40,  -30,
+     -20,  -30,  -30,  -40,  -40,  -30,  -30,  -20,
+     -10,  -20,  -20,  -20,  -20,  -20,  -20,  -10,
+      20,   20,    0,    0,    0,    0,   20,   20,
+      20,   30,   10,    0,    0,   10,   30,   20,
+]
+
+PST_KING_END = [
+     -50,  -40,  -30,  -20,  -20,  -30,  -40,  -50,
+     -30,  -20,  -10,    0,    0,  -10,  -20,  -30,
+     -30,  -10,   20,   30,   30,   20,  -10,  -30,
+     -30,  -10,   30,   40,   40,   30,  -10,  -30,
+     -30,  -10,   30,   40,   40,   30,  -10,  -30,
+     -30,  -10,   20,   30,   30,   20,  -10,  -30,
+     -30,  -30,    0,    0,    0,    0,  -30,  -30,
+     -50,  -30,  -30,  -30,  -30,  -30,  -30,  -50,
+]
+
+WEIGHTS = {
+    "bishop_pair": 40,
+    "passed_pawn_base": 30,
+    "passed_pawn_advance": 10,
+    "isolated_pawn": -15,
+    "doubled_pawn": -10,
+    "outpost_knight": 25,
+    "outpost_bishop": 15,
+    "rook_open_file": 20,
+    "rook_semiopen_file": 10,
+    "connected_rooks": 20,
+    "king_shield": 8,
+    "space": 6,
+    "tempo": 10,
+    "exchange_when_ahead": 30,
+    "avoid_exchange_when_ahead": -20,
+    "pawn_majority": 12,
+    "king_activity_endgame": 30,
+}
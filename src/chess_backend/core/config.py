@@ -3,3 +3,67 @@ import os
 SECRET_KEY = os.getenv("SECRET_KEY", "cambia_esta_clave_por_una_larga_y_segura")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+
+# Motor: memoria de la tabla de transposición por proceso (MB)
+TT_SIZE_MB = float(os.getenv("TT_SIZE_MB", "16"))
+
+# Motor: entradas de la tabla hash de estructura de peones (por proceso)
+PAWN_HASH_ENTRIES = int(os.getenv("PAWN_HASH_ENTRIES", "16384"))
+
+# Motor: entradas de la caché de evaluaciones por hash Zobrist (8 bytes cada una, por proceso)
+EVAL_HASH_ENTRIES = int(os.getenv("EVAL_HASH_ENTRIES", "262144"))
+
+# Partidas: "memory" (un worker) o "sqlite" (compartidas entre workers locales)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+SESSION_MAX = int(os.getenv("SESSION_MAX", "10000"))
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", "3600"))
+
+# Motor: procesos del pool de búsqueda y máximo de búsquedas en cola (429 al superarlo)
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", str(os.cpu_count() or 1)))
+ENGINE_MAX_PENDING = int(os.getenv("ENGINE_MAX_PENDING", "64"))
+# Planificador: búsquedas en cola o en curso por usuario (429 al superarlo) y fracción mínima
+# del presupuesto de una búsqueda cuando la cola crece
+ENGINE_MAX_PENDING_PER_USER = int(os.getenv("ENGINE_MAX_PENDING_PER_USER", "4"))
+ENGINE_MIN_BUDGET_SCALE = float(os.getenv("ENGINE_MIN_BUDGET_SCALE", "0.1"))
+# Arranque: lanzar y calentar los procesos del motor y del hash antes de aceptar peticiones
+# (0 = se crean con la primera petición que los necesite)
+ENGINE_WARMUP = os.getenv("ENGINE_WARMUP", "1") != "0"
+
+# Lazy SMP: TT compartida (MB) y máximo de procesos por búsqueda ('workers' en /move)
+ENGINE_SMP_TT_MB = float(os.getenv("ENGINE_SMP_TT_MB", str(TT_SIZE_MB)))
+ENGINE_SMP_MAX_WORKERS = int(os.getenv("ENGINE_SMP_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+# Libro de aperturas Polyglot (.bin); vacío = sin libro. Solo se consulta hasta BOOK_MAX_PLY
+BOOK_PATH = os.getenv("BOOK_PATH", "")
+BOOK_MAX_PLY = int(os.getenv("BOOK_MAX_PLY", "30"))
+
+# Tablebases Syzygy locales (directorios separados por os.pathsep); vacío = sin tablebases
+SYZYGY_PATH = os.getenv("SYZYGY_PATH", "")
+SYZYGY_CACHE = int(os.getenv("SYZYGY_CACHE", "65536"))
+
+# Análisis en streaming (WebSocket /chess/analyze): tiempo máximo por búsqueda (s)
+ANALYSIS_MAX_TIME = float(os.getenv("ANALYSIS_MAX_TIME", "30"))
+
+# Análisis por lotes (POST /chess/batch): máximo de posiciones por petición
+BATCH_MAX_POSITIONS = int(os.getenv("BATCH_MAX_POSITIONS", "5000"))
+
+# Caché de análisis persistente (SQLite WAL, compartida entre workers); vacío = desactivada.
+# Se guardan resultados de profundidad >= MIN_DEPTH y al arrancar un worker se precargan
+# en la TT las WARM entradas más usadas
+ANALYSIS_CACHE_PATH = os.getenv("ANALYSIS_CACHE_PATH", "")
+ANALYSIS_CACHE_MIN_DEPTH = int(os.getenv("ANALYSIS_CACHE_MIN_DEPTH", "4"))
+ANALYSIS_CACHE_MAX = int(os.getenv("ANALYSIS_CACHE_MAX", "1000000"))
+ANALYSIS_CACHE_WARM = int(os.getenv("ANALYSIS_CACHE_WARM", "50000"))
+
+# Autenticación: procesos para el hash de contraseñas (lento a propósito) y caché de tokens verificados
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+
+# Base de datos de usuarios y partidas terminadas (SQLite WAL, compartida entre workers)
+DB_PATH = os.getenv("DB_PATH", "chess.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+# Historial de partidas: tamaño de página por defecto y máximo (partidas y jugadas)
+GAMES_PAGE_SIZE = int(os.getenv("GAMES_PAGE_SIZE", "20"))
+GAMES_PAGE_MAX = int(os.getenv("GAMES_PAGE_MAX", "200"))
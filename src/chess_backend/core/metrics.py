@@ -0,0 +1,158 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# -------------------------
+# Métricas en formato de texto de Prometheus (sin dependencias).
+# Son por proceso: con varios workers uvicorn cada uno expone las suyas.
+# -------------------------
+
+LabelValues = Tuple[str, ...]
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    """Histograma acumulado por buckets (límite superior incluido), con suma y cuenta."""
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...], labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = buckets
+        # por etiquetas: [cuentas por bucket (+Inf al final), suma]
+        self._values: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+REGISTRY: List = []
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# HTTP
+# -------------------------
+HTTP_REQUESTS = register(Counter(
+    "http_requests_total", "Peticiones HTTP por ruta, método y código", ("route", "method", "status")))
+HTTP_LATENCY = register(Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP por ruta",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0), ("route", "method")))
+
+def record_request(route: str, method: str, status: int, seconds: float) -> None:
+    HTTP_REQUESTS.inc(1, route, method, str(status))
+    HTTP_LATENCY.observe(seconds, route, method)
+
+
+# -------------------------
+# Motor (agregado de los search_info que devuelven los workers)
+# -------------------------
+ENGINE_SEARCHES = register(Counter(
+    "engine_searches_total", "Búsquedas del motor por origen de la jugada", ("source",)))
+ENGINE_NODES = register(Counter("engine_nodes_total", "Nodos buscados (incluida quiescencia)"))
+ENGINE_QNODES = register(Counter("engine_qnodes_total", "Nodos de quiescencia"))
+ENGINE_TT_PROBES = register(Counter("engine_tt_probes_total", "Consultas a la tabla de transposición"))
+ENGINE_TT_HITS = register(Counter("engine_tt_hits_total", "Aciertos en la tabla de transposición"))
+ENGINE_TT_CUTOFFS = register(Counter("engine_tt_cutoffs_total", "Cortes directos por la tabla de transposición"))
+ENGINE_BETA_CUTOFFS = register(Counter("engine_beta_cutoffs_total", "Cortes beta"))
+ENGINE_FIRST_MOVE_CUTOFFS = register(Counter(
+    "engine_first_move_cutoffs_total", "Cortes beta con la primera jugada probada"))
+ENGINE_SEARCH_TIME = register(Histogram(
+    "engine_search_seconds", "Tiempo de búsqueda por jugada",
+    (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)))
+ENGINE_DEPTH = register(Histogram(
+    "engine_search_depth", "Profundidad completada por búsqueda", (1, 2, 3, 4, 5, 6, 8, 10, 12, 16)))
+ENGINE_PENDING = register(Gauge("engine_pending_searches", "Búsquedas en cola o en curso"))
+ENGINE_REJECTED = register(Counter(
+    "engine_rejected_total", "Búsquedas rechazadas o canceladas", ("reason",)))
+ENGINE_QUEUED = register(Gauge("engine_queued_searches", "Búsquedas esperando en el planificador"))
+APP_WARMUP_SECONDS = register(Gauge("app_warmup_seconds", "Calentamiento de los pools al arrancar"))
+ENGINE_QUEUE_WAIT = register(Histogram(
+    "engine_queue_wait_seconds", "Espera en la cola del planificador hasta empezar la búsqueda",
+    (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)))
+ENGINE_BUDGET_SECONDS = register(Histogram(
+    "engine_budget_seconds", "Tiempo asignado a cada búsqueda (tras ajustar por carga)",
+    (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)))
+ENGINE_BUDGET_SCALE = register(Histogram(
+    "engine_budget_scale", "Fracción del presupuesto pedido que se concede según la carga",
+    (0.1, 0.2, 0.3, 0.5, 0.75, 0.99, 1.0)))
+
+def record_search(info: Optional[Dict]) -> None:
+    if not info:
+        return
+    source = info.get("source", "search")
+    ENGINE_SEARCHES.inc(1, source)
+    if source != "search":
+        return
+    ENGINE_NODES.inc(info.get("nodes", 0))
+    ENGINE_QNODES.inc(info.get("qnodes", 0))
+    ENGINE_TT_PROBES.inc(info.get("tt_probes", 0))
+    ENGINE_TT_HITS.inc(info.get("tt_hits", 0))
+    ENGINE_TT_CUTOFFS.inc(info.get("tt_cutoffs", 0))
+    ENGINE_BETA_CUTOFFS.inc(info.get("beta_cutoffs", 0))
+    ENGINE_FIRST_MOVE_CUTOFFS.inc(info.get("first_move_cutoffs", 0))
+    ENGINE_SEARCH_TIME.observe(info.get("time", 0.0))
+    ENGINE_DEPTH.observe(info.get("depth", 0))
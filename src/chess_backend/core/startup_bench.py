@@ -0,0 +1,130 @@
+# src/chess_backend/core/startup_bench.py
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# -------------------------
+# Benchmark de arranque
+#   python -m chess_backend.core.startup_bench --runs 5 --budget-ms 520
+# - importación: `python -X importtime -c "import chess_backend.main"` en procesos nuevos;
+#   mediana del total y los módulos que más tardan por sí solos
+# - contrato: módulos que no deben cargarse al importar la app (se cargan al usarse)
+# - --ready: con TestClient, tiempo hasta que la app acepta peticiones (lifespan, con el
+#   calentamiento de ENGINE_WARMUP) y de la primera petición de login y de jugada.
+#   Necesita httpx (el mismo que usa TestClient).
+# Sale con código 1 si se pasa del presupuesto o se rompe el contrato.
+# -------------------------
+
+# Importar la app (sin contar el intérprete) no debería pasar de aquí
+IMPORT_BUDGET_MS = 520
+
+# Fuera del camino de importación: el motor solo en los workers, el hash en su pool y
+# PGN/tablas de finales con el primer uso
+LAZY_MODULES = (
+    "chess_backend.chess.search",
+    "chess_backend.chess.smp",
+    "chess.pgn",
+    "chess.syzygy",
+    "passlib",
+)
+
+
+def import_profile() -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Un proceso nuevo: (ms totales, {módulo: (propio µs, acumulado µs)})."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import chess_backend.main"],
+                         capture_output=True, text=True, check=True)
+    modules: Dict[str, Tuple[int, int]] = {}
+    total = 0
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # cabecera
+        raw = name.rstrip()
+        name = raw.strip()
+        modules[name] = (int(own), int(cumulative))
+        if name == "chess_backend.main" and raw == " " + name:
+            total = int(cumulative)
+    return total / 1000, modules
+
+
+def lazy_violations(modules: Dict[str, Tuple[int, int]]) -> List[str]:
+    return [lazy for lazy in LAZY_MODULES
+            if any(name == lazy or name.startswith(lazy + ".") for name in modules)]
+
+
+def ready_times() -> Dict[str, float]:
+    """Arranque de la app en este proceso con TestClient (ms)."""
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from chess_backend.main import app
+    imported = time.perf_counter()
+    with TestClient(app) as client:
+        ready = time.perf_counter()
+        r = client.post("/auth/login", data={"username": "carlos", "password": "1234"})
+        r.raise_for_status()
+        login = time.perf_counter()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        client.post("/chess/reset", headers=headers).raise_for_status()
+        move_start = time.perf_counter()
+        client.post("/chess/move", json={"move": "e2e4", "level": "easy"}, headers=headers).raise_for_status()
+        move = time.perf_counter()
+    return {
+        "import_ms": (imported - start) * 1000,
+        "lifespan_ms": (ready - imported) * 1000,
+        "first_login_ms": (login - ready) * 1000,
+        "first_move_ms": (move - move_start) * 1000,
+    }
+
+
+def run(runs: int, budget_ms: float, top: int, ready: bool) -> int:
+    totals = []
+    modules: Dict[str, Tuple[int, int]] = {}
+    for _ in range(runs):
+        total, modules = import_profile()
+        totals.append(total)
+    median = statistics.median(totals)
+    print(f"import chess_backend.main: mediana {median:.0f} ms ({runs} procesos, "
+          f"min {min(totals):.0f}, max {max(totals):.0f}); presupuesto {budget_ms:.0f} ms")
+    print("\nmódulos con más tiempo propio (última pasada):")
+    for name, (own, cumulative) in sorted(modules.items(), key=lambda kv: -kv[1][0])[:top]:
+        print(f"  {own / 1000:7.1f} ms  (acum. {cumulative / 1000:7.1f})  {name}")
+
+    failed = 0
+    violations = lazy_violations(modules)
+    if violations:
+        print(f"\nERROR: se importan al arrancar (deben cargarse al usarse): {', '.join(violations)}")
+        failed = 1
+    if median > budget_ms:
+        print(f"\nERROR: la importación ({median:.0f} ms) pasa del presupuesto ({budget_ms:.0f} ms)")
+        failed = 1
+
+    if ready:
+        # otro proceso: este ya tiene la app importada
+        code = ("import json; from chess_backend.core.startup_bench import ready_times; "
+                "print(json.dumps(ready_times()))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        times = json.loads(out.stdout.strip().splitlines()[-1])
+        print("\narranque de la app (TestClient):")
+        for key, value in times.items():
+            print(f"  {key:<16} {value:7.0f} ms")
+    return failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del arranque del backend")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--ready", action="store_true",
+                        help="medir también lifespan y primeras peticiones (necesita httpx)")
+    args = parser.parse_args()
+    sys.exit(run(args.runs, args.budget_ms, args.top, args.ready))
+
+if __name__ == "__main__":
+    main()
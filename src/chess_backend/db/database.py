@@ -0,0 +1,101 @@
+# src/chess_backend/db/database.py
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from chess_backend.core.config import DB_PATH, DB_POOL_SIZE
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS users ("
+    " id INTEGER PRIMARY KEY,"
+    " username TEXT NOT NULL UNIQUE,"
+    " hashed_password TEXT NOT NULL,"
+    " created REAL NOT NULL)",
+    # moves: jugadas de 16 bits (tt.encode_move) empaquetadas, 2 bytes por jugada.
+    # root_fen NULL = posición inicial estándar
+    "CREATE TABLE IF NOT EXISTS games ("
+    " id INTEGER PRIMARY KEY,"
+    " user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,"
+    " session TEXT NOT NULL,"
+    " root_fen TEXT,"
+    " moves BLOB NOT NULL,"
+    " plies INTEGER NOT NULL,"
+    " result TEXT NOT NULL,"
+    " termination TEXT,"
+    " finished REAL NOT NULL)",
+    # el historial de un usuario se pagina por (finished, id) descendente
+    "CREATE INDEX IF NOT EXISTS idx_games_user_finished ON games(user_id, finished DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_games_finished ON games(finished)",
+)
+
+# Sentencias preparadas que sqlite3 guarda por conexión
+STATEMENT_CACHE = 128
+
+
+class Database:
+    """
+    SQLite local en modo WAL con un pool acotado de conexiones.
+
+    Las conexiones se crean al primer uso (hasta `pool_size`) y se reutilizan, así se
+    conserva la caché de sentencias preparadas de cada una. Tras un fork el proceso hijo
+    abre las suyas: una conexión SQLite no debe cruzar procesos.
+    """
+
+    def __init__(self, path: str = DB_PATH, pool_size: int = DB_POOL_SIZE):
+        self.path = path
+        self.pool_size = max(1, pool_size)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.Semaphore(self.pool_size)
+        self._ready = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                               check_same_thread=False, cached_statements=STATEMENT_CACHE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    for statement in SCHEMA:
+                        conn.execute(statement)
+                    self._ready = True
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Una conexión del pool (espera si están todas en uso)."""
+        if self._pid != os.getpid():
+            self._reset()
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            try:
+                yield conn
+            finally:
+                # no devolver al pool una transacción a medias
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+DATABASE = Database()
@@ -0,0 +1,152 @@
+# src/chess_backend/db/models.py
+import sqlite3
+import sys
+import time
+from array import array
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+import chess
+from chess_backend.chess.tt import encode_move, decode_move
+from chess_backend.db.database import Database, DATABASE
+
+
+class UserExists(Exception):
+    """Ya hay un usuario con ese nombre."""
+
+
+# -------------------------
+# Jugadas empaquetadas: 16 bits por jugada (tt.encode_move), little-endian
+# -------------------------
+def pack_moves(moves: List[chess.Move]) -> bytes:
+    codes = array("H", (encode_move(m) for m in moves))
+    if sys.byteorder == "big":
+        codes.byteswap()
+    return codes.tobytes()
+
+def iter_moves(blob: bytes) -> Iterator[chess.Move]:
+    """Decodifica las jugadas de una en una, a medida que se piden."""
+    view = memoryview(blob)
+    for i in range(0, len(view) - 1, 2):
+        yield decode_move(view[i] | (view[i + 1] << 8))
+
+
+# -------------------------
+# Usuarios
+# -------------------------
+class UserRepository:
+    def __init__(self, db: Database = DATABASE):
+        self.db = db
+
+    def get(self, username: str) -> Optional[dict]:
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT id, username, hashed_password FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "username": row[1], "hashed_password": row[2]}
+
+    def create(self, username: str, hashed_password: str) -> dict:
+        try:
+            with self.db.connection() as conn:
+                cur = conn.execute(
+                    "INSERT INTO users (username, hashed_password, created) VALUES (?, ?, ?)",
+                    (username, hashed_password, time.time()),
+                )
+        except sqlite3.IntegrityError:
+            raise UserExists(username)
+        return {"id": cur.lastrowid, "username": username, "hashed_password": hashed_password}
+
+    def ensure(self, username: str, hashed_password: str) -> None:
+        """Crea el usuario si no existe (usuarios demo)."""
+        with self.db.connection() as conn:
+            conn.execute(
+                "INSERT INTO users (username, hashed_password, created) VALUES (?, ?, ?)"
+                " ON CONFLICT(username) DO NOTHING",
+                (username, hashed_password, time.time()),
+            )
+
+
+# -------------------------
+# Partidas terminadas
+# -------------------------
+class GameSummary(NamedTuple):
+    id: int
+    session: str
+    root_fen: Optional[str]
+    plies: int
+    result: str
+    termination: Optional[str]
+    finished: float
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "game_id": self.session,
+            "fen": self.root_fen or chess.STARTING_FEN,
+            "plies": self.plies,
+            "result": self.result,
+            "termination": self.termination,
+            "finished": self.finished,
+        }
+
+
+_SUMMARY_COLUMNS = "id, session, root_fen, plies, result, termination, finished"
+
+
+class GameRepository:
+    """
+    Partidas terminadas por usuario. La lista no lee las jugadas; la reproducción lee
+    solo los bytes hasta el final de la página pedida y los decodifica sobre la marcha.
+    """
+
+    def __init__(self, db: Database = DATABASE):
+        self.db = db
+
+    def save(self, user_id: int, session: str, board: chess.Board) -> int:
+        root_fen = board.root().fen()
+        outcome = board.outcome(claim_draw=True)
+        with self.db.connection() as conn:
+            cur = conn.execute(
+                "INSERT INTO games (user_id, session, root_fen, moves, plies, result, termination, finished)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (user_id, session, None if root_fen == chess.STARTING_FEN else root_fen,
+                 pack_moves(board.move_stack), len(board.move_stack),
+                 outcome.result() if outcome else "*",
+                 outcome.termination.name.lower() if outcome else None, time.time()),
+            )
+        return cur.lastrowid
+
+    def history(self, user_id: int, limit: int, before: Optional[int] = None) -> List[GameSummary]:
+        """
+        Las `limit` partidas más recientes; con `before` (id de la última de la página
+        anterior) continúa a partir de ella. Paginación por clave, sin OFFSET.
+        """
+        with self.db.connection() as conn:
+            if before is None:
+                rows = conn.execute(
+                    f"SELECT {_SUMMARY_COLUMNS} FROM games WHERE user_id = ?"
+                    " ORDER BY finished DESC, id DESC LIMIT ?", (user_id, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {_SUMMARY_COLUMNS} FROM games WHERE user_id = ?"
+                    " AND (finished, id) < (SELECT finished, id FROM games WHERE id = ?)"
+                    " ORDER BY finished DESC, id DESC LIMIT ?", (user_id, before, limit),
+                ).fetchall()
+        return [GameSummary(*row) for row in rows]
+
+    def replay(self, user_id: int, game_id: int, start: int,
+               limit: int) -> Optional[Tuple[GameSummary, Iterator[chess.Move]]]:
+        """Resumen y jugadas de las primeras start + limit (el resto no se lee)."""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS}, substr(moves, 1, ?) FROM games WHERE id = ? AND user_id = ?",
+                (2 * (start + limit), game_id, user_id),
+            ).fetchone()
+        if row is None:
+            return None
+        return GameSummary(*row[:-1]), iter_moves(row[-1])
+
+
+USERS = UserRepository()
+GAMES = GameRepository()
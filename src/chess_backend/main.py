@@ -1,10 +1,35 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 #from auth.routes import router as auth_router
 from chess_backend.auth.routes import router as auth_router
 from chess_backend.chess.routes import router as chess_router
+from chess_backend.chess.service import engine_service
+from chess_backend.auth.utils import shutdown_hash_executor, warm_hash_executor
+from chess_backend.core import metrics
+from chess_backend.core.config import ENGINE_WARMUP
+from chess_backend.db.database import DATABASE
 
-app = FastAPI(title="Chess API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pool de procesos del motor: se arranca con la app y se cierra al apagar. Con
+    # ENGINE_WARMUP la app no se da por arrancada hasta que los procesos del motor (tras
+    # una búsqueda corta) y los del hash están listos
+    if ENGINE_WARMUP:
+        start = time.perf_counter()
+        await asyncio.gather(engine_service.warm_up(), warm_hash_executor())
+        metrics.APP_WARMUP_SECONDS.set(time.perf_counter() - start)
+    else:
+        engine_service.start()
+    yield
+    engine_service.shutdown()
+    shutdown_hash_executor()
+    DATABASE.close()
+
+app = FastAPI(title="Chess API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +39,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    # latencia por plantilla de ruta (/chess/move), no por URL concreta
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        metrics.record_request(path, request.method, status, time.perf_counter() - start)
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Registrar routers
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(chess_router, prefix="/chess", tags=["chess"])
@@ -0,0 +1,42 @@
+# tests/conftest.py
+import os
+import random
+import sys
+from typing import List
+import chess
+import pytest
+
+# Los paquetes viven en src/ (igual que al arrancar con PYTHONPATH=src)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+def random_games(games: int, max_plies: int, seed: int) -> List[List[chess.Move]]:
+    """Partidas de jugadas legales al azar (reproducibles con `seed`)."""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(games):
+        board = chess.Board()
+        for _ in range(rng.randint(max_plies // 2, max_plies)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        result.append(list(board.move_stack))
+    return result
+
+
+@pytest.fixture(scope="session")
+def playouts() -> List[List[chess.Move]]:
+    return random_games(games=60, max_plies=120, seed=2024)
+
+
+@pytest.fixture(scope="session")
+def positions(playouts) -> List[chess.Board]:
+    """Todas las posiciones de las partidas al azar, con su historial."""
+    boards = []
+    for moves in playouts:
+        board = chess.Board()
+        for move in moves:
+            board.push(move)
+            boards.append(board.copy())
+    return boards
@@ -0,0 +1,73 @@
+# tests/test_evaluate.py
+import chess
+import pytest
+import baseline_evaluate
+from chess_backend.chess import evaluate as evaluate_module
+from chess_backend.chess.evaluate import PST_KING_MID, PST_KING_END, evaluate, evaluate_lazy, game_phase, pst_value
+from chess_backend.chess.search_board import SearchBoard
+
+# -------------------------
+# Paridad: evaluate() por bitboards frente a la versión casilla a casilla de la base
+# (tests/baseline_evaluate.py). Se neutralizan en las dos los cambios posteriores hechos
+# a propósito: el rey graduado por fase (su test va aparte) y el sesgo de apertura de la
+# hoja, que la base sumaba y ahora vive en el libro de la raíz.
+# -------------------------
+@pytest.fixture
+def without_king_pst(monkeypatch):
+    zeros = [0] * 64
+    monkeypatch.setattr(baseline_evaluate, "PST_KING_MID", zeros)
+    monkeypatch.setattr(baseline_evaluate, "PST_KING_END", zeros)
+    monkeypatch.setattr(baseline_evaluate, "opening_book_bonus", lambda board: 0)
+    monkeypatch.setattr(evaluate_module, "KING_MID_SIGNED", [zeros, zeros])
+    monkeypatch.setattr(evaluate_module, "KING_END_SIGNED", [zeros, zeros])
+
+
+def test_evaluate_matches_baseline(positions, without_king_pst):
+    mismatches = [(b.fen(), evaluate(b), baseline_evaluate.evaluate(b))
+                  for b in positions if evaluate(b) != baseline_evaluate.evaluate(b)]
+    assert not mismatches, f"{len(mismatches)}/{len(positions)} distintas, p. ej. {mismatches[:3]}"
+
+def test_evaluate_terminal_positions():
+    mated = chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+    assert evaluate(mated) == -100000
+    stalemate = chess.Board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+    assert evaluate(stalemate) == 0
+
+
+# -------------------------
+# Rey graduado por fase y términos incrementales
+# -------------------------
+def test_king_pst_blends_by_phase():
+    for sq in (chess.G1, chess.E4, chess.A8):
+        assert pst_value(chess.KING, sq, chess.WHITE, 0.0) == PST_KING_MID[sq]
+        assert pst_value(chess.KING, sq, chess.WHITE, 1.0) == PST_KING_END[sq]
+        assert pst_value(chess.KING, sq, chess.WHITE, 0.25) == 0.75 * PST_KING_MID[sq] + 0.25 * PST_KING_END[sq]
+        # negras: misma tabla reflejada
+        assert pst_value(chess.KING, chess.square_mirror(sq), chess.BLACK, 0.25) == pst_value(chess.KING, sq, chess.WHITE, 0.25)
+
+def test_evaluate_adds_tapered_king_term(positions, monkeypatch):
+    sample = positions[::25]
+    scores = [evaluate(b) for b in sample]
+    zeros = [0] * 64
+    monkeypatch.setattr(evaluate_module, "KING_MID_SIGNED", [zeros, zeros])
+    monkeypatch.setattr(evaluate_module, "KING_END_SIGNED", [zeros, zeros])
+    for board, score in zip(sample, scores):
+        if board.is_checkmate() or board.is_stalemate():
+            continue
+        phase = game_phase(board)
+        king = (pst_value(chess.KING, board.king(chess.WHITE), chess.WHITE, phase)
+                - pst_value(chess.KING, board.king(chess.BLACK), chess.BLACK, phase))
+        # las dos evaluaciones se truncan a entero
+        assert abs(score - evaluate(board) - king) < 2, board.fen()
+
+def test_evaluate_same_on_search_board(positions):
+    # material/PST incrementales (SearchBoard) frente a calculados desde cero
+    for board in positions[::7]:
+        assert evaluate(SearchBoard.from_board(board)) == evaluate(board), board.fen()
+
+def test_evaluate_lazy_complete_matches_evaluate(positions):
+    for board in positions[::5]:
+        sign = 1 if board.turn == chess.WHITE else -1
+        score, complete = evaluate_lazy(board, -10**6, 10**6)
+        assert complete
+        assert score == sign * evaluate(board), board.fen()
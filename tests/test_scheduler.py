@@ -0,0 +1,83 @@
+# tests/test_scheduler.py
+import asyncio
+from collections import Counter
+import pytest
+from chess_backend.chess.scheduler import FairScheduler, SchedulerFull, batch_window
+
+
+def run_schedule(scheduler: FairScheduler, requests) -> list:
+    """
+    Encola `requests` [(usuario, coste)] de golpe y va liberando cada slot en cuanto
+    empieza; devuelve los usuarios en el orden en que recibieron turno.
+    """
+    async def main():
+        started = []
+        tickets = [scheduler.submit(user, cost) for user, cost in requests]
+        while len(started) < len(tickets):
+            running = [t for t in tickets if t.future.done() and t not in started]
+            assert running, "ninguna petición en marcha"
+            for ticket in running:
+                started.append(ticket)
+                scheduler.release(ticket)
+            await asyncio.sleep(0)
+        assert scheduler.pending == 0
+        return [t.user for t in started]
+    return asyncio.run(main())
+
+def scheduler(slots: int = 1) -> FairScheduler:
+    return FairScheduler(slots=slots, max_pending=100, max_per_user=50, min_scale=0.25)
+
+
+def test_heavy_user_does_not_starve_others():
+    # "a" encola 10 antes que nadie; "b" y "c" no esperan a que se vacíe su cola
+    order = run_schedule(scheduler(), [("a", 1.0)] * 10 + [("b", 1.0)] * 2 + [("c", 1.0)] * 2)
+    assert order[:7] == ["a", "a", "b", "c", "a", "b", "c"]
+    assert order[7:] == ["a"] * 7
+
+def test_turns_are_weighted_by_cost():
+    # mismo tiempo de motor para los dos: el que pide el doble recibe la mitad de turnos
+    order = run_schedule(scheduler(), [("cheap", 0.5)] * 20 + [("costly", 1.0)] * 20)
+    # tras el arranque y mientras los dos tienen cola: vueltas de (costly, cheap, cheap)
+    assert order[3:27] == ["costly", "cheap", "cheap"] * 8
+    assert Counter(order[:27]) == {"cheap": 19, "costly": 8}
+
+def test_single_user_keeps_fifo_order():
+    sched = scheduler()
+    async def main():
+        tickets = [sched.submit("a", cost) for cost in (3.0, 0.1, 2.0)]
+        seen = []
+        for _ in tickets:
+            ticket = next(t for t in tickets if t.future.done() and t not in seen)
+            seen.append(ticket)
+            sched.release(ticket)
+        return [t.cost for t in seen]
+    assert asyncio.run(main()) == [3.0, 0.1, 2.0]
+
+def test_limits_and_budget_scale():
+    async def main():
+        sched = FairScheduler(slots=2, max_pending=4, max_per_user=3, min_scale=0.25)
+        a = [sched.submit("a", 1.0) for _ in range(3)]
+        with pytest.raises(SchedulerFull) as exc:
+            sched.submit("a", 1.0)
+        assert exc.value.reason == "user_limit"
+        b = sched.submit("b", 1.0)
+        with pytest.raises(SchedulerFull) as exc:
+            sched.submit("c", 1.0)
+        assert exc.value.reason == "overloaded"
+        # dos en marcha con todo el presupuesto; la cola reduce el de las siguientes
+        assert [t.scale for t in a[:2]] == [1.0, 1.0]
+        assert sched.scale() == 2 / (2 + 2)
+        # cancelar una en cola no ocupa slot y libera su hueco
+        sched.cancel(b)
+        assert b.future.cancelled() and sched.pending == 3
+        for ticket in a[:2]:
+            sched.release(ticket)
+        assert a[2].future.done() and sched.running == 1
+        sched.release(a[2])
+        assert sched.pending == 0 and sched.stats()["users"] == 0
+    asyncio.run(main())
+
+def test_batch_window_leaves_slots_for_moves():
+    assert batch_window(1, 4) == 1
+    assert batch_window(4, 4) == 2
+    assert batch_window(16, 4) == 4
@@ -0,0 +1,39 @@
+# tests/test_search.py
+import chess
+import pytest
+from chess_backend.chess import search
+from chess_backend.chess.movepick import MoveOrdering
+from chess_backend.chess.tablebase import TB_WIN
+from chess_backend.chess.tt import TranspositionTable
+
+
+@pytest.mark.parametrize("score", [0, 123, -4567, search.DECISIVE - 1, TB_WIN - 7, -TB_WIN + 3, 100000, -100000])
+@pytest.mark.parametrize("ply", [0, 1, 17])
+def test_tt_score_round_trip(score, ply):
+    assert search.score_from_tt(search.score_to_tt(score, ply), ply) == score
+
+def test_tablebase_score_is_relative_to_the_node():
+    # guardada a ply 5 como "gana en 0 desde aquí"; leída a ply 2 sigue siendo TB_WIN - 2
+    stored = search.score_to_tt(TB_WIN - 5, 5)
+    assert stored == TB_WIN
+    assert search.score_from_tt(stored, 2) == TB_WIN - 2
+    assert search.score_from_tt(search.score_to_tt(-TB_WIN + 5, 5), 2) == -TB_WIN + 2
+    # los mates no dependen del ply
+    assert search.score_to_tt(100000, 5) == 100000
+
+def test_tablebase_hit_reused_at_another_ply(monkeypatch):
+    class Tablebases:
+        def probe_wdl(self, board):
+            return 2
+
+    monkeypatch.setattr(search, "TABLEBASES", Tablebases())
+    monkeypatch.setattr(search, "TT", TranspositionTable(1))
+    # contador a cero: se sondea; el ply lo da la raíz de la búsqueda (root_ply)
+    board = chess.Board("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+
+    # misma posición a ply 4 (la sondea y la guarda) y luego a ply 2 (sale de la TT)
+    monkeypatch.setattr(search, "_ordering", MoveOrdering(root_ply=-4))
+    assert search.alphabeta(board, 3, -search.INFTY, search.INFTY) == TB_WIN - 4
+    monkeypatch.setattr(search, "_ordering", MoveOrdering(root_ply=-2))
+    monkeypatch.setattr(search, "TABLEBASES", None)  # ya no se sondea: tiene que venir de la TT
+    assert search.alphabeta(board, 3, -search.INFTY, search.INFTY) == TB_WIN - 2
@@ -0,0 +1,52 @@
+# tests/test_search_board.py
+from chess.polyglot import zobrist_hash
+from chess_backend.chess.evaluate import material_pst
+from chess_backend.chess.search_board import SearchBoard
+
+# Posiciones con enroques, al paso y promociones (incluidas capturas que promocionan)
+SPECIAL_FENS = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+]
+
+
+def assert_in_sync(board: SearchBoard) -> None:
+    assert board.zobrist() == zobrist_hash(board), board.fen()
+    assert board.material_pst() == material_pst(board), board.fen()
+
+def test_incremental_terms_along_random_games(playouts):
+    for moves in playouts[:20]:
+        board = SearchBoard()
+        for move in moves:
+            board.push(move)
+            assert_in_sync(board)
+        while board.move_stack:
+            board.pop()
+            assert_in_sync(board)
+
+def test_incremental_terms_on_special_moves():
+    for fen in SPECIAL_FENS:
+        board = SearchBoard(fen)
+        assert_in_sync(board)
+        for move in list(board.legal_moves):
+            board.push(move)
+            assert_in_sync(board)
+            for reply in list(board.legal_moves):
+                board.push(reply)
+                assert_in_sync(board)
+                board.pop()
+            board.pop()
+            assert_in_sync(board)
+
+def test_from_board_keeps_history_and_terms(positions):
+    for board in positions[::50]:
+        sb = SearchBoard.from_board(board)
+        assert sb.move_stack == board.move_stack
+        assert_in_sync(sb)
+        # copia con historial: pop sigue restaurando los términos
+        copy = sb.copy()
+        copy.pop()
+        assert_in_sync(copy)
@@ -0,0 +1,29 @@
+# tests/test_see.py
+import chess
+import pytest
+from chess_backend.chess.evaluate import see_gain
+
+
+@pytest.mark.parametrize("fen, uci, expected", [
+    # peón come caballo sin defensa
+    ("4k3/8/8/3n4/4P3/8/8/4K3 w - - 0 1", "e4d5", 320),
+    # torre come peón defendido por peón
+    ("4k3/8/2p5/3p4/8/8/8/3RK3 w - - 0 1", "d1d5", -400),
+    # dama come peón defendido por caballo
+    ("4k3/8/5n2/3p4/8/8/8/3QK3 w - - 0 1", "d1d5", -800),
+    # rayos X: la torre de detrás recaptura al despejarse la columna
+    ("4r1k1/4r3/8/8/8/8/4R3/4R1K1 w - - 0 1", "e2e7", 500),
+    # el rey no recaptura en una casilla defendida
+    ("8/8/4k3/3p4/8/1B6/8/3QK3 w - - 0 1", "d1d5", 100),
+    # al paso
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2", "e5d6", 100),
+    # jugada tranquila
+    ("4k3/8/8/8/8/8/8/3QK3 w - - 0 1", "d1d4", 0),
+    # captura con promoción sin recaptura: pieza + (dama - peón)
+    ("1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7b8q", 500 + 800),
+])
+def test_see_gain(fen, uci, expected):
+    board = chess.Board(fen)
+    move = chess.Move.from_uci(uci)
+    assert board.is_legal(move)
+    assert see_gain(board, move) == expected
@@ -0,0 +1,97 @@
+# tests/test_sessions.py
+import asyncio
+import sqlite3
+import time
+import chess
+import pytest
+from chess_backend.chess import routes
+from chess_backend.chess.sessions import SessionStore, SessionBusy, SqliteSessionBackend, MemorySessionBackend
+
+
+def test_session_async_keeps_the_loop_free_while_the_database_is_locked(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SessionStore(SqliteSessionBackend(path))
+    with store.session("u:default") as sess:
+        sess.board.push_san("e4")
+        store.commit(sess)
+
+    # una escritura de otro worker con la base bloqueada: version() espera al busy timeout
+    version = store.backend.version
+
+    def slow_version(game_id):
+        time.sleep(0.5)
+        return version(game_id)
+
+    store.backend.version = slow_version
+    store._sessions["u:default"].version = -1  # fuerza load()
+
+    async def main():
+        lags = []
+        async def ticker():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - start)
+
+        tick = asyncio.ensure_future(ticker())
+        async with store.session_async("u:default") as sess:
+            fen = sess.board.fen()
+        tick.cancel()
+        return fen, lags
+
+    fen, lags = asyncio.run(main())
+    assert fen == chess.Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1").fen()
+    assert len(lags) > 10 and max(lags) < 0.2
+
+def test_session_async_busy_and_release():
+    store = SessionStore(MemorySessionBackend())
+
+    async def main():
+        async with store.session_async("u:default"):
+            with pytest.raises(SessionBusy):
+                async with store.session_async("u:default"):
+                    pass
+        async with store.session_async("u:default") as sess:
+            return sess.lock.locked()
+
+    assert asyncio.run(main())
+    assert not store._sessions["u:default"].lock.locked()
+
+def test_play_move_undoes_human_move_on_engine_failure(monkeypatch):
+    class Request:
+        async def is_disconnected(self):
+            return False
+
+    async def broken_search(*args, **kwargs):
+        raise RuntimeError("worker muerto")
+
+    monkeypatch.setattr(routes.engine_service, "search", broken_search)
+    store = SessionStore(MemorySessionBackend())
+
+    async def main():
+        async with store.session_async("u:default") as sess:
+            with pytest.raises(RuntimeError):
+                await routes.play_move(sess, "e2e4", Request())
+            return sess.board.fen()
+
+    assert asyncio.run(main()) == chess.STARTING_FEN
+
+def test_commit_failure_forces_reload(tmp_path):
+    store = SessionStore(SqliteSessionBackend(str(tmp_path / "sessions.db")))
+    with store.session("u:default") as sess:
+        sess.board.push_san("e4")
+        store.commit(sess)
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    save = store.backend.save
+    store.backend.save = locked
+    with store.session("u:default") as sess:
+        sess.board.push_san("e5")
+        with pytest.raises(sqlite3.OperationalError):
+            store.commit(sess)
+    store.backend.save = save
+    # la jugada sin guardar no sobrevive: se recarga la copia del backend
+    with store.session("u:default") as sess:
+        assert [m.uci() for m in sess.board.move_stack] == ["e2e4"]
@@ -0,0 +1,68 @@
+# tests/test_tt.py
+import chess
+from chess_backend.chess.tt import (
+    TranspositionTable, EXACT, LOWER, UPPER, encode_move, decode_move,
+)
+
+KEY = 0x9D39247E33776D41
+
+
+def test_move_codes_round_trip():
+    board = chess.Board("r3k2r/pPppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    moves = list(board.legal_moves)
+    assert any(m.promotion for m in moves)
+    for move in moves:
+        assert decode_move(encode_move(move)) == move
+    assert encode_move(None) == 0
+    assert decode_move(0) is None
+
+def test_store_and_probe_round_trip():
+    tt = TranspositionTable(1)
+    move = chess.Move.from_uci("e7e8n")
+    for score, depth, flag in ((0, 0, EXACT), (-99995, 63, UPPER), (100000, 255, LOWER), (-1, 1, EXACT)):
+        tt.store(KEY, score, depth, flag, move)
+        assert tt.probe(KEY) == (score, depth, flag, move)
+
+def test_probe_misses_other_key_in_same_bucket():
+    tt = TranspositionTable(1)
+    tt.store(KEY, 42, 5, EXACT, None)
+    # misma ranura (bits bajos iguales), otra clave: la verificación por XOR la descarta
+    assert tt.probe(KEY ^ (1 << 63)) is None
+    assert tt.probe(KEY) == (42, 5, EXACT, None)
+
+def test_store_keeps_previous_move_when_new_has_none():
+    tt = TranspositionTable(1)
+    move = chess.Move.from_uci("g1f3")
+    tt.store(KEY, 10, 3, LOWER, move)
+    tt.store(KEY, 20, 4, EXACT, None)
+    assert tt.probe(KEY) == (20, 4, EXACT, move)
+
+def test_bucket_replaces_stale_then_shallower():
+    tt = TranspositionTable(1)
+    same_bucket = [KEY ^ (i << 40) for i in range(1, 4)]
+    tt.store(same_bucket[0], 1, 9, EXACT, None)
+    tt.store(same_bucket[1], 2, 2, EXACT, None)
+    # bucket lleno: sale la menos profunda
+    tt.store(same_bucket[2], 3, 5, EXACT, None)
+    assert tt.probe(same_bucket[0]) is not None
+    assert tt.probe(same_bucket[1]) is None
+    assert tt.probe(same_bucket[2]) is not None
+    # de una búsqueda anterior: reemplazable aunque sea más profunda
+    tt.new_search()
+    tt.store(same_bucket[1], 4, 1, EXACT, None)
+    assert tt.probe(same_bucket[1]) == (4, 1, EXACT, None)
+    assert tt.used == 2
+
+def test_snapshot_round_trip_and_truncated_file(tmp_path):
+    tt = TranspositionTable(1)
+    tt.store(KEY, -300, 7, UPPER, chess.Move.from_uci("a2a4"))
+    path = str(tmp_path / "tt.bin")
+    tt.save(path)
+    loaded = TranspositionTable(1)
+    assert loaded.load(path)
+    assert loaded.probe(KEY) == tt.probe(KEY)
+    assert loaded.used == tt.used
+    for size in (0, 5, 16, 100):
+        with open(path, "wb") as f:
+            f.write(b"\x01" * size)
+        assert not TranspositionTable(1).load(path)